@@ -7,6 +7,7 @@ from .schemas import (
     ColumnChartWidget,
     ColumnIndexCSVWidget,
     ColumnIndexTableWidget,
+    Dashboard,
     LineChartWidget,
     PieChartWidget,
     RowIndexCSVWidget,
@@ -15,3 +16,4 @@ from .schemas import (
     StackedColumnChartWidget,
     WidgetGroup,
 )
+from .warming import CacheWarmer
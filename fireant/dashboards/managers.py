@@ -1,8 +1,35 @@
 # coding: utf-8
+import itertools
+
 import pandas as pd
 
 from fireant import utils
-from fireant.slicer.managers import Totals
+
+
+def _transform(transformer, dataframe, display_schema):
+    # This is a module level function so that it can be sent to the workers of a process pool
+    return transformer.transform(dataframe, display_schema)
+
+
+def _select_columns(dataframe, columns):
+    """
+    Selects columns of the data shared by the widgets of a group without copying their values, which selecting them
+    with ``dataframe[columns]`` would do for each widget.  Transformers do not modify the data frame they transform, so
+    the widgets can share the values.
+    """
+    if list(dataframe.columns) == columns:
+        return dataframe
+
+    if not columns:
+        return dataframe[columns]
+
+    # Concatenating the columns as series builds the columns of the subset from their names, so a multi-index does
+    # not keep the levels of the columns of the shared data frame.
+    return pd.concat([dataframe[column] for column in columns], axis=1, copy=False)
+
+
+def _query(slicer, schema):
+    return slicer.manager.data(**schema)
 
 
 class WidgetGroupManager(object):
@@ -25,6 +52,32 @@ class WidgetGroupManager(object):
 
     def render(self, dimensions=None, metric_filters=None, dimension_filters=None,
                references=None, operations=None, pagination=None):
+        schema = self.request_schema(dimensions, metric_filters, dimension_filters, references, operations, pagination)
+        dataframe = self.widget_group.slicer.manager.data(**schema)
+
+        return self.transform(dataframe, schema)
+
+    def render_as_completed(self, dimensions=None, metric_filters=None, dimension_filters=None,
+                            references=None, operations=None, pagination=None):
+        """
+        Renders the widgets like ``render`` but returns a generator which yields a tuple of the index of each widget
+        and its result as soon as the widget is transformed, so that the results can be sent before every widget is
+        done.  The data is queried immediately, so that invalid requests fail before the first result is requested.
+
+        With an executor, the results are yielded in the order the widgets are done.  Otherwise the widgets are
+        transformed in order as the results are requested.
+        """
+        schema = self.request_schema(dimensions, metric_filters, dimension_filters, references, operations, pagination)
+        dataframe = self.widget_group.slicer.manager.data(**schema)
+
+        return self._transform_as_completed(dataframe, schema)
+
+    def request_schema(self, dimensions=None, metric_filters=None, dimension_filters=None,
+                       references=None, operations=None, pagination=None):
+        """
+        Validates the request for each widget and returns the parameters of the slicer request that queries the data of
+        all of the widgets.  See ``render`` for the parameters.
+        """
         dimensions = utils.filter_duplicates(self.widget_group.dimensions + (dimensions or []))
         references = utils.filter_duplicates(self.widget_group.references + (references or []))
         operations = utils.filter_duplicates(self.widget_group.operations + (operations or []))
@@ -33,23 +86,102 @@ class WidgetGroupManager(object):
             widget.transformer.prevalidate_request(self.widget_group.slicer, widget.metrics, dimensions,
                                                    metric_filters, dimension_filters, references, operations)
 
-        schema = self._schema(dimensions, metric_filters, dimension_filters, references, operations, pagination)
-        dataframe = self.widget_group.slicer.manager.data(**schema)
+        operations += self._query_operations(dimensions, metric_filters, dimension_filters, references, operations)
 
+        return self._schema(dimensions, metric_filters, dimension_filters, references, operations, pagination)
+
+    def transform(self, dataframe, schema):
+        """
+        Transforms the data of a request for each widget.  The data frame can contain more metrics than the widgets
+        display.
+
+        :param dataframe:
+            The data returned by the slicer for the request.
+        :param schema:
+            The parameters of the request returned by ``request_schema``.
+        :return:
+            A list containing the result of each widget.
+        """
+        return self._transform_widgets(self.widget_group.widgets, dataframe, schema)
+
+    def session(self):
+        """
+        Returns a render session for the widget group, which remembers the last request of each widget so that only
+        the widgets affected by a change of the request are rendered again.  See ``WidgetGroupRenderSession``.
+        """
+        return WidgetGroupRenderSession(self.widget_group)
+
+    def _transform_widgets(self, widgets, dataframe, schema):
         _args = [dataframe, schema['dimensions'], schema['references'], schema['operations']]
-        return [self._transform_widget(widget, *_args)
-                for widget in self.widget_group.widgets]
+        executor = self.widget_group.executor
+        if executor is None:
+            return [self._transform_widget(widget, *_args)
+                    for widget in widgets]
+
+        # The subset of the data frame for each widget is selected before dispatching the transformations, so only the
+        # columns of a widget are sent to the workers of a process pool.  The workers of a thread pool share them.
+        tasks = [self._widget_task(widget, *_args)
+                 for widget in widgets]
+        return list(executor.map(_transform, *zip(*tasks)))
+
+    def _transform_as_completed(self, dataframe, schema):
+        _args = [dataframe, schema['dimensions'], schema['references'], schema['operations']]
+        executor = self.widget_group.executor
+        if executor is None:
+            for index, widget in enumerate(self.widget_group.widgets):
+                yield index, self._transform_widget(widget, *_args)
+            return
+
+        # The executor is from this module, so it is available when there is one
+        from concurrent.futures import as_completed
+
+        futures = {executor.submit(_transform, *self._widget_task(widget, *_args)): index
+                   for index, widget in enumerate(self.widget_group.widgets)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+        finally:
+            # Stops the remaining widgets when the generator is closed before every result was requested
+            for future in futures:
+                future.cancel()
+
+    def _query_operations(self, dimensions, metric_filters, dimension_filters, references, operations):
+        """
+        Returns the additional operations requested by the widget transformers to limit the query.  Since the query is
+        shared by all of the widgets in the group, only the operations requested by every widget are returned.
+        """
+        dimension_keys = [utils.slice_first(dimension) for dimension in dimensions]
+        widget_operations = [widget.transformer.query_operations(self.widget_group.slicer, widget.metrics,
+                                                                 dimension_keys, metric_filters, dimension_filters,
+                                                                 references, operations)
+                             for widget in self.widget_group.widgets]
+
+        if not widget_operations:
+            return []
+
+        return [operation
+                for operation in widget_operations[0]
+                if all(operation in other_operations
+                       for other_operations in widget_operations[1:])]
 
     def query_string(self, dimensions=None, metric_filters=None, dimension_filters=None,
                      references=None, operations=None, pagination=None):
         dimensions = utils.filter_duplicates(self.widget_group.dimensions + (dimensions or []))
         references = utils.filter_duplicates(self.widget_group.references + (references or []))
         operations = utils.filter_duplicates(self.widget_group.operations + (operations or []))
+        operations += self._query_operations(dimensions, metric_filters, dimension_filters, references, operations)
 
         schema = self._schema(dimensions, metric_filters, dimension_filters, references, operations, pagination)
         return self.widget_group.slicer.manager.query_string(**schema)
 
     def _transform_widget(self, widget, dataframe, dimensions, references, operations):
+        return _transform(*self._widget_task(widget, dataframe, dimensions, references, operations))
+
+    def _widget_task(self, widget, dataframe, dimensions, references, operations):
+        """
+        Returns the transformer of the widget, the subset of the data frame it displays and its display schema.
+        """
         display_schema = self.widget_group.slicer.manager.display_schema(
             metrics=widget.metrics,
             dimensions=dimensions,
@@ -59,18 +191,170 @@ class WidgetGroupManager(object):
 
         # Temporary fix to enable operations to get output properly. Can removed when the Fireant API is refactored.
         operation_columns = ['{}_{}'.format(operation.metric_key, operation.key)
-                             for operation in operations if operation.key != Totals.key]
+                             for operation in operations if hasattr(operation, 'metric_key')]
 
         columns = utils.flatten(widget.metrics) + operation_columns
 
         if references:
-            # This escapes a pandas bug where a data frame subset of columns still returns the columns of the
-            # original data frame
             reference_keys = [''] + [ref.key for ref in references]
-            subset_columns = pd.MultiIndex.from_product([reference_keys, columns])
-            subset = pd.DataFrame(dataframe[subset_columns], columns=subset_columns)
+            columns = list(itertools.product(reference_keys, columns))
+
+        subset = _select_columns(dataframe, columns)
+
+        return widget.transformer, subset, display_schema
+
+
+class WidgetGroupRenderSession(object):
+    """
+    Renders a widget group repeatedly for the same client, such as a dashboard that is updated when the user changes
+    its parameters.  The session keeps the data of the last request and the result of each widget.  When rendering
+    again, only the widgets whose metrics or request changed are transformed, and when only the metrics of the widgets
+    changed, only the metrics which are missing from the data are queried and added to it.
+
+    A session is not shared between clients or threads.
+    """
+
+    def __init__(self, widget_group):
+        self.widget_group = widget_group
+        self.reset()
+
+    def reset(self):
+        """
+        Discards the data and the results of the session, so that the next render queries and transforms everything.
+        """
+        self._request = None
+        self._dataframe = None
+        self._metrics = []
+        self._widget_results = []
+
+    def render(self, dimensions=None, metric_filters=None, dimension_filters=None,
+               references=None, operations=None, pagination=None):
+        """
+        Renders the widgets like ``WidgetGroupManager.render``, reusing the data and the results of the previous
+        request of the session.
+        """
+        manager = self.widget_group.manager
+        schema = manager.request_schema(dimensions, metric_filters, dimension_filters, references, operations,
+                                        pagination)
+        request = self._request_key(schema)
+
+        if request != self._request:
+            self._query(schema, schema['metrics'])
 
         else:
-            subset = dataframe[columns]
+            missing_metrics = [metric
+                               for metric in schema['metrics']
+                               if metric not in self._metrics]
+            if missing_metrics:
+                self._query_missing_metrics(schema, missing_metrics)
+
+        self._request = request
+
+        widgets = self.widget_group.widgets
+        widget_requests = [(widget.transformer, utils.flatten(widget.metrics), request)
+                           for widget in widgets]
+        changed = [index
+                   for index, widget_request in enumerate(widget_requests)
+                   if index >= len(self._widget_results) or self._widget_results[index][0] != widget_request]
+
+        results = [result for _, result in self._widget_results[:len(widgets)]]
+        results += [None] * (len(widgets) - len(results))
+        changed_results = manager._transform_widgets([widgets[index] for index in changed], self._dataframe, schema)
+        for index, result in zip(changed, changed_results):
+            results[index] = result
+
+        self._widget_results = list(zip(widget_requests, results))
+        return results
+
+    @staticmethod
+    def _request_key(schema):
+        # Everything but the metrics determines the rows of the data
+        return dict((key, value)
+                    for key, value in schema.items()
+                    if key != 'metrics')
+
+    def _query(self, schema, metrics):
+        self._dataframe = self.widget_group.slicer.manager.data(**dict(schema, metrics=metrics))
+        self._metrics = list(metrics)
+        self._widget_results = []
+
+    def _query_missing_metrics(self, schema, missing_metrics):
+        if schema['pagination'] is not None:
+            # The rows of a page can depend on the order of the metrics, so the page is queried again
+            return self._query(schema, schema['metrics'])
+
+        dataframe = self.widget_group.slicer.manager.data(**dict(schema, metrics=missing_metrics))
+        if not dataframe.index.equals(self._dataframe.index):
+            # The data changed since the last request, so the rest of the data is out of date
+            return self._query(schema, schema['metrics'])
+
+        # Operations can add metrics to the query which are already in the data
+        columns = [column
+                   for column in dataframe.columns
+                   if column not in self._dataframe.columns]
+        self._dataframe = pd.concat([self._dataframe, _select_columns(dataframe, columns)], axis=1, copy=False)
+        self._metrics += missing_metrics
+
+
+class DashboardManager(object):
+    def __init__(self, dashboard):
+        self.dashboard = dashboard
+
+    def render(self, dimensions=None, metric_filters=None, dimension_filters=None,
+               references=None, operations=None, pagination=None):
+        """
+        Renders every widget group of the dashboard.  The parameters are added to the request of each widget group like
+        in ``WidgetGroupManager.render``.
+
+        Widget groups of the same slicer which request the same dimensions, filters, references, operations and
+        pagination are queried together with the metrics of all of them.  The queries are run with the executor of the
+        dashboard, if it has one.
+
+        :return:
+            A list containing the result of ``render`` for each widget group.
+        """
+        widget_groups = self.dashboard.widget_groups
+        schemas = [widget_group.manager.request_schema(dimensions, metric_filters, dimension_filters,
+                                                       references, operations, pagination)
+                   for widget_group in widget_groups]
+
+        queries, query_indices = self._merge_requests(widget_groups, schemas)
+
+        executor = self.dashboard.executor
+        if executor is None or len(queries) < 2:
+            dataframes = [_query(*query) for query in queries]
+        else:
+            dataframes = list(executor.map(_query, *zip(*queries)))
+
+        return [widget_group.manager.transform(dataframes[query_index], schema)
+                for widget_group, schema, query_index in zip(widget_groups, schemas, query_indices)]
+
+    def _merge_requests(self, widget_groups, schemas):
+        """
+        Merges the requests of widget groups which only differ by their metrics.
+
+        :return:
+            A tuple of a list of the queries as tuples of a slicer and a request schema and a list of the index of the
+            query of each widget group.
+        """
+        queries, query_indices = [], []
+
+        for widget_group, schema in zip(widget_groups, schemas):
+            for query_index, (slicer, query_schema) in enumerate(queries):
+                if slicer is widget_group.slicer and self._is_compatible(query_schema, schema):
+                    query_schema['metrics'] = utils.filter_duplicates(query_schema['metrics'] + schema['metrics'])
+                    break
+
+            else:
+                query_index = len(queries)
+                queries.append((widget_group.slicer, dict(schema)))
+
+            query_indices.append(query_index)
+
+        return queries, query_indices
 
-        return widget.transformer.transform(subset, display_schema)
+    @staticmethod
+    def _is_compatible(schema, other_schema):
+        return all(value == other_schema[key]
+                   for key, value in schema.items()
+                   if key != 'metrics')
@@ -1,5 +1,8 @@
 # coding: utf-8
-from fireant.dashboards.managers import WidgetGroupManager
+from fireant.dashboards.managers import (
+    DashboardManager,
+    WidgetGroupManager,
+)
 
 from fireant.slicer.transformers import *
 
@@ -102,9 +105,17 @@ class ColumnIndexCSVWidget(Widget):
 
 
 class WidgetGroup(object):
-    def __init__(self, slicer, widgets=None, dimensions=None, dimension_filters=None, references=None, operations=None):
+    def __init__(self, slicer, widgets=None, dimensions=None, dimension_filters=None, references=None, operations=None,
+                 executor=None):
+        """
+        :param executor:
+            An executor of the ``concurrent.futures`` module, such as a ``ThreadPoolExecutor`` or a
+            ``ProcessPoolExecutor``, which transforms the data of the widgets in parallel when rendering.  The results
+            are always returned in the order of the widgets.  By default the widgets are transformed one after another.
+        """
         self.slicer = slicer
         self.widgets = widgets
+        self.executor = executor
 
         self.dimensions = dimensions or []
         self.dimension_filters = dimension_filters or []
@@ -112,3 +123,18 @@ class WidgetGroup(object):
         self.operations = operations or []
 
         self.manager = WidgetGroupManager(self)
+
+
+class Dashboard(object):
+    def __init__(self, widget_groups, executor=None):
+        """
+        :param widget_groups:
+            The widget groups of the dashboard.
+        :param executor:
+            An executor of the ``concurrent.futures`` module, such as a ``ThreadPoolExecutor``, which runs the queries of
+            the widget groups concurrently when rendering.  By default the queries are run one after another.
+        """
+        self.widget_groups = widget_groups
+        self.executor = executor
+
+        self.manager = DashboardManager(self)
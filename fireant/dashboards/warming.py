@@ -0,0 +1,114 @@
+# coding: utf-8
+import logging
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+from fireant.slicer.managers import SlicerManager
+
+warming_logger = logging.getLogger('fireant.cache_warming$')
+
+
+class CacheWarmer(object):
+    """
+    Queries the data of widget groups ahead of the requests for it and stores it in the result caches of their
+    slicers, so that the widget groups are rendered from the caches.  The data can be warmed on demand with ``warm``
+    or periodically in a background thread with ``start``.
+    """
+
+    def __init__(self, widget_groups, parameters=None, database=None, max_workers=2):
+        """
+        :param widget_groups:
+            The widget groups to warm.  The slicers of the widget groups must have a result cache.
+        :param parameters:
+            A list of the parameters of ``WidgetGroupManager.render`` as dicts.  The data of each widget group is warmed
+            for each of the parameters.  By default, the data is warmed for the request without parameters.
+        :param database:
+            The database to query the data with instead of the database of each slicer, for example with a user or a
+            resource pool of lower priority, so that warming does not slow down the requests of users.
+        :param max_workers:
+            The maximum number of queries run at the same time.
+        """
+        for widget_group in widget_groups:
+            if widget_group.slicer.cache is None:
+                raise ValueError('The slicer of a widget group to warm has no result cache!')
+
+        self.widget_groups = widget_groups
+        self.parameters = parameters or [{}]
+        self.database = database
+        self.max_workers = max_workers
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def warm(self):
+        """
+        Queries the data of every widget group for each of the parameters and replaces the data in the caches.  The
+        data of a request which fails is not warmed and the error is logged.
+
+        :return:
+            The number of seconds the warm run took.
+        """
+        start_time = time.time()
+
+        managers = {}
+        requests = []
+        for widget_group in self.widget_groups:
+            slicer = widget_group.slicer
+            if slicer not in managers:
+                managers[slicer] = SlicerManager(slicer, database=self.database, refresh_cache=True)
+
+            requests += [(managers[slicer], widget_group.manager.request_schema(**parameters))
+                         for parameters in self.parameters]
+
+        pool = ThreadPool(self.max_workers)
+        try:
+            pool.map(self._warm_request, requests)
+        finally:
+            # The worker threads are stopped before returning, so that no thread of a warm run outlives it
+            pool.close()
+            pool.join()
+
+        duration = round(time.time() - start_time, 4)
+        warming_logger.info('[duration: {duration} seconds]: warmed {count} requests'.format(
+            duration=duration,
+            count=len(requests))
+        )
+
+        return duration
+
+    @staticmethod
+    def _warm_request(request):
+        manager, schema = request
+        try:
+            manager.data(**schema)
+        except Exception:
+            warming_logger.exception('Failed to warm the data of a request')
+
+    def start(self, interval):
+        """
+        Warms the data in a background thread immediately and then every ``interval`` seconds until ``stop`` is called.
+        """
+        if self._thread is not None:
+            raise RuntimeError('The cache warmer is already started!')
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops warming the data in the background after the current warm run.
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval):
+        while not self._stop_event.is_set():
+            self.warm()
+            self._stop_event.wait(interval)
@@ -19,6 +19,16 @@ class Database(object):
         """ Database specific function for adding or subtracting dates """
         raise NotImplementedError
 
+    def cache_key(self):
+        """
+        Returns a string which identifies the data of the database in the result caches of slicers.  It contains the
+        class and the connection parameters of the database, except for the password.
+        """
+        params = sorted((key, value)
+                        for key, value in vars(self).items()
+                        if key != 'password' and isinstance(value, (str, int, float, bool, type(None))))
+        return '{}.{}{}'.format(type(self).__module__, type(self).__name__, params)
+
     def fetch(self, query):
         with self.connect() as connection:
             cursor = connection.cursor()
@@ -28,3 +38,37 @@ class Database(object):
     def fetch_dataframe(self, query):
         with self.connect() as connection:
             return pd.read_sql(query, connection)
+
+    def fetch_dataframe_chunks(self, query, chunksize):
+        """
+        Yields the result of a query as data frames of at most `chunksize` rows.  pandas only splits the rows returned
+        by the cursor of the connection, so the rows are only fetched from the database in chunks if the driver reads
+        them as they are consumed.  Databases whose driver loads the whole result into the default cursor override
+        this to read the rows with a server-side cursor.
+        """
+        with self.connect() as connection:
+            for dataframe in pd.read_sql(query, connection, chunksize=chunksize):
+                yield dataframe
+
+    @staticmethod
+    def _fetch_cursor_dataframe_chunks(cursor, query, chunksize):
+        """
+        Executes a query with a cursor and yields its result as data frames of at most `chunksize` rows like
+        ``pd.read_sql``, which yields an empty data frame with the columns of the query if it returns no rows.
+        """
+        cursor.execute(query)
+
+        columns = None
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if columns is None:
+                # Server-side cursors only describe the columns once rows are fetched
+                columns = [column[0] for column in cursor.description]
+
+                if not rows:
+                    yield pd.DataFrame.from_records([], columns=columns, coerce_float=True)
+
+            if not rows:
+                return
+
+            yield pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
@@ -66,6 +66,22 @@ class MySQLDatabase(Database):
     def fetch_dataframe(self, query):
         return pd.read_sql(query, self.connect())
 
+    def fetch_dataframe_chunks(self, query, chunksize):
+        """
+        Yields the result of a query as data frames of at most `chunksize` rows.  The default cursor of PyMySQL loads
+        the whole result, so the rows are read with an unbuffered cursor, which reads them from the server as they are
+        consumed.
+        """
+        import pymysql
+
+        connection = self.connect()
+        try:
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+                for dataframe in self._fetch_cursor_dataframe_chunks(cursor, query, chunksize):
+                    yield dataframe
+        finally:
+            connection.close()
+
     def trunc_date(self, field, interval):
         return Trunc(field, interval)
 
@@ -53,6 +53,19 @@ class PostgreSQLDatabase(Database):
     def fetch_dataframe(self, query):
         return pd.read_sql(query, self.connect())
 
+    def fetch_dataframe_chunks(self, query, chunksize):
+        """
+        Yields the result of a query as data frames of at most `chunksize` rows.  The default cursor of psycopg loads
+        the whole result, so the rows are read with a named cursor, which keeps the result on the server.
+        """
+        connection = self.connect()
+        try:
+            with connection.cursor(name='fireant_chunks') as cursor:
+                for dataframe in self._fetch_cursor_dataframe_chunks(cursor, query, chunksize):
+                    yield dataframe
+        finally:
+            connection.close()
+
     def trunc_date(self, field, interval):
         return Trunc(field, interval)
 
@@ -1,5 +1,9 @@
 # coding: utf-8
 
 highcharts_colors = 'kayak'
+highcharts_compact = False
+highcharts_max_points = None
 matplotlib_figsize = (14, 5)
-datatables_maxcols = 24
\ No newline at end of file
+datatables_maxcols = 24
+datatables_chunksize = 10000
+datatables_max_page_length = 1000
@@ -1,4 +1,5 @@
 # coding: utf-8
+from .cache import ResultCache
 from .managers import SlicerException
 from .filters import (
     BooleanFilter,
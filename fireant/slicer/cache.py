@@ -0,0 +1,173 @@
+# coding: utf-8
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+cache_logger = logging.getLogger('fireant.cache$')
+
+
+class ResultCache(object):
+    """
+    An in-memory cache of the data returned by ``SlicerManager.data``, keyed by the query and the post-processing of a
+    request.  A cache can be shared by several slicers and is safe to use from several threads.
+
+    The cached data frames are returned to every request of the same data, so they must not be modified.  The slicer
+    manager returns shallow copies of them, whose values must not be modified in place.
+
+    The policy of a cache applies to every slicer which uses it, so slicers whose data must always be fresh use a cache
+    without ``max_stale``.
+
+    Results can be stored with a version of the data, such as the result of the freshness probe of a slicer.  A result
+    is only returned for the same version of the data.
+    """
+
+    def __init__(self, ttl=None, max_entries=None, max_stale=None):
+        """
+        :param ttl:
+            The number of seconds after which a cached result expires.  If None, results do not expire.
+        :param max_entries:
+            The maximum number of cached results.  When it is exceeded, the least recently used result is removed.  If
+            None, the number of results is not limited.
+        :param max_stale:
+            The number of seconds after the expiry of a result during which it is still returned by ``fetch`` while it
+            is loaded again in a background thread.  Only one background load is run for a result at a time.  After
+            this time, the result is loaded again before it is returned.  If None, expired results are never returned.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+
+        self._entries = OrderedDict()
+        self._revalidations = {}
+        self._versions = {}
+        self._probe_locks = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, key, load, refresh=False, version=None):
+        """
+        Returns the cached result for a key, or loads and caches it if there is none.  An expired result within
+        ``max_stale`` is returned and loaded again in the background.
+
+        :param key:
+            The key of the result.
+        :param load:
+            A function without arguments which loads the result.
+        :param refresh:
+            If True, the result is always loaded and replaces the cached result.
+        :param version:
+            The current version of the data.  A result cached for another version is loaded again.
+        """
+        if not refresh:
+            dataframe, stale = self._lookup(key, version)
+            if stale:
+                self._revalidate(key, load, version)
+
+            if dataframe is not None:
+                return dataframe
+
+        dataframe = load()
+        self.set(key, dataframe, version)
+        return dataframe
+
+    def get(self, key, version=None):
+        """
+        Returns the cached result for a key, or None if there is none, it expired or it has another version.
+        """
+        dataframe, stale = self._lookup(key, version)
+        return None if stale else dataframe
+
+    def set(self, key, dataframe, version=None):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (dataframe, time.time(), version)
+
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def version(self, key, probe, interval):
+        """
+        Returns the version of data, such as the time its tables were last loaded.  The version is shared by every
+        result of the data and is only probed again after ``interval`` seconds.
+
+        :param key:
+            The key of the version.
+        :param probe:
+            A function without arguments which returns the current version of the data.
+        :param interval:
+            The number of seconds for which a version is reused.
+        """
+        with self._lock:
+            entry = self._versions.get(key)
+            if entry is not None and time.time() - entry[1] < interval:
+                return entry[0]
+
+            probe_lock = self._probe_locks.setdefault(key, threading.Lock())
+
+        # Only one thread probes a version at a time, while the other threads which need it wait for its result.  The
+        # cache is not locked while probing, since it queries the database.
+        with probe_lock:
+            with self._lock:
+                entry = self._versions.get(key)
+
+            now = time.time()
+            if entry is not None and now - entry[1] < interval:
+                return entry[0]
+
+            version = probe()
+            with self._lock:
+                self._versions[key] = (version, now)
+
+            return version
+
+    def _lookup(self, key, version):
+        """
+        Returns a tuple of the cached result for a key, or None if there is none or it has another version, and
+        whether the result expired.  Expired results are removed unless they are within ``max_stale``.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None, False
+
+            dataframe, stored_at, stored_version = entry
+            if stored_version != version:
+                return None, False
+
+            age = time.time() - stored_at
+            stale = self.ttl is not None and age >= self.ttl
+            if stale and (self.max_stale is None or age >= self.ttl + self.max_stale):
+                return None, False
+
+            # Moves the entry to the end, so that the least recently used entries are first
+            self._entries[key] = entry
+            return dataframe, stale
+
+    def _revalidate(self, key, load, version):
+        with self._lock:
+            if key in self._revalidations:
+                return
+
+            thread = threading.Thread(target=self._load_in_background, args=(key, load, version))
+            thread.daemon = True
+            self._revalidations[key] = thread
+
+        thread.start()
+
+    def _load_in_background(self, key, load, version):
+        try:
+            self.set(key, load(), version)
+        except Exception:
+            # The stale result is returned until it is loaded or exceeds max_stale
+            cache_logger.exception('Failed to load an expired result')
+        finally:
+            with self._lock:
+                del self._revalidations[key]
@@ -3,12 +3,26 @@
 import functools
 import itertools
 from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 import pandas as pd
 from fireant import utils
-from fireant.slicer.operations import Totals
-from pypika import functions as fn
+from fireant.slicer.filters import (
+    ContainsFilter,
+    EqualityFilter,
+)
+from fireant.slicer.operations import (
+    TopN,
+    Totals,
+)
+from pypika import (
+    Case,
+    JoinType,
+    Order,
+    functions as fn,
+)
+from pypika.queries import QueryBuilder
 
 from .postprocessors import OperationManager
 from .queries import QueryManager
@@ -19,12 +33,18 @@ class SlicerException(Exception):
 
 
 class SlicerManager(QueryManager, OperationManager):
-    def __init__(self, slicer):
+    def __init__(self, slicer, database=None, refresh_cache=False):
         """
         :param slicer:
+        :param database:
+            The database to query instead of the database of the slicer, for example with a user of lower priority.
+        :param refresh_cache:
+            If True, the data is always queried and replaces the data in the cache of the slicer.
         """
-        super(SlicerManager, self).__init__(database=slicer.database)
+        self.database = database or slicer.database
+        super(SlicerManager, self).__init__(database=self.database)
         self.slicer = slicer
+        self.refresh_cache = refresh_cache
 
     def data(self, metrics=(), dimensions=(),
              metric_filters=(), dimension_filters=(),
@@ -59,10 +79,12 @@ class SlicerManager(QueryManager, OperationManager):
             An object detailing the pagination to apply to the query
 
         :return:
-            A transformed response that is queried based on the slicer and the format.
+            A transformed response that is queried based on the slicer and the format.  When the slicer has a result
+            cache, the data frame shares its values with the cached data frame.  Columns and the index can be added,
+            replaced or reordered, but the values must not be modified in place, for example with ``inplace=True``
+            fills or by assigning to ``loc`` or ``iloc``.
         """
-        if operations and pagination:
-            raise SlicerException('Pagination cannot be used when operations are defined!')
+        self._validate_pagination(operations, pagination)
 
         metrics, dimensions = map(utils.filter_duplicates, (utils.flatten(metrics), dimensions))
 
@@ -70,17 +92,351 @@ class SlicerManager(QueryManager, OperationManager):
                                               metric_filters=metric_filters, dimension_filters=dimension_filters,
                                               references=references, operations=operations, pagination=pagination)
         operation_schema = self.operation_schema(operations)
+        final_columns = self._final_columns(metrics, references, operation_schema)
+
+        load = functools.partial(self._load_data, query_schema, operation_schema, final_columns)
+        cache = self.slicer.cache
+        if cache is None:
+            return load()
+
+        key = self._cache_key(query_schema, operation_schema, final_columns)
+        return self._shared_copy(cache.fetch(key, load, refresh=self.refresh_cache, version=self._data_version(cache)))
 
+    @staticmethod
+    def _shared_copy(dataframe):
+        # The cached data frame is returned to every request, so each request gets a copy of the frame without its
+        # values, which can be changed without changing the data of the other requests
+        return dataframe.copy(deep=False)
+
+    def _load_data(self, query_schema, operation_schema, final_columns):
+        # The data frame returned by the query is not shared, so the operations are added to it without a copy
         dataframe = self.query_data(**query_schema)
-        dataframe = self.post_process(dataframe, operation_schema)
+        dataframe = self.post_process(dataframe, operation_schema, inplace=True)
+
+        return self._select_columns(dataframe, final_columns)
+
+    def _data_version(self, cache):
+        """
+        Returns the result of the freshness probe of the slicer, which is shared by every cached result of the slicer,
+        or None if the slicer has no freshness probe.
+        """
+        if self.slicer.freshness_probe is None:
+            return None
+
+        query_string = str(self.slicer.freshness_probe)
+        probe = functools.partial(self.database.fetch, query_string)
+        return cache.version((query_string, self.slicer.database.cache_key()), probe, self.slicer.freshness_interval)
+
+    def _cache_key(self, query_schema, operation_schema, final_columns):
+        """
+        Returns the key of the data of a request in the cache of the slicer, which contains the query, the database of
+        the slicer and everything that is applied to the result.  The database of the slicer is used even if the data
+        is queried with another database, since that database must return the same data.
+        """
+        query_schema = dict(query_schema)
+        dtypes = query_schema.pop('dtypes', None)
+
+        query = self._build_data_query(**query_schema)
+        return (str(query), self.slicer.database.cache_key(),
+                repr(dtypes), repr(operation_schema), repr(final_columns))
+
+    def data_chunks(self, chunksize, metrics=(), dimensions=(),
+                    metric_filters=(), dimension_filters=(),
+                    references=(), operations=(), pagination=None):
+        """
+        Returns the same data as ``data`` as a generator of data frames, which are fetched from the database as they
+        are consumed.  Operations that post-process the data cannot be used since they require the complete result.
+
+        :param chunksize:
+            Type: int
+            The maximum number of rows in each data frame.
+
+        See ``data`` for the other parameters.
+
+        :return:
+            A generator of data frames.
+        """
+        self._validate_pagination(operations, pagination)
+
+        operation_schema = self.operation_schema(operations)
+        if operation_schema:
+            raise SlicerException('Post-processing operations cannot be used when fetching data in chunks!')
+
+        metrics, dimensions = map(utils.filter_duplicates, (utils.flatten(metrics), dimensions))
+
+        query_schema = self.data_query_schema(metrics=metrics, dimensions=dimensions,
+                                              metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                              references=references, operations=operations, pagination=pagination)
+
+        final_columns = self._final_columns(metrics, references, operation_schema)
+        return (self._select_columns(dataframe, final_columns)
+                for dataframe in self.query_data_chunks(chunksize=chunksize, **query_schema))
+
+    def data_page(self, metrics=(), dimensions=(),
+                  metric_filters=(), dimension_filters=(),
+                  references=(), operations=(), pagination=None):
+        """
+        Returns a page of the same data as ``data`` along with the number of rows in the data of every page, which are
+        counted in the same query.  Operations that post-process the data cannot be used since they require the
+        complete result.
+
+        See ``data`` for the parameters.
+
+        :return:
+            A tuple of the data frame of the page and the number of rows in the data of every page, or None if the
+            page is empty.
+        """
+        self._validate_pagination(operations, pagination)
+
+        operation_schema = self.operation_schema(operations)
+        if operation_schema:
+            raise SlicerException('Post-processing operations cannot be used when fetching a page of data!')
+
+        metrics, dimensions = map(utils.filter_duplicates, (utils.flatten(metrics), dimensions))
+
+        query_schema = self.data_query_schema(metrics=metrics, dimensions=dimensions,
+                                              metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                              references=references, operations=operations, pagination=pagination)
+
+        dataframe, count = self.query_data_page(**query_schema)
+        return self._select_columns(dataframe, self._final_columns(metrics, references, operation_schema)), count
+
+    def data_count(self, metrics=(), dimensions=(),
+                   metric_filters=(), dimension_filters=(),
+                   operations=()):
+        """
+        Returns the number of rows in the data of a request without fetching the data.
+
+        See ``data`` for the parameters.
+
+        :return:
+            The number of rows.
+        """
+        metrics, dimensions = map(utils.filter_duplicates, (utils.flatten(metrics), dimensions))
+
+        query_schema = self.data_query_schema(metrics=metrics, dimensions=dimensions,
+                                              metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                              operations=operations)
+        return self.query_count(**query_schema)
+
+    def data_many(self, requests, max_workers=4):
+        """
+        Returns the data of several requests, which are queried concurrently.
+
+        Requests which only differ by an equality or contains filter on the same categorical dimension are queried
+        together in one query, grouped by the dimension, and the result is split into the data of each request.
+        Requests with operations or pagination are always queried separately.  The data of each request is returned
+        from and stored in the result cache of the slicer with the same key as by ``data``, so only the requests of a
+        group whose data is not cached are queried.
+
+        :param requests:
+            Type: list[dict]
+            A list of the parameters of ``data`` for each request.
+
+        :param max_workers:
+            Type: int
+            The maximum number of queries run at the same time.
+
+        :return:
+            A list of the data frames returned by ``data`` for each request, in the order of the requests.
+        """
+        requests = [dict(self._request_defaults(), **request)
+                    for request in requests]
+        for request in requests:
+            request['metrics'] = utils.filter_duplicates(utils.flatten(request['metrics']))
+            request['dimensions'] = utils.filter_duplicates(request['dimensions'])
+
+            # The requests are compared to group them, so the parameters given as tuples are converted to lists
+            for key in ['metric_filters', 'dimension_filters', 'references', 'operations']:
+                request[key] = list(request[key])
+
+        groups = self._group_requests(requests)
+        pool = ThreadPool(max(1, min(max_workers, len(groups))))
+        try:
+            group_results = pool.map(self._data_group, groups)
+        finally:
+            pool.close()
+            pool.join()
+
+        results = [None] * len(requests)
+        for group_result in group_results:
+            for index, dataframe in group_result:
+                results[index] = dataframe
+
+        return results
+
+    @staticmethod
+    def _request_defaults():
+        return dict(metrics=(), dimensions=(), metric_filters=(), dimension_filters=(), references=(), operations=(),
+                    pagination=None)
+
+    def _group_requests(self, requests):
+        """
+        Groups the requests which can be queried together.
+
+        :return:
+            A list of groups as tuples of the key of the dimension the requests of the group are split by, the request
+            without its filter on the dimension and a list of tuples of the index, the request and the dimension values
+            of each request of the group.
+        """
+        split_filters = [self._split_filters(request) for request in requests]
+        shared_filters = [(dimension_key, base_request)
+                          for request_split_filters in split_filters
+                          for dimension_key, _, base_request in request_split_filters]
+
+        groups = []
+        for index, (request, request_split_filters) in enumerate(zip(requests, split_filters)):
+            if not request_split_filters:
+                groups.append((None, request, [(index, request, None)]))
+                continue
+
+            # The request is grouped by the filter which it shares with the most requests
+            dimension_key, values, base_request = max(request_split_filters,
+                                                      key=lambda split_filter: shared_filters.count(
+                                                          (split_filter[0], split_filter[2])))
+
+            group = next((group
+                          for group in groups
+                          if group[0] == dimension_key and group[1] == base_request), None)
+            if group is None:
+                groups.append((dimension_key, base_request, [(index, request, values)]))
+            else:
+                group[2].append((index, request, values))
 
+        return groups
+
+    def _split_filters(self, request):
+        """
+        Returns the filters of a request which its data can be split by from the data of several requests as a list of
+        tuples of the key of the dimension, its values and the request without the filter.
+        """
+        from fireant.slicer.schemas import CategoricalDimension
+
+        if request['operations'] or request['pagination']:
+            # Operations and pagination are applied to every row of the query, so they cannot be split
+            return []
+
+        dimension_keys = [utils.slice_first(dimension) for dimension in request['dimensions']]
+
+        split_filters = []
+        for index, dimension_filter in enumerate(request['dimension_filters']):
+            dimension = self.slicer.dimensions.get(dimension_filter.element_key)
+            if not isinstance(dimension, CategoricalDimension):
+                continue
+
+            if isinstance(dimension_filter, EqualityFilter) \
+                    and dimension_filter.operator == 'eq' \
+                    and not isinstance(dimension_filter.value, (list, tuple)):
+                values = [dimension_filter.value]
+
+            elif isinstance(dimension_filter, ContainsFilter):
+                values = list(dimension_filter.values)
+
+            else:
+                continue
+
+            # Several values are aggregated together unless the data is grouped by the dimension
+            if len(values) == 1 or dimension.key in dimension_keys:
+                other_filters = request['dimension_filters'][:index] + request['dimension_filters'][index + 1:]
+                split_filters.append((dimension.key, values, dict(request, dimension_filters=other_filters)))
+
+        return split_filters
+
+    def _data_group(self, group):
+        dimension_key, base_request, members = group
+        if len(members) == 1:
+            index, request, _ = members[0]
+            return [(index, self.data(**request))]
+
+        cache = self.slicer.cache
+        if cache is None:
+            return self._query_group(dimension_key, base_request, members)
+
+        # The data of each request is cached with the same key and version as by ``data``
+        version = self._data_version(cache)
+        keys = {index: self._cache_key(self.data_query_schema(**request), [],
+                                       self._final_columns(request['metrics'], request['references'], []))
+                for index, request, _ in members}
+
+        results, uncached_members = [], []
+        for index, request, values in members:
+            dataframe = None if self.refresh_cache else cache.get(keys[index], version)
+            if dataframe is None:
+                uncached_members.append((index, request, values))
+            else:
+                results.append((index, self._shared_copy(dataframe)))
+
+        if not uncached_members:
+            return results
+
+        uncached_results = self._query_group(dimension_key, base_request, uncached_members)
+        for index, dataframe in uncached_results:
+            cache.set(keys[index], dataframe, version)
+            results.append((index, self._shared_copy(dataframe)))
+
+        return results
+
+    def _query_group(self, dimension_key, base_request, members):
+        """
+        Queries the data of the requests of a group together and splits it into the data of each request.
+        """
+        dimensions = base_request['dimensions']
+        if dimension_key not in [utils.slice_first(dimension) for dimension in dimensions]:
+            dimensions = dimensions + [dimension_key]
+
+        values = utils.filter_duplicates(value
+                                         for _, _, member_values in members
+                                         for value in member_values)
+        dimension_filters = base_request['dimension_filters'] + [ContainsFilter(dimension_key, values)]
+
+        query_schema = self.data_query_schema(**dict(base_request, dimensions=dimensions,
+                                                     dimension_filters=dimension_filters))
+        query_schema.pop('dtypes', None)
+        query = self._build_data_query(**query_schema)
+        dataframe = self._get_dataframe_from_query(query_schema['database'], query)
+
+        return [(index, self._split_data(dataframe, dimension_key, member_values, request))
+                for index, request, member_values in members]
+
+    def _split_data(self, dataframe, dimension_key, values, request):
+        """
+        Selects the rows of the data of a request from the unformatted result of a grouped query and formats them like
+        ``data``.
+        """
+        query_schema = self.data_query_schema(**request)
+
+        columns = [column
+                   for column in dataframe.columns
+                   if column != dimension_key or column in query_schema['dimensions']]
+        dataframe = dataframe.loc[dataframe[dimension_key].isin(values), columns].reset_index(drop=True)
+
+        dataframe = self._format_dataframe(dataframe, query_schema['metrics'], query_schema['dimensions'],
+                                           query_schema['references'], query_schema['dtypes'])
+        return self._select_columns(dataframe, self._final_columns(request['metrics'], request['references'], []))
+
+    @staticmethod
+    def _validate_pagination(operations, pagination):
+        # Top N operations are applied in the query and do not prevent pagination
+        if pagination and any(operation.key != TopN.key for operation in operations):
+            raise SlicerException('Pagination cannot be used when operations are defined!')
+
+    @staticmethod
+    def _final_columns(metrics, references, operation_schema):
         # Filter additional metrics from the dataframe that were needed for operations
         final_columns = metrics + ['%s_%s' % (os['metric'], os['key']) for os in operation_schema]
         if not references:
-            return dataframe[final_columns]
+            return final_columns
 
         reference_columns = [''] + [r.key for r in references]
-        return dataframe[list(itertools.product(reference_columns, final_columns))]
+        return list(itertools.product(reference_columns, final_columns))
+
+    @staticmethod
+    def _select_columns(dataframe, columns):
+        # Selecting columns copies the data frame, so it is only done when there are columns to remove or reorder
+        if list(dataframe.columns) == list(columns):
+            return dataframe
+
+        return dataframe[columns]
 
     def get_query(self, metrics=(), dimensions=(),
                   metric_filters=(), dimension_filters=(),
@@ -93,6 +449,8 @@ class SlicerManager(QueryManager, OperationManager):
                                               metric_filters=metric_filters, dimension_filters=dimension_filters,
                                               references=references, operations=operations, pagination=pagination)
 
+        # The types of the metrics are only used when loading the data
+        query_schema.pop('dtypes', None)
         return self._build_data_query(**query_schema)
 
     def query_string(self, metrics=(), dimensions=(),
@@ -158,8 +516,8 @@ class SlicerManager(QueryManager, OperationManager):
                                                  self.slicer.metrics)
         dimension_joins_schema = self._joins_schema(set(dimensions) | {df.element_key for df in dimension_filters},
                                                     self.slicer.dimensions)
-        return {
-            'database': self.slicer.database,
+        schema = {
+            'database': self.database,
             'table': self.slicer.table,
 
             'metrics': self._metrics_schema(metrics, operations),
@@ -175,9 +533,16 @@ class SlicerManager(QueryManager, OperationManager):
             'joins': list(metric_joins_schema | dimension_joins_schema),
             'references': self._references_schema(references),
             'rollup': self._totals_schema(dimensions, operations),
-            'pagination': pagination
+            'pagination': pagination,
+            'dtypes': self._dtypes_schema(metrics, operations),
         }
 
+        for operation in operations:
+            if operation.key == TopN.key:
+                self._apply_top_n_schema(schema, dimensions, operation)
+
+        return schema
+
     def dimension_option_schema(self, dimension, filters, limit=None):
         dimensions = [dimension]
 
@@ -187,7 +552,7 @@ class SlicerManager(QueryManager, OperationManager):
                                           self.slicer.dimensions)
 
         return {
-            'database': self.slicer.database,
+            'database': self.database,
             'table': self.slicer.hint_table or self.slicer.table,
             'joins': schema_joins,
             'dimensions': schema_dimensions,
@@ -258,6 +623,22 @@ class SlicerManager(QueryManager, OperationManager):
 
         return schema_metrics
 
+    def _dtypes_schema(self, metrics=(), operations=()):
+        keys = list(metrics) + [metric
+                                for op in operations
+                                for metric in op.metrics()]
+
+        schema_dtypes = OrderedDict()
+        for key in keys:
+            schema_metric = self.slicer.metrics.get(key)
+            if schema_metric is None or schema_metric.dtype is None:
+                continue
+
+            for metric_key, _ in schema_metric.schemas():
+                schema_dtypes[metric_key] = schema_metric.dtype
+
+        return schema_dtypes
+
     def _dimensions_schema(self, keys):
         invalid_dimensions = {utils.slice_first(key) for key in keys} - set(self.slicer.dimensions)
         if invalid_dimensions:
@@ -274,7 +655,7 @@ class SlicerManager(QueryManager, OperationManager):
 
             schema_dimension = self.slicer.dimensions.get(dimension)
 
-            for key, definition in schema_dimension.schemas(*args, database=self.slicer.database):
+            for key, definition in schema_dimension.schemas(*args, database=self.database):
                 dimensions[key] = definition or self._default_dimension_definition(key)
 
         return dimensions
@@ -342,6 +723,12 @@ class SlicerManager(QueryManager, OperationManager):
                                                   for opt in dimension.display_options}
                 display_dim['display_options'].update({pd.NaT: '', np.nan: ''})
 
+            is_top_n = any(operation.key == TopN.key and operation.other and operation.dimension_key == key
+                           for operation in operations)
+            if is_top_n and not getattr(dimension, 'display_field', None):
+                display_dim.setdefault('display_options', {pd.NaT: '', np.nan: ''})
+                display_dim['display_options'][TopN.other_key] = TopN.label
+
             if hasattr(dimension, 'display_field') and dimension.display_field:
                 display_dim['display_field'] = '%s_display' % dimension.key
 
@@ -349,6 +736,86 @@ class SlicerManager(QueryManager, OperationManager):
 
         return display_dims
 
+    def _apply_top_n_schema(self, schema, dimensions, operation):
+        """
+        Limits a dimension in a data query schema to its top N values.  A subquery ranking the dimension values by a
+        metric, or by the dimension itself if no metric is given, is joined to the query.  If the operation groups the
+        remaining values, the subquery is left joined and the dimension definitions are replaced so that all values
+        missing from the subquery are grouped into a single "Other" value, otherwise the subquery is inner joined.
+
+        The subquery is filtered with the dimension and metric filters of the request.  Since it is only grouped by
+        the limited dimension, the metric filters apply to the totals of each dimension value.  NULL is ranked like
+        any other value of the dimension.
+
+        :param schema:
+            The data query schema to modify.
+        :param dimensions:
+            The requested list of dimensions.
+        :param operation:
+            The ``TopN`` operation.
+        """
+        from .schemas import (CategoricalDimension,
+                              UniqueDimension)
+
+        if operation.dimension_key not in {utils.slice_first(dimension) for dimension in dimensions}:
+            raise SlicerException("Missing dimensions with keys: {}".format(operation.dimension_key))
+
+        dimension = self.slicer.dimensions[operation.dimension_key]
+        if operation.other and not isinstance(dimension, (CategoricalDimension, UniqueDimension)):
+            raise SlicerException(
+                    'Unable to query with top N values of [{dimension}].  '
+                    'Dimension must be a CategoricalDimension or UniqueDimension.'.format(dimension=dimension.key))
+
+        if operation.by is not None and operation.by not in self.slicer.metrics:
+            raise SlicerException('Invalid metrics included in request: [{}]'.format(operation.by))
+
+        # The subquery is aliased after the dimension, so that its fields can be used in the dimension definitions
+        alias = 'top_{}'.format(dimension.key)
+        if any(isinstance(join[0], QueryBuilder) and join[0].alias == alias for join in schema['joins']):
+            raise SlicerException(
+                    'Unable to query with more than one top N operation for [{dimension}].'.format(
+                            dimension=dimension.key))
+
+        by = [] if operation.by is None else [operation.by]
+        metric_schema = self._metrics_schema(by) if by else OrderedDict()
+        metric_joins_schema = self._joins_schema(set(by), self.slicer.metrics)
+        dimension_definition = schema['dimensions'][dimension.key]
+
+        # Exclude the subqueries of other top N operations
+        table_joins = {join for join in schema['joins'] if not isinstance(join[0], QueryBuilder)}
+
+        top_query = self._build_query_inner(schema['table'], list(table_joins | metric_joins_schema),
+                                            metric_schema, OrderedDict([('value', dimension_definition)]),
+                                            schema['dfilters'], schema['mfilters'], [])
+        if by:
+            top_query = top_query.orderby(metric_schema[operation.by], order=Order.desc)
+        else:
+            top_query = top_query.orderby(dimension_definition)
+        top_query = top_query[:operation.limit]
+
+        if operation.other:
+            # The dimension value of a NULL value in the top N is NULL too, so the joined rows are marked with a value
+            # which is never NULL
+            top_query = top_query.select(fn.Count('*').as_('is_top'))
+
+        # The ranked values are not selected with the key of the dimension, which would be ambiguous in the GROUP BY
+        # clause of the query
+        top_query.alias = alias
+        top_field = top_query.field('value')
+
+        # NULL values are only matched with IS NULL
+        criterion = (dimension_definition == top_field) | (dimension_definition.isnull() & top_field.isnull())
+
+        join_type = JoinType.left if operation.other else JoinType.inner
+        schema['joins'] = schema['joins'] + [(top_query, criterion, join_type)]
+
+        if not operation.other:
+            return
+
+        is_other = top_query.field('is_top').isnull()
+        for level, other_value in zip(dimension.levels(), [TopN.other_key, TopN.label]):
+            schema['dimensions'][level] = Case().when(is_other, other_value).else_(schema['dimensions'][level])
+
     def _references_schema(self, references):
         schema_references = OrderedDict()
         for reference in references:
@@ -436,7 +903,8 @@ class TransformerManager(object):
 
         # Creates a function on the slicer for each transformer
         for tx_key, tx in transformers.items():
-            setattr(self, tx_key, functools.partial(self._get_and_transform_data, tx))
+            handler = self._get_and_transform_page if tx.server_side else self._get_and_transform_data
+            setattr(self, tx_key, functools.partial(handler, tx))
 
     def _get_and_transform_data(self, tx, metrics=(), dimensions=(),
                                 metric_filters=(), dimension_filters=(),
@@ -487,11 +955,81 @@ class TransformerManager(object):
                                            for dimension in dimensions],
                                metric_filters=metric_filters, dimension_filters=dimension_filters,
                                references=references, operations=operations)
-
-        # Loads data and transforms it with a given transformer.
-        dataframe = self.manager.data(metrics=utils.flatten(metrics), dimensions=dimensions,
-                                      metric_filters=metric_filters, dimension_filters=dimension_filters,
-                                      references=references, operations=operations, pagination=pagination)
+        query_operations = tx.query_operations(self.manager.slicer, metrics=metrics,
+                                               dimensions=[utils.slice_first(dimension)
+                                                           for dimension in dimensions],
+                                               metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                               references=references, operations=operations)
+        if query_operations:
+            operations = list(operations) + query_operations
+
+        # Loads data and transforms it with a given transformer.  Transformers that can stream their output are given
+        # a generator of data frames that are fetched in chunks.
+        if tx.fetch_chunksize:
+            dataframe = self.manager.data_chunks(tx.fetch_chunksize, metrics=utils.flatten(metrics),
+                                                 dimensions=dimensions,
+                                                 metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                                 references=references, operations=operations, pagination=pagination)
+        else:
+            dataframe = self.manager.data(metrics=utils.flatten(metrics), dimensions=dimensions,
+                                          metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                          references=references, operations=operations, pagination=pagination)
         display_schema = self.manager.display_schema(metrics, dimensions, references, operations)
 
         return tx.transform(dataframe, display_schema)
+
+    def _get_and_transform_page(self, tx, params, metrics=(), dimensions=(),
+                                metric_filters=(), dimension_filters=(),
+                                references=(), operations=()):
+        """
+        Handles a server-side processing request for a page of a table and applies a transformation to the page.  This
+        is the implementation of the transformer manager methods of server-side transformers.
+
+        The transformer translates the request parameters into a ``Paginator`` and a list of dimension filters for the
+        search, which are applied in the query.  The number of rows matching the search is counted in the same query as
+        the page.  The total number of rows is only counted in a separate query when searching or when the page is
+        empty.
+
+        :param tx:
+            The transformer to use
+
+        :param params:
+            The parameters of the request sent by the table.
+
+        See ``_get_and_transform_data`` for the other parameters.
+
+        :return:
+            The transformed page of the request.
+        """
+        tx.prevalidate_request(self.manager.slicer, metrics=metrics,
+                               dimensions=[utils.slice_first(dimension)
+                                           for dimension in dimensions],
+                               metric_filters=metric_filters, dimension_filters=dimension_filters,
+                               references=references, operations=operations)
+        draw, pagination, search_filters = tx.parse_request(self.manager.slicer, params, metrics=metrics,
+                                                            dimensions=[utils.slice_first(dimension)
+                                                                        for dimension in dimensions],
+                                                            references=references)
+        filtered_dimension_filters = list(dimension_filters) + search_filters
+
+        dataframe, records_filtered = self.manager.data_page(metrics=utils.flatten(metrics), dimensions=dimensions,
+                                                             metric_filters=metric_filters,
+                                                             dimension_filters=filtered_dimension_filters,
+                                                             references=references, operations=operations,
+                                                             pagination=pagination)
+        if records_filtered is None:
+            records_filtered = self.manager.data_count(metrics=utils.flatten(metrics), dimensions=dimensions,
+                                                       metric_filters=metric_filters,
+                                                       dimension_filters=filtered_dimension_filters,
+                                                       operations=operations)
+
+        records_total = records_filtered
+        if search_filters:
+            records_total = self.manager.data_count(metrics=utils.flatten(metrics), dimensions=dimensions,
+                                                    metric_filters=metric_filters, dimension_filters=dimension_filters,
+                                                    operations=operations)
+
+        display_schema = self.manager.display_schema(metrics, dimensions, references, operations)
+
+        return tx.transform_page(dataframe, display_schema, draw=draw,
+                                 records_total=records_total, records_filtered=records_filtered)
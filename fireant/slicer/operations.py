@@ -26,6 +26,54 @@ class Totals(Operation):
     def __init__(self, *dimension_keys):
         self.dimension_keys = dimension_keys
 
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) \
+               and self.dimension_keys == other.dimension_keys
+
+    def __hash__(self):
+        return hash((self.key,) + self.dimension_keys)
+
+
+class TopN(Operation):
+    """
+    `Operation` for limiting a dimension to its top N values ranked by a metric.  This is applied in the query, where
+    the remaining values of the dimension are grouped together into a single "Other" value, so that at most N + 1
+    values are returned for the dimension.  Alternatively, the remaining values can be excluded from the result.
+    """
+    key = '_topn'
+    label = 'Other'
+
+    # The value used for the grouped remaining values of the dimension
+    other_key = '_other'
+
+    def __init__(self, dimension_key, limit, by=None, other=True):
+        """
+        :param dimension_key:
+            The key of the dimension to limit.  Only categorical or unique dimensions can be grouped into "Other".
+        :param limit:
+            The number of dimension values to keep.
+        :param by:
+            The key of the metric used to rank the dimension values in descending order.  If None, the first values of
+            the dimension in ascending order are kept.
+        :param other:
+            If True, the remaining values of the dimension are grouped into an "Other" value, otherwise they are
+            excluded from the result.
+        """
+        self.dimension_key = dimension_key
+        self.limit = limit
+        self.by = by
+        self.other = other
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) \
+               and self.dimension_key == other.dimension_key \
+               and self.limit == other.limit \
+               and self.by == other.by \
+               and self.other == other.other
+
+    def __hash__(self):
+        return hash((self.key, self.dimension_key, self.limit, self.by, self.other))
+
 
 class L1Loss(Operation):
     """
@@ -38,6 +86,14 @@ class L1Loss(Operation):
         self.metric_key = metric_key
         self.target_metric_key = target_metric_key
 
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) \
+               and self.metric_key == other.metric_key \
+               and self.target_metric_key == other.target_metric_key
+
+    def __hash__(self):
+        return hash((self.key, self.metric_key, self.target_metric_key))
+
     def schemas(self):
         return {
             'key': self.key,
@@ -67,6 +123,13 @@ class CumSum(Operation):
     def __init__(self, metric_key):
         self.metric_key = metric_key
 
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) \
+               and self.metric_key == other.metric_key
+
+    def __hash__(self):
+        return hash((self.key, self.metric_key))
+
     def schemas(self):
         return {
             'key': self.key,
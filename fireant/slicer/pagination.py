@@ -12,6 +12,15 @@ class Paginator(object):
         self.limit = limit
         self.order = order
 
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) \
+               and self.offset == other.offset \
+               and self.limit == other.limit \
+               and list(self.order) == list(other.order)
+
+    def __hash__(self):
+        return hash((self.offset, self.limit, tuple(self.order)))
+
     def __str__(self):
         return 'offset: {offset} limit: {limit} order: {order}'.format(offset=self.offset,
                                                                        limit=self.limit,
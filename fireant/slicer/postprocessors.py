@@ -32,8 +32,25 @@ FUNCTIONS = {
 
 
 class OperationManager(object):
-    def post_process(self, dataframe, operation_schema):
-        dataframe = dataframe.copy()
+    def post_process(self, dataframe, operation_schema, inplace=False):
+        """
+        Adds a column to the data frame for each operation in the operation schema.
+
+        :param dataframe:
+            The data frame returned by the query.
+        :param operation_schema:
+            A list of operation schemas.
+        :param inplace:
+            Add the columns to the data frame instead of a copy of it.  The data frame is never copied when there are no
+            operations.
+        :return:
+            The data frame with the columns of the operations.
+        """
+        if not operation_schema:
+            return dataframe
+
+        if not inplace:
+            dataframe = dataframe.copy()
 
         for schema in operation_schema:
             key = schema['key']
@@ -2,16 +2,21 @@
 import copy
 import logging
 import time
+from collections import OrderedDict
 from functools import partial
 from itertools import chain
 
+import numpy as np
 import pandas as pd
 from pypika import (
+    Field,
     JoinType,
     MySQLQuery,
     PostgreSQLQuery,
     RedshiftQuery,
+    functions as fn,
 )
+from pypika.queries import QueryBuilder
 
 from fireant import utils
 from fireant.slicer.references import (
@@ -22,11 +27,27 @@ from fireant.slicer.references import (
 
 query_logger = logging.getLogger('fireant.query_log$')
 
+# The dtype of metrics whose DECIMAL or NUMERIC values are converted to float64
+DECIMAL_AS_FLOAT = 'decimal-as-float'
+
 
 class QueryNotSupportedError(Exception):
     pass
 
 
+class CountOver(fn.Count):
+    """
+    COUNT(*) OVER () - the number of rows in the result of a query, selected in every row.  The window is applied
+    before the limit and offset of the query, so it counts the rows of every page.
+    """
+
+    def __init__(self, alias=None):
+        super(CountOver, self).__init__('*', alias=alias)
+
+    def get_function_sql(self, **kwargs):
+        return '{} OVER ()'.format(super(CountOver, self).get_function_sql(**kwargs))
+
+
 class QueryManager(object):
     def __init__(self, database):
         # Get the correct pypika database query class
@@ -35,7 +56,7 @@ class QueryManager(object):
     def query_data(self, database, table, joins=None,
                    metrics=None, dimensions=None,
                    mfilters=None, dfilters=None,
-                   references=None, rollup=None, pagination=None):
+                   references=None, rollup=None, pagination=None, dtypes=None):
         """
         Loads a pandas data frame given a table and a description of the request.
 
@@ -124,39 +145,210 @@ class QueryManager(object):
             Type: ``fireant.slicer.pagination.Paginator``
             (Optional) A Paginator class defining the limit, offset and order by statements for the query
 
+        :param dtypes:
+            Type: dict[str: str]
+            (Optional) A dict containing the numpy types to store the values of metrics as.  The key must match a key of
+            the metrics parameter.  Reference values are stored with the same type, except for delta percentages which
+            are only converted to float types.
+
         :return:
             A pd.DataFrame indexed by the provided dimensions parameters containing columns for each metrics parameter.
         """
-        if rollup and issubclass(database.query_cls, (MySQLQuery, PostgreSQLQuery, RedshiftQuery)):
-            # MySQL, postgreSQL and Redshift doesn't support query rollups in the same way as Vertica, Oracle etc.
-            # We therefore don't support it for now.
-            raise QueryNotSupportedError("This database type currently doesn't support ROLLUP operations!")
+        self._validate_rollup(database, rollup)
 
         query = self._build_data_query(
             database, table, joins, metrics, dimensions, dfilters, mfilters, references, rollup, pagination
         )
 
         dataframe = self._get_dataframe_from_query(database, query)
+        return self._format_dataframe(dataframe, metrics, dimensions, references, dtypes)
+
+    def query_data_chunks(self, database, table, joins=None,
+                          metrics=None, dimensions=None,
+                          mfilters=None, dfilters=None,
+                          references=None, rollup=None, pagination=None, dtypes=None,
+                          chunksize=None):
+        """
+        Loads the same data as ``query_data`` but yields it as pandas data frames of at most `chunksize` rows, which
+        are fetched from the database as they are consumed.  The query is built immediately, so that invalid requests
+        fail before the first chunk is requested.
+
+        :param chunksize:
+            The maximum number of rows in each data frame.
+
+        See ``query_data`` for the other parameters.
+
+        :return:
+            A generator of pd.DataFrames indexed by the provided dimensions parameters containing columns for each
+            metrics parameter.
+        """
+        self._validate_rollup(database, rollup)
+
+        query = self._build_data_query(
+            database, table, joins, metrics, dimensions, dfilters, mfilters, references, rollup, pagination
+        )
+
+        return (self._format_dataframe(dataframe, metrics, dimensions, references, dtypes)
+                for dataframe in self._get_dataframe_chunks_from_query(database, query, chunksize))
+
+    def query_data_page(self, database, table, joins=None,
+                        metrics=None, dimensions=None,
+                        mfilters=None, dfilters=None,
+                        references=None, rollup=None, pagination=None, dtypes=None):
+        """
+        Loads a page of the same data as ``query_data`` along with the number of rows in the data of every page.  The
+        rows are counted with COUNT(*) OVER () in the same query, so only the rows of the page are fetched.
+
+        See ``query_data`` for the parameters.
+
+        :return:
+            A tuple of a pd.DataFrame containing the page and the number of rows in the data of every page.  The number
+            of rows is None if the page is empty, since there are no rows to select it in.
+        """
+        self._validate_rollup(database, rollup)
+
+        query = self._build_data_query(
+            database, table, joins, metrics, dimensions, dfilters, mfilters, references, rollup, pagination
+        )
+        query = query.select(CountOver().as_('_count'))
+
+        dataframe = self._get_dataframe_from_query(database, query)
+
+        # The count is the last column selected
+        count_column = dataframe.columns[-1]
+        count = int(dataframe[count_column].iloc[0]) if len(dataframe) else None
+        del dataframe[count_column]
+
+        return self._format_dataframe(dataframe, metrics, dimensions, references, dtypes), count
+
+    def query_count(self, database, table, joins=None,
+                    metrics=None, dimensions=None,
+                    mfilters=None, dfilters=None,
+                    references=None, rollup=None, pagination=None, dtypes=None):
+        """
+        Counts the rows of the data that ``query_data`` would load without loading it.  References, pagination and
+        dtypes do not change the number of rows and are ignored.
+
+        See ``query_data`` for the parameters.
+
+        :return:
+            The number of rows.
+        """
+        self._validate_rollup(database, rollup)
+
+        # Metrics are only selected when there are no dimensions, since the inner query must select something
+        inner_query = self._build_query_inner(table, joins or [], metrics if not dimensions else {}, dimensions or {},
+                                              dfilters, mfilters, rollup or [])
+        query = self.query_cls.from_(inner_query).select(fn.Count('*'))
+
+        return database.fetch(str(query))[0][0]
+
+    @staticmethod
+    def _validate_rollup(database, rollup):
+        if rollup and issubclass(database.query_cls, (MySQLQuery, PostgreSQLQuery, RedshiftQuery)):
+            # MySQL, postgreSQL and Redshift doesn't support query rollups in the same way as Vertica, Oracle etc.
+            # We therefore don't support it for now.
+            raise QueryNotSupportedError("This database type currently doesn't support ROLLUP operations!")
+
+    @staticmethod
+    def _format_dataframe(dataframe, metrics, dimensions, references, dtypes=None):
         dataframe.columns = [col.decode('utf-8') if isinstance(col, bytes) else col
                              for col in dataframe.columns]
 
+        dimension_keys = set(dimensions or ())
+        metric_dtypes = QueryManager._metric_column_dtypes(dtypes, references)
         for column in dataframe.columns:
+            values = dataframe[column]
+
+            if column in metric_dtypes:
+                dataframe[column] = QueryManager._convert_metric(values, metric_dtypes[column])
+                continue
+
+            if column in dimension_keys and values.dtype == bool:
+                # Boolean dimension values cannot be missing, so they are only stored as categoricals
+                dataframe[column] = values.astype('category')
+                continue
+
             # Only replace NaNs for columns of type object. Column types other than that tend to be checked
             # against in the transformers. Which would be a problem when replacing NaNs with a string
             # because that alters the type of the column.
-            if dataframe[column].dtype == object:
-                dataframe[column] = dataframe[column].fillna('')
+            if values.dtype != object:
+                continue
+
+            if column in dimension_keys:
+                # Dimension values are stored as categoricals so that each value is only stored once and NaNs are
+                # replaced once per column instead of once per row.
+                dataframe[column] = QueryManager._fill_categorical(values.astype('category'), '')
 
+            else:
+                dataframe[column] = values.fillna('')
+
+        # The data frame is only used here, so it is indexed and filled in place instead of being copied for each step
         if dimensions:
-            dataframe = dataframe.set_index(
+            dataframe.set_index(
                 # Removed the reference keys for now
-                list(dimensions.keys())  # + ['{1}_{0}'.format(*ref) for ref in references.items()]
+                list(dimensions.keys()),  # + ['{1}_{0}'.format(*ref) for ref in references.items()]
+                inplace=True
             )
 
         if references:
             dataframe.columns = pd.MultiIndex.from_product([[''] + list(references.keys()), list(metrics.keys())])
 
-        return dataframe.fillna(0)
+        dataframe.fillna(0, inplace=True)
+        return dataframe
+
+    @staticmethod
+    def _metric_column_dtypes(dtypes, references):
+        if not dtypes:
+            return {}
+
+        column_dtypes = {metric_key: QueryManager._numpy_dtype(dtype)
+                         for metric_key, dtype in dtypes.items()}
+        for reference_key, reference in (references or {}).items():
+            for metric_key in dtypes:
+                dtype = column_dtypes[metric_key]
+
+                # Delta percentages are fractions, so integer types would truncate them
+                if reference['modifier'] is DeltaPercentage.modifier and np.dtype(dtype).kind != 'f':
+                    continue
+
+                column_dtypes['{}_{}'.format(metric_key, reference_key)] = dtype
+
+        return column_dtypes
+
+    @staticmethod
+    def _numpy_dtype(dtype):
+        # Decimals are only converted to floats when the metric asks for it, since floats lose their precision
+        return np.float64 if dtype == DECIMAL_AS_FLOAT else dtype
+
+    @staticmethod
+    def _convert_metric(values, dtype):
+        values = QueryManager._to_numeric(values)
+        if np.dtype(dtype).kind in 'iu' and values.dtype.kind == 'f':
+            # Integer types cannot hold infinite values either, such as ratios divided by zero, so they are replaced
+            # like missing values
+            values = values.where(np.isfinite(values))
+
+        # Missing values are replaced before converting since integer types cannot hold NaNs
+        return values.fillna(0).astype(dtype, copy=False)
+
+    @staticmethod
+    def _to_numeric(values):
+        if values.dtype != object:
+            return values
+
+        # Converts all of the values at once, missing values become NaN
+        return values.astype(np.float64)
+
+    @staticmethod
+    def _fill_categorical(values, fill_value):
+        if not values.isnull().any():
+            return values
+
+        if fill_value not in values.cat.categories:
+            values = values.cat.add_categories([fill_value])
+
+        return values.fillna(fill_value)
 
     def _get_dataframe_from_query(self, database, query):
         """
@@ -180,6 +372,28 @@ class QueryManager(object):
 
         return dataframe
 
+    def _get_dataframe_chunks_from_query(self, database, query, chunksize):
+        """
+        Yields Pandas Dataframes of at most `chunksize` rows built from the result of the query.
+        The query is also logged along with its duration once all of the chunks have been fetched.
+
+        :param database: Database object
+        :param query: PyPika query object
+        :param chunksize: The maximum number of rows in each Dataframe
+        :return: A generator of Pandas Dataframes built from the result of the query
+        """
+        start_time = time.time()
+        query_string = str(query)
+        query_logger.debug(query_string)
+
+        for dataframe in database.fetch_dataframe_chunks(query_string, chunksize):
+            yield dataframe
+
+        query_logger.info('[duration: {duration} seconds]: {query}'.format(
+            duration=round(time.time() - start_time, 4),
+            query=query_string)
+        )
+
     def query_dimension_options(self, database, table, joins=None, dimensions=None, filters=None, limit=None):
         """
         Builds and executes a query to retrieve possible dimension options given a set of filters.
@@ -234,6 +448,9 @@ class QueryManager(object):
 
             date_add = partial(database.date_add, date_part=schema['time_unit'], interval=schema['interval'])
 
+            # The dimensions are shared by every reference and by the request, so they are copied before being replaced
+            ref_dimensions = dimensions
+
             # The interval term from pypika does not take into account leap years, therefore the interval
             # needs to be replaced with a database specific one when appropriate.
             yoy_keys = [YoY.key, Delta.generate_key(YoY.key), DeltaPercentage.generate_key(YoY.key)]
@@ -247,13 +464,15 @@ class QueryManager(object):
                 # week is the default date format. Vertica uses 'IW'.
                 if hasattr(dim, 'date_format') and dim.date_format in [week, 'IW']:
                     trunc_and_add = database.trunc_date(database.date_add('year', 1, dim.field), 'week')
-                    dimensions[dimension_key] = database.date_add('year', -1, field=trunc_and_add)
+                    ref_dimensions = OrderedDict(dimensions)
+                    ref_dimensions[dimension_key] = database.date_add('year', -1, field=trunc_and_add)
 
             # Don't reuse the dfilters arg otherwise intervals will be aggregated on each iteration
             replaced_dfilters = self._replace_filters_for_ref(dfilters, schema['definition'], date_add)
-            ref_query = self._build_query_inner(table, joins, metrics, dimensions,
+            ref_query = self._build_query_inner(table, joins, metrics, ref_dimensions,
                                                 replaced_dfilters, mfilters, rollup)
-            join_criteria = self._build_reference_join_criteria(dimension_key, dimensions, date_add, query, ref_query)
+            join_criteria = self._build_reference_join_criteria(dimension_key, ref_dimensions, date_add, query,
+                                                                 ref_query)
 
             # Optional modifier function to modify the metric in the reference query. This is for delta and delta
             # percentage references. It is None for normal references and this default should be used
@@ -305,6 +524,14 @@ class QueryManager(object):
     @staticmethod
     def _add_joins(joins, query):
         for join_table, criterion, join_type in joins:
+            if isinstance(join_table, QueryBuilder) and join_table.alias:
+                # PyPika replaces the alias of a joined subquery with sq0, sq1, ..., so a copy is joined to keep the
+                # alias that the fields of the subquery are used with.  The schema is not modified by building queries.
+                alias, join_table = join_table.alias, copy.copy(join_table)
+                query = query.join(join_table, how=join_type).on(criterion)
+                join_table.alias = alias
+                continue
+
             query = query.join(join_table, how=join_type).on(criterion)
         return query
 
@@ -359,7 +586,8 @@ class QueryManager(object):
         """ Add offset, limit and order pagination to the query """
         query = query[pagination.offset: pagination.limit]
         for key, order in pagination.order:
-            query = query.orderby(key, order=order)
+            # The keys are the aliases of the selected columns, so they are not qualified with the table
+            query = query.orderby(Field(key), order=order)
         return query
 
     @staticmethod
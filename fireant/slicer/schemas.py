@@ -45,11 +45,22 @@ class Metric(SlicerElement):
     The `Metric` class represents a metric in the `Slicer` object.
     """
 
-    def __init__(self, key, label=None, definition=None, joins=None, precision=None, prefix=None, suffix=None):
+    def __init__(self, key, label=None, definition=None, joins=None, precision=None, prefix=None, suffix=None,
+                 dtype=None):
+        """
+        :param dtype:
+            The numpy type the values of the metric are stored as in the data frame, for example ``'float32'``,
+            ``'int32'`` or ``'int64'``, or ``'decimal-as-float'`` to convert decimals to ``float64``.  Missing values,
+            and infinite values for integer types, are replaced with zero before the values are converted.  Defaults
+            to the type returned by the database driver.
+
+        See ``SlicerElement`` for the other parameters.
+        """
         super(Metric, self).__init__(key, label, definition, joins)
         self.precision = precision
         self.prefix = prefix
         self.suffix = suffix
+        self.dtype = dtype
 
 
 class Dimension(SlicerElement):
@@ -172,7 +183,8 @@ class Join(object):
 
 
 class Slicer(object):
-    def __init__(self, table, database, metrics=tuple(), dimensions=tuple(), joins=tuple(), hint_table=None):
+    def __init__(self, table, database, metrics=tuple(), dimensions=tuple(), joins=tuple(), hint_table=None,
+                 cache=None, freshness_probe=None, freshness_interval=60):
         """
         Constructor for a slicer.  Contains all the fields to initialize the slicer.
 
@@ -197,6 +209,18 @@ class Slicer(object):
             A hint table used for querying dimension options.  If not present, the table will be used.  The hint_table
             must have the same definition as the table omitting dimensions which do not have a set of options (such as
             datetime dimensions) and the metrics.  This is provided to more efficiently query dimension options.
+
+        :param cache: (Optional)
+            A ``fireant.slicer.cache.ResultCache`` which caches the data returned by the slicer manager.  A cache can be
+            shared by several slicers.  If not present, the data is queried for every request.
+
+        :param freshness_probe: (Optional)
+            A Pypika query which returns a value that changes whenever the data of the slicer changes, such as the last
+            time the table was loaded.  The cached data of the slicer is only returned while the result of this query
+            is unchanged.  The query should be cheap to run, for example on a table which logs the loads of the table.
+
+        :param freshness_interval: (Optional)
+            The number of seconds for which the result of the freshness probe is reused before running it again.
         """
         self.table = table
         self.database = database
@@ -205,6 +229,9 @@ class Slicer(object):
         self.dimensions = {dimension.key: dimension for dimension in dimensions}
         self.joins = {join.key: join for join in joins}
         self.hint_table = hint_table
+        self.cache = cache
+        self.freshness_probe = freshness_probe
+        self.freshness_interval = freshness_interval
 
         self.manager = SlicerManager(self)
         for name, bundle in transformers.BUNDLES.items():
@@ -7,7 +7,16 @@ from .datatables import (DataTablesRowIndexTransformer,
 from .datatables import (DataTablesRowIndexTransformer,
                          DataTablesColumnIndexTransformer,
                          CSVRowIndexTransformer,
-                         CSVColumnIndexTransformer)
+                         CSVColumnIndexTransformer,
+                         DataTablesRowIndexStreamTransformer,
+                         DataTablesColumnIndexStreamTransformer,
+                         CSVRowIndexStreamTransformer,
+                         CSVColumnIndexStreamTransformer,
+                         DataTablesServerSideTransformer)
+from .arrow import (ArrowTransformer,
+                    ArrowStreamTransformer,
+                    FeatherTransformer,
+                    ParquetTransformer)
 from .highcharts import (HighchartsLineTransformer,
                          HighchartsAreaTransformer,
                          HighchartsAreaPercentageTransformer,
@@ -25,6 +34,16 @@ ROW_INDEX_TABLE = 'row_index_table'
 ROW_INDEX_CSV = 'row_index_csv'
 COLUMN_INDEX_TABLE = 'column_index_table'
 COLUMN_INDEX_CSV = 'column_index_csv'
+ROW_INDEX_TABLE_COLUMNAR = 'row_index_table_columnar'
+COLUMN_INDEX_TABLE_COLUMNAR = 'column_index_table_columnar'
+ROW_INDEX_TABLE_STREAM = 'row_index_table_stream'
+COLUMN_INDEX_TABLE_STREAM = 'column_index_table_stream'
+ROW_INDEX_CSV_STREAM = 'row_index_csv_stream'
+COLUMN_INDEX_CSV_STREAM = 'column_index_csv_stream'
+ROW_INDEX_TABLE_SERVER_SIDE = 'row_index_table_server_side'
+ARROW_STREAM = 'arrow_stream'
+FEATHER = 'feather'
+PARQUET = 'parquet'
 LINE_CHART = 'line_chart'
 BAR_CHART = 'bar_chart'
 AREA_CHART = 'area_chart'
@@ -56,5 +75,17 @@ BUNDLES = {
         COLUMN_INDEX_TABLE: DataTablesColumnIndexTransformer(),
         ROW_INDEX_CSV: CSVRowIndexTransformer(),
         COLUMN_INDEX_CSV: CSVColumnIndexTransformer(),
+        ROW_INDEX_TABLE_COLUMNAR: DataTablesRowIndexTransformer(columnar=True),
+        COLUMN_INDEX_TABLE_COLUMNAR: DataTablesColumnIndexTransformer(columnar=True),
+        ROW_INDEX_TABLE_STREAM: DataTablesRowIndexStreamTransformer(),
+        COLUMN_INDEX_TABLE_STREAM: DataTablesColumnIndexStreamTransformer(),
+        ROW_INDEX_CSV_STREAM: CSVRowIndexStreamTransformer(),
+        COLUMN_INDEX_CSV_STREAM: CSVColumnIndexStreamTransformer(),
+        ROW_INDEX_TABLE_SERVER_SIDE: DataTablesServerSideTransformer(),
+    },
+    'arrow': {
+        ARROW_STREAM: ArrowStreamTransformer(),
+        FEATHER: FeatherTransformer(),
+        PARQUET: ParquetTransformer(),
     },
 }
@@ -0,0 +1,157 @@
+# coding: utf-8
+import json
+
+import pandas as pd
+
+from . import Transformer, TransformationException
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise TransformationException('Missing library: pyarrow')
+
+    return pyarrow
+
+
+class ArrowTransformer(Transformer):
+    """
+    Converts the result of a request into an Arrow table, which keeps the types of the data instead of formatting it
+    as text.  The dimensions are the index columns of the table and there is one column per metric.  Reference metrics
+    are named ``{metric}_{reference}`` like in the query.  Categorical dimensions are dictionary encoded and the values
+    of the metrics are not rounded.
+
+    The labels of the dimensions, metrics and references and the other display options are stored as JSON in the
+    ``fireant`` key of the schema metadata of the table.  The pandas metadata is stored as well, so the table is
+    converted back to the same data frame with ``to_pandas``.
+
+    The ``transform`` method of subclasses returns the table serialized as bytes.
+    """
+
+    def transform(self, dataframe, display_schema):
+        return self.to_table(dataframe, display_schema)
+
+    def to_table(self, dataframe, display_schema):
+        """
+        :return:
+            A ``pyarrow.Table`` containing the data.
+        """
+        pyarrow = _import_pyarrow()
+
+        dataframe = self._prepare_dataframe(dataframe, display_schema)
+        table = pyarrow.Table.from_pandas(dataframe)
+
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'fireant'] = json.dumps(self._metadata(display_schema)).encode('utf-8')
+        return table.replace_schema_metadata(metadata)
+
+    def _prepare_dataframe(self, dataframe, display_schema):
+        if isinstance(dataframe.columns, pd.MultiIndex):
+            dataframe = dataframe.copy(deep=False)
+            dataframe.columns = ['%s_%s' % (metric, reference) if reference else metric
+                                 for reference, metric in dataframe.columns]
+
+        categorical_keys = {key
+                            for key, dimension in display_schema['dimensions'].items()
+                            if 'display_options' in dimension}
+        index_names = list(dataframe.index.names)
+        if not categorical_keys & set(index_names):
+            return dataframe
+
+        dataframe = dataframe.copy(deep=False)
+        dataframe.index = pd.MultiIndex.from_arrays(
+            [pd.Categorical(dataframe.index.get_level_values(name))
+             if name in categorical_keys
+             else dataframe.index.get_level_values(name)
+             for name in index_names],
+            names=index_names
+        ) if 1 < len(index_names) else pd.CategoricalIndex(dataframe.index, name=index_names[0])
+
+        return dataframe
+
+    @staticmethod
+    def _metadata(display_schema):
+        dimensions = {}
+        for key, dimension in display_schema['dimensions'].items():
+            dimensions[key] = {attr: value
+                               for attr, value in dimension.items()
+                               if attr != 'display_options'}
+
+            if 'display_options' in dimension:
+                # The options for missing values are only used for rendering
+                dimensions[key]['display_options'] = {str(option): label
+                                                      for option, label in dimension['display_options'].items()
+                                                      if not pd.isnull(option)}
+
+        return {
+            'dimensions': dimensions,
+            'metrics': display_schema['metrics'],
+            'references': display_schema.get('references') or {},
+        }
+
+
+class ArrowStreamTransformer(ArrowTransformer):
+    """
+    Returns the result of a request as bytes in the Arrow IPC stream format.
+    """
+
+    def transform(self, dataframe, display_schema):
+        pyarrow = _import_pyarrow()
+        table = self.to_table(dataframe, display_schema)
+
+        sink = pyarrow.BufferOutputStream()
+        writer = pyarrow.RecordBatchStreamWriter(sink, table.schema)
+        writer.write_table(table)
+        writer.close()
+
+        return sink.getvalue().to_pybytes()
+
+
+class FeatherTransformer(ArrowTransformer):
+    """
+    Returns the result of a request as bytes in the Feather format.
+    """
+
+    def __init__(self, compression=None):
+        """
+        :param compression:
+            The compression of the Feather file, one of ``'lz4'``, ``'zstd'`` or ``'uncompressed'``.  Defaults to the
+            default of pyarrow.
+        """
+        self.compression = compression
+
+    def transform(self, dataframe, display_schema):
+        pyarrow = _import_pyarrow()
+        from pyarrow import feather
+
+        table = self.to_table(dataframe, display_schema)
+
+        sink = pyarrow.BufferOutputStream()
+        feather.write_feather(table, sink, compression=self.compression)
+
+        return sink.getvalue().to_pybytes()
+
+
+class ParquetTransformer(ArrowTransformer):
+    """
+    Returns the result of a request as bytes in the Parquet format.
+    """
+
+    def __init__(self, compression='snappy'):
+        """
+        :param compression:
+            The compression of the Parquet file, for example ``'snappy'``, ``'gzip'``, ``'zstd'`` or ``None``.
+        """
+        self.compression = compression
+
+    def transform(self, dataframe, display_schema):
+        pyarrow = _import_pyarrow()
+        from pyarrow import parquet
+
+        table = self.to_table(dataframe, display_schema)
+
+        sink = pyarrow.BufferOutputStream()
+        parquet.write_table(table, sink, compression=self.compression)
+
+        return sink.getvalue().to_pybytes()
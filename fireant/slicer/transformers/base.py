@@ -2,12 +2,33 @@
 
 
 class Transformer(object):
+    # If set, the data for the transformer is fetched in chunks of this many rows and the transformer is given a
+    # generator of data frames instead of a single data frame.
+    fetch_chunksize = None
+
+    # If set, the transformer handles server-side processing requests for a page of the data.  See
+    # ``DataTablesServerSideTransformer``.
+    server_side = False
+
     def prevalidate_request(self, slicer, metrics, dimensions,
                             metric_filters, dimension_filters,
                             references, operations):
         pass
 
+    def query_operations(self, slicer, metrics, dimensions,
+                         metric_filters, dimension_filters,
+                         references, operations):
+        """
+        Returns a list of additional operations to apply to the query of a request, which limit the data that is
+        queried to the data that this transformer actually uses.
+        """
+        return []
+
     def transform(self, dataframe, display_schema):
+        """
+        Transforms a data frame into the output format of this transformer.  The widgets of a group share the values
+        of their data, so transformers must not modify the data frame.
+        """
         raise NotImplementedError
 
 
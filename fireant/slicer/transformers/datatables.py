@@ -1,15 +1,29 @@
 # coding: utf-8
+import json
 import locale as lc
+import re
+import zlib
+from collections import OrderedDict
 from datetime import time
 
 import numpy as np
 import pandas as pd
-from fireant import settings
-from fireant.slicer.operations import Totals
-from fireant.slicer.transformers import Transformer
+from fireant import (settings,
+                    utils)
+from fireant.slicer.filters import WildcardFilter
+from fireant.slicer.operations import (TopN,
+                                       Totals)
+from fireant.slicer.pagination import Paginator
+from fireant.slicer.transformers import (TransformationException,
+                                         Transformer)
+from pypika import Order
+from pypika.terms import ValueWrapper
 
 NO_TIME = time(0)
 
+# Older versions of PyPika render string literals without escaping their quotes, later versions double them
+_PYPIKA_ESCAPES_QUOTES = ValueWrapper("'").get_sql() == "''''"
+
 
 def _safe(value):
     if isinstance(value, pd.Timestamp):
@@ -21,11 +35,11 @@ def _safe(value):
     if value is None or (isinstance(value, float) and np.isnan(value)) or pd.isnull(value):
         return None
 
-    if isinstance(value, np.int64):
-        # Cannot transform np.int64 to json
+    if isinstance(value, np.integer):
+        # Cannot transform numpy integers to json
         return int(value)
 
-    if isinstance(value, np.float64):
+    if isinstance(value, np.floating):
         return float(value)
 
     return value
@@ -62,6 +76,120 @@ def _format_value(value, metric):
     return {'value': raw_value, 'display': _pretty(raw_value, metric) if raw_value is not None else None}
 
 
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return str(value)
+
+
+def _row_blocks(dataframes, chunksize):
+    # Splits each data frame into blocks of at most `chunksize` rows.  An empty data frame is kept as an empty block, so
+    # that the columns of an empty result are still rendered.
+    for dataframe in dataframes:
+        for start in range(0, max(len(dataframe), 1), chunksize):
+            yield dataframe.iloc[start:start + chunksize]
+
+
+def _encode_chunks(chunks, encoding, compress=False):
+    # A wbits value of 16 + MAX_WBITS writes the gzip header and trailer
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    for chunk in chunks:
+        data = chunk.encode(encoding)
+
+        if compressor is not None:
+            data = compressor.compress(data)
+
+        if data:
+            yield data
+
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def _nested_params(params):
+    """
+    Converts request parameters with keys such as ``order[0][column]``, as DataTables sends them in a query string or a
+    form, to nested dicts and lists.
+    """
+    nested = {}
+    for key, value in params.items():
+        parts = re.findall(r'[^\[\]]+', key)
+        if not parts:
+            continue
+
+        node = nested
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+
+    return _nested_lists(nested)
+
+
+def _nested_lists(node):
+    if not isinstance(node, dict):
+        return node
+
+    if node and all(key.isdigit() for key in node):
+        return [_nested_lists(node[key]) for key in sorted(node, key=int)]
+
+    return {key: _nested_lists(value) for key, value in node.items()}
+
+
+def _is_true(value):
+    return value is True or value == 'true'
+
+
+def _int_param(value, name, minimum=None):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise TransformationException('Invalid request parameter [{}].  Must be an integer.'.format(name))
+
+    if minimum is not None and value < minimum:
+        raise TransformationException('Invalid request parameter [{}].  Must be at least {}.'.format(name, minimum))
+
+    return value
+
+
+def _list_param(value, name):
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        raise TransformationException('Invalid request parameter [{}].  Must be a list of objects.'.format(name))
+
+    return value
+
+
+def _search_value(node, name):
+    if node is None:
+        return None
+
+    value = node.get('value') if isinstance(node, dict) else node
+    if isinstance(value, (dict, list)):
+        raise TransformationException('Invalid request parameter [{}].  Must be a string.'.format(name))
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    return value
+
+
+def _contains_pattern(value):
+    """
+    Returns a LIKE pattern which matches the text of a search value anywhere in a string.  The wildcards of LIKE are
+    escaped with a backslash, which is the default escape character of LIKE in the supported databases.  Backslashes
+    are escaped first, so that no character of the value can end the string literal.  Quotes are doubled unless the
+    installed version of PyPika doubles them when it renders the pattern.
+    """
+    for character in ('\\', '%', '_'):
+        value = value.replace(character, '\\' + character)
+
+    if not _PYPIKA_ESCAPES_QUOTES:
+        value = value.replace("'", "''")
+
+    return "%{}%".format(value)
+
+
 def _format_column_display(csv_df, metrics, dimensions):
     column_display = []
     for idx in list(csv_df.columns):
@@ -92,12 +220,64 @@ def _format_column_display(csv_df, metrics, dimensions):
 
 
 class DataTablesRowIndexTransformer(Transformer):
+    columnar = False
+
+    def __init__(self, columnar=False):
+        """
+        :param columnar:
+            When True, the data is rendered with one list of values and one list of display values per column instead
+            of one object per row.  The lists are keyed by the ``data`` path of each column, so the key names are not
+            repeated in every row:
+
+            .. code-block:: python
+
+                {
+                    'columns': [{'title': 'Date', 'data': 'date', ...}, {'title': 'Clicks', 'data': 'clicks', ...}],
+                    'data': {
+                        'date': {'value': ['2000-01-01', '2000-01-02']},
+                        'clicks': {'value': [10, 1200], 'display': ['10', '1,200']},
+                    },
+                }
+
+            Only the listed columns are included.  DataTables can read this format with an accessor function per
+            column, using the row number as the row data:
+
+            .. code-block:: javascript
+
+                function columnarToDataTables(payload) {
+                    var first = payload.data[payload.columns[0].data],
+                        rows = first.value.map(function (_, i) { return [i]; });
+
+                    var columns = payload.columns.map(function (column) {
+                        var values = payload.data[column.data];
+                        return {
+                            title: column.title,
+                            data: function (row, type) {
+                                var i = row[0];
+                                return type === 'display' && values.display ? values.display[i] : values.value[i];
+                            }
+                        };
+                    });
+
+                    return {data: rows, columns: columns};
+                }
+
+                $('#table').DataTable(columnarToDataTables(payload));
+        """
+        self.columnar = columnar
+
     def transform(self, dataframe, display_schema):
         dataframe = self._prepare_dataframe(dataframe, display_schema['dimensions'])
+        columns = self._render_columns(dataframe, display_schema)
+
+        if self.columnar:
+            data = self._render_columnar_data(dataframe, display_schema, columns)
+        else:
+            data = self._render_data(dataframe, display_schema)
 
         return {
-            'columns': self._render_columns(dataframe, display_schema),
-            'data': self._render_data(dataframe, display_schema),
+            'columns': columns,
+            'data': data,
         }
 
     def _prepare_dataframe(self, dataframe, dimensions):
@@ -189,6 +369,41 @@ class DataTablesRowIndexTransformer(Transformer):
 
         return data
 
+    def _render_columnar_data(self, dataframe, display_schema, columns):
+        dimensions = display_schema['dimensions']
+        dimension_keys = [dimension_key
+                          for dimension_key in dataframe.index.names[:settings.datatables_maxcols]
+                          if dimension_key in dimensions]
+
+        data = OrderedDict()
+        for key in dimension_keys:
+            dimension = dimensions[key]
+            data[key] = {'value': utils.map_level_values(dataframe.index, key, _safe)}
+
+            if 'display_field' in dimension:
+                data[key]['display'] = utils.map_level_values(dataframe.index, dimension['display_field'], _safe)
+
+            elif 'display_options' in dimension:
+                display_options = dimension['display_options']
+                data[key]['display'] = utils.map_level_values(
+                    dataframe.index, key, lambda value: display_options.get(_safe(value), _safe(value)))
+
+        # The values are read from `dataframe.values` to get the same types as the rows of the data frame
+        metric_key_idx = 1 if display_schema.get('references') else 0
+        values = dataframe.values
+        for i, column in enumerate(columns[len(dimension_keys):]):
+            metric_column = dataframe.columns[i]
+            metric_key = metric_column[metric_key_idx] if isinstance(metric_column, tuple) else metric_column
+
+            formatted_values = [_format_value(value, display_schema['metrics'][metric_key])
+                                for value in values[:, i]]
+            data[column['data']] = {
+                'value': [formatted_value['value'] for formatted_value in formatted_values],
+                'display': [formatted_value['display'] for formatted_value in formatted_values],
+            }
+
+        return data
+
     def _render_dimension_data(self, idx, dimensions):
         i = 0
         for key, dimension in dimensions:
@@ -231,6 +446,28 @@ class DataTablesRowIndexTransformer(Transformer):
 
 
 class DataTablesColumnIndexTransformer(DataTablesRowIndexTransformer):
+    def query_operations(self, slicer, metrics, dimensions,
+                         metric_filters, dimension_filters,
+                         references, operations):
+        """
+        Limits each pivoted dimension to its first values in the query.  At most `maxcols` columns are rendered and
+        the pivoted columns are sorted by dimension value, so only the first `maxcols - 1` values of each pivoted
+        dimension can ever be displayed.  Requests with totals, references or metric filters are not limited since
+        these change which dimension values are the first in the result.
+        """
+        maxcols = settings.datatables_maxcols
+        if not maxcols or 2 > len(dimensions) or metric_filters or references \
+                or any(operation.key == Totals.key for operation in operations):
+            return []
+
+        limited_keys = {operation.dimension_key
+                        for operation in operations
+                        if operation.key == TopN.key}
+
+        return [TopN(dimension_key, maxcols - 1, other=False)
+                for dimension_key in dimensions[1:]
+                if dimension_key not in limited_keys]
+
     def _prepare_dataframe(self, dataframe, dimensions):
         # Replaces invalid values and unstacks the data frame for column_index tables.
         dataframe = super(DataTablesColumnIndexTransformer, self)._prepare_dataframe(dataframe, dimensions)
@@ -293,70 +530,124 @@ class DataTablesColumnIndexTransformer(DataTablesRowIndexTransformer):
             'render': {'type': 'value', '_': 'display', 'sort': 'value'}
         }
 
-    def _recurse_dimensions(self, dataframe, dimensions, metrics, reference=None):
-        if dataframe.empty:
-            return []
+    def _render_data(self, dataframe, display_schema):
+        if not isinstance(dataframe.columns, pd.MultiIndex):
+            return super(DataTablesColumnIndexTransformer, self)._render_data(dataframe, display_schema)
 
-        if reference or not dimensions:
-            return super(DataTablesColumnIndexTransformer, self)._recurse_dimensions(dataframe, dimensions, metrics,
-                                                                                     reference)
+        n = len(dataframe.index.levels) if isinstance(dataframe.index, pd.MultiIndex) else 1
+        dimensions = list(display_schema['dimensions'].items())
+        row_dimensions, column_dimensions = dimensions[:n], dimensions[n:]
+        metrics = display_schema['metrics']
+
+        # The values are formatted once per column, rather than once per cell of the nested row data.  The rows of
+        # `dataframe.values` have the same types as the rows that would be returned by `dataframe.iterrows()`.
+        values = dataframe.values
+        column_data = [(path, [_format_value(value, metrics[path[-1]])
+                               for value in values[:, i]])
+                       for i, path in self._column_paths(dataframe.columns, column_dimensions, metrics,
+                                                         display_schema.get('references'))]
 
         data = []
+        for row_number, idx in enumerate(dataframe.index):
+            row = {}
 
-        if 'display_field' in dimensions[0][1]:
-            # Returning indexes per level does not guarantee they are ordered, therefore iteritems() must be used
-            levels = [row[0][1:] for row in dataframe.iteritems()]
-            format_key = lambda level: level[0]
-            slice_metric_data = lambda level: dataframe[:, level[0], level[1]]
-        else:
-            levels = dataframe.index.levels[1]
-            format_key = str
-            slice_metric_data = lambda level: dataframe[:, level]
+            if not isinstance(idx, tuple):
+                idx = (idx,)
 
-        for level in levels:
-            metric_data = dict(self._recurse_dimensions(slice_metric_data(level), dimensions[1:], metrics))
+            for key, value in self._render_dimension_data(idx, row_dimensions):
+                row[key] = value
 
-            if not metric_data:
-                continue
+            for path, formatted_values in column_data:
+                node = row
+                for key in path[:-1]:
+                    node = node.setdefault(key, {})
+                node[path[-1]] = formatted_values[row_number]
 
-            data.append((format_key(level), metric_data))
+            data.append(row)
 
         return data
 
+    @staticmethod
+    def _column_paths(columns, dimensions, metrics, references):
+        """
+        Computes the path of keys in the nested row data for each of the unstacked columns of the data frame.  The path
+        starts with the reference key, unless it is the base reference, followed by a key for each pivoted dimension
+        and lastly the metric key.
+
+        :return:
+            A list of tuples containing the column position and the path of the column, ordered by reference and then
+            by metric.
+        """
+        paths = []
+        for reference in [''] + list(references or ()):
+            for metric_key in metrics:
+                for i, column in enumerate(columns):
+                    if references:
+                        column_reference, column = column[0], column[1:]
+                        if column_reference != reference:
+                            continue
+
+                    if column[0] != metric_key:
+                        continue
+
+                    path = [reference] if reference else []
+                    levels = iter(column[1:])
+                    for key, dimension in dimensions:
+                        level = next(levels)
+
+                        if 'display_field' in dimension:
+                            next(levels)
+                            path.append(level)
+
+                        elif isinstance(level, float) and np.isnan(level):
+                            # Columns for missing dimension values are not included in the data
+                            break
+
+                        else:
+                            path.append(str(level))
+
+                    else:
+                        paths.append((i, path + [metric_key]))
+
+        return paths
+
 
 class CSVRowIndexTransformer(DataTablesRowIndexTransformer):
     def transform(self, dataframe, display_schema):
+        csv_df, csv_options = self._prepare_csv(dataframe, display_schema)
+        return csv_df.to_csv(**csv_options)
+
+    def _prepare_csv(self, dataframe, display_schema):
         csv_df = self._format_columns(dataframe, display_schema['metrics'], display_schema['dimensions'])
 
         if isinstance(dataframe.index, pd.RangeIndex):
             # If there are no dimensions, just serialize to csv without the index
-            return csv_df.to_csv(index=False)
+            return csv_df, {'index': False}
 
         csv_df = self._format_index(csv_df, display_schema['dimensions'])
 
         row_dimension_labels = self._format_row_dimension_labels(display_schema['dimensions'])
-        return csv_df.to_csv(index_label=row_dimension_labels)
+        return csv_df, {'index_label': row_dimension_labels}
 
     def _format_index(self, csv_df, dimensions):
         levels = list(dimensions.items())[:None if isinstance(csv_df.index, pd.MultiIndex) else 1]
 
-        csv_df.index = [self.get_level_values(csv_df, key, dimension)
-                        for key, dimension in levels]
-        csv_df.index.names = [key
-                              for key, dimension in levels]
+        csv_df.index = pd.MultiIndex.from_arrays([self.get_level_values(csv_df, key, dimension)
+                                                  for key, dimension in levels],
+                                                 names=[key
+                                                        for key, dimension in levels])
         return csv_df
 
     def get_level_values(self, csv_df, key, dimension):
         if 'display_options' in dimension:
-            return [_safe(dimension['display_options'].get(value, value))
-                    for value in csv_df.index.get_level_values(key)]
+            display_options = dimension['display_options']
+            return utils.rename_level_categories(csv_df.index, key,
+                                                 lambda value: _safe(display_options.get(value, value)))
 
         if 'display_field' in dimension:
-            return [_safe(data_point)
-                    for data_point in csv_df.index.get_level_values(dimension['display_field'])]
+            return utils.map_level_values(csv_df.index, dimension['display_field'], _safe)
 
-        return [_safe(data_point)
-                for data_point in csv_df.index.get_level_values(key)]
+        return utils.map_level_values(csv_df.index, key, _safe)
 
     @staticmethod
     def _format_dimension_label(idx, dim_ordinal, dimension):
@@ -385,6 +676,14 @@ class CSVRowIndexTransformer(DataTablesRowIndexTransformer):
 
 
 class CSVColumnIndexTransformer(DataTablesColumnIndexTransformer, CSVRowIndexTransformer):
+    def query_operations(self, slicer, metrics, dimensions,
+                         metric_filters, dimension_filters,
+                         references, operations):
+        """
+        CSV exports contain every column, so the pivoted dimensions are not limited to `maxcols`.
+        """
+        return []
+
     def _format_columns(self, dataframe, metrics, dimensions):
         if 1 < len(dimensions):
             csv_df = self._prepare_dataframe(dataframe, dimensions)
@@ -396,3 +695,247 @@ class CSVColumnIndexTransformer(DataTablesColumnIndexTransformer, CSVRowIndexTra
     def _format_row_dimension_labels(self, dimensions):
         return [dimension['label']
                 for dimension in list(dimensions.values())[:1]]
+
+
+class DataTablesRowIndexStreamTransformer(DataTablesRowIndexTransformer):
+    """
+    Streams the same DataTables JSON as ``DataTablesRowIndexTransformer`` as chunks of bytes instead of returning a
+    dict.  The ``columns`` are written first and then the ``data`` is written in blocks of rows, so the first bytes are
+    sent before the whole table has been rendered.  The data is fetched from the database in chunks and each chunk is
+    written as soon as it is fetched, so the memory used does not depend on the size of the result.
+
+    The bytes are equal to ``json.dumps`` of the result of ``DataTablesRowIndexTransformer``.
+    """
+
+    def __init__(self, chunksize=None, compress=False, encoding='utf-8'):
+        """
+        :param chunksize:
+            The maximum number of rows fetched from the database and written at a time.  Defaults to
+            ``settings.datatables_chunksize``.
+
+        :param compress:
+            When True, the output is compressed with gzip as it is streamed.
+
+        :param encoding:
+            The encoding of the output bytes.
+        """
+        self.chunksize = chunksize or settings.datatables_chunksize
+        self.compress = compress
+        self.encoding = encoding
+
+    @property
+    def fetch_chunksize(self):
+        return self.chunksize
+
+    def transform(self, dataframe, display_schema):
+        """
+        :param dataframe:
+            A data frame or an iterable of data frames containing the data.
+
+        :return:
+            A generator of bytes.
+        """
+        if isinstance(dataframe, pd.DataFrame):
+            dataframe = [dataframe]
+
+        return _encode_chunks(self._chunks(dataframe, display_schema), self.encoding, self.compress)
+
+    def write(self, dataframe, display_schema, sink):
+        """
+        Writes the output to a file-like object opened in binary mode.
+
+        :param dataframe:
+            A data frame or an iterable of data frames containing the data.
+
+        :param sink:
+            The file-like object to write to.
+        """
+        for chunk in self.transform(dataframe, display_schema):
+            sink.write(chunk)
+
+    def _chunks(self, dataframes, display_schema):
+        prepared_dataframes = (self._prepare_dataframe(dataframe, display_schema['dimensions'])
+                               for dataframe in dataframes)
+
+        separator = None
+        for block in _row_blocks(prepared_dataframes, self.chunksize):
+            if separator is None:
+                columns = self._render_columns(block, display_schema)
+                yield '{"columns": %s, "data": [' % json.dumps(columns, default=_json_default)
+                separator = ''
+
+            rows = self._render_data(block, display_schema)
+            if rows:
+                yield separator + ', '.join(json.dumps(row, default=_json_default)
+                                            for row in rows)
+                separator = ', '
+
+        if separator is None:
+            # Without any data frame, the columns are unknown
+            yield '{"columns": [], "data": ['
+
+        yield ']}'
+
+
+class DataTablesColumnIndexStreamTransformer(DataTablesColumnIndexTransformer, DataTablesRowIndexStreamTransformer):
+    """
+    Streams the same DataTables JSON as ``DataTablesColumnIndexTransformer`` as chunks of bytes.  Since every column of
+    the pivoted table must be known before the first row is written, the data is fetched all at once, but the rows are
+    still rendered and written in blocks.
+    """
+    fetch_chunksize = None
+
+
+class CSVRowIndexStreamTransformer(DataTablesRowIndexStreamTransformer, CSVRowIndexTransformer):
+    """
+    Streams the same CSV as ``CSVRowIndexTransformer`` as chunks of bytes instead of returning a single string.  The
+    data is fetched from the database in chunks and each chunk is written as soon as it is fetched, so the memory used
+    does not depend on the size of the result.
+
+    The chunks can be returned directly as a streaming HTTP response or written to a file-like object with ``write``.
+    """
+
+    def _chunks(self, dataframes, display_schema):
+        header = True
+        for dataframe in dataframes:
+            csv_df, csv_options = self._prepare_csv(dataframe, display_schema)
+
+            # Data frames are split into blocks of rows so that the CSV strings are bounded in size
+            for start in range(0, max(len(csv_df), 1), self.chunksize):
+                yield csv_df.iloc[start:start + self.chunksize].to_csv(header=header, **csv_options)
+                header = False
+
+
+class CSVColumnIndexStreamTransformer(CSVColumnIndexTransformer, CSVRowIndexStreamTransformer):
+    """
+    Streams the same CSV as ``CSVColumnIndexTransformer`` as chunks of bytes.  Since every column of the pivoted table
+    must be known before the first row is written, the data is fetched all at once, but the CSV is still written in
+    blocks of rows.
+    """
+    fetch_chunksize = None
+
+
+class DataTablesServerSideTransformer(DataTablesRowIndexTransformer):
+    """
+    Renders the pages of a row index table for DataTables server-side processing.  Instead of loading the whole table,
+    the table requests each page that it displays with the parameters ``draw``, ``start``, ``length``, ``order``,
+    ``search`` and ``columns``.  The page, the order and the search are applied in the query, so only the rows of the
+    page are fetched.
+
+    The parameters can be passed either as DataTables sends them in a query string or a form (``order[0][column]``,
+    ...) or as nested dicts and lists.  The search value of the table is matched against the first searchable
+    categorical or unique dimension column and the search values of columns are matched against their dimensions.
+    Searches of other columns are ignored.
+
+    The result contains ``draw``, ``recordsTotal`` and ``recordsFiltered`` in addition to the ``columns`` and ``data``
+    of ``DataTablesRowIndexTransformer``.
+    """
+    server_side = True
+
+    def parse_request(self, slicer, params, metrics, dimensions, references):
+        """
+        Translates the parameters of a server-side processing request into the pagination and the filters of a query.
+
+        :return:
+            A tuple of the draw counter, a ``Paginator`` and a list of ``WildcardFilter`` for the search.
+        """
+        if any('[' in key for key in params):
+            params = _nested_params(params)
+
+        columns = _list_param(params.get('columns') or [{'data': key} for key in dimensions], 'columns')
+
+        order = []
+        for item in _list_param(params.get('order') or [], 'order'):
+            index = _int_param(item.get('column'), 'order[column]', minimum=0)
+            if index >= len(columns):
+                raise TransformationException('Invalid request parameter [order[column]].  No such column.')
+
+            key = self._query_key(slicer, columns[index].get('data'), metrics, dimensions, references)
+            order.append((key, Order.desc if item.get('dir') == 'desc' else Order.asc))
+
+        # The dimensions are added to the order so that the rows of each page are always the same
+        ordered_keys = {key for key, _ in order}
+        order += [(key, Order.asc) for key in dimensions if key not in ordered_keys]
+
+        # A length of -1 requests every row, which is not supported since the pages are bounded
+        max_length = settings.datatables_max_page_length
+        length = _int_param(params.get('length', max_length), 'length', minimum=1)
+        pagination = Paginator(offset=_int_param(params.get('start', 0), 'start', minimum=0),
+                               limit=min(length, max_length),
+                               order=order)
+
+        draw = _int_param(params.get('draw', 0), 'draw', minimum=0)
+        return draw, pagination, self._search_filters(slicer, params, columns, dimensions)
+
+    def transform_page(self, dataframe, display_schema, draw, records_total, records_filtered):
+        """
+        :param draw:
+            The draw counter of the request, which the table uses to order its responses.
+
+        :param records_total:
+            The number of rows in the table before the search is applied.
+
+        :param records_filtered:
+            The number of rows in the table after the search is applied.
+
+        :return:
+            The response for the table.
+        """
+        page = {
+            'draw': draw,
+            'recordsTotal': records_total,
+            'recordsFiltered': records_filtered,
+        }
+        page.update(self.transform(dataframe, display_schema))
+        return page
+
+    @staticmethod
+    def _query_key(slicer, path, metrics, dimensions, references):
+        """
+        Returns the key of the column in the query for the data path of a column in the table.
+        """
+        if path in dimensions:
+            if getattr(slicer.dimensions[path], 'display_field', None) is not None:
+                return '%s_display' % path
+            return path
+
+        reference_key, _, metric_key = str(path).rpartition('.')
+        if metric_key in utils.flatten(metrics) \
+                and (not reference_key or reference_key in {reference.key for reference in references}):
+            return '%s_%s' % (metric_key, reference_key) if reference_key else metric_key
+
+        raise TransformationException('Unable to order the table by the column [{}].  '
+                                      'No such metric or dimension in the request.'.format(path))
+
+    @staticmethod
+    def _search_filter(slicer, key, value):
+        from fireant.slicer.schemas import (CategoricalDimension,
+                                            UniqueDimension)
+
+        dimension = slicer.dimensions[key]
+        if not isinstance(dimension, (CategoricalDimension, UniqueDimension)):
+            return None
+
+        element_key = (key, 'display') if getattr(dimension, 'display_field', None) is not None else key
+        return WildcardFilter(element_key, _contains_pattern(value))
+
+    def _search_filters(self, slicer, params, columns, dimensions):
+        searchable_keys = [column.get('data') for column in columns
+                           if column.get('data') in dimensions and _is_true(column.get('searchable', True))]
+
+        filters = []
+        search_value = _search_value(params.get('search'), 'search[value]')
+        if search_value:
+            filters += [search_filter
+                        for search_filter in (self._search_filter(slicer, key, search_value)
+                                              for key in searchable_keys)
+                        if search_filter is not None][:1]
+
+        for column in columns:
+            value = _search_value(column.get('search'), 'columns[search][value]')
+            if value and column.get('data') in searchable_keys:
+                search_filter = self._search_filter(slicer, column['data'], value)
+                if search_filter is not None:
+                    filters.append(search_filter)
+
+        return filters
@@ -8,7 +8,10 @@ from fireant import (
     settings,
     utils,
 )
-from fireant.slicer.operations import Totals
+from fireant.slicer.operations import (
+    TopN,
+    Totals,
+)
 from .base import (
     TransformationException,
     Transformer,
@@ -36,14 +39,100 @@ COLORS = {
 def _format_data_point(value):
     if isinstance(value, pd.Timestamp):
         return int(value.asm8) // int(1e6)
+    if isinstance(value, (np.integer, np.floating)):
+        # Cannot serialize numpy numbers to json
+        value = value.item()
     if value is None or (isinstance(value, (float, int)) and np.isnan(value)):
         return None
-    if isinstance(value, np.int64):
-        # Cannot serialize np.int64 to json
-        return int(value)
     return value
 
 
+def _format_data_points(values):
+    """
+    Vectorized equivalent of `_format_data_point` for an entire index or column.  Datetimes are converted to epoch
+    milliseconds with a single int64 view and NaNs are replaced with None using a mask.
+
+    :param values: An index, series or array of values.
+    :return: A list of JSON serializable values.
+    """
+    values = np.asarray(values)
+
+    if np.issubdtype(values.dtype, np.datetime64):
+        return (values.astype('datetime64[ns]').view(np.int64) // int(1e6)).tolist()
+
+    if values.dtype.kind == 'f':
+        nulls = np.isnan(values)
+        if nulls.any():
+            values = values.astype(object)
+            values[nulls] = None
+        return values.tolist()
+
+    if values.dtype.kind in 'biu':
+        return values.tolist()
+
+    return [_format_data_point(value) for value in values]
+
+
+def _replace_infinity(dataframe):
+    """
+    Replaces infinite values with NaN.  Only float columns can contain infinite values, so the data frame is only
+    copied when there are some and the other columns are kept with their own types.
+
+    :param dataframe: A data frame of metric values.
+    :return: A data frame without infinite values.
+    """
+    infinite_columns = [column
+                        for column, dtype in dataframe.dtypes.items()
+                        if dtype.kind == 'f' and np.isinf(dataframe[column].values).any()]
+    if not infinite_columns:
+        return dataframe
+
+    dataframe = dataframe.copy(deep=False)
+    for column in infinite_columns:
+        dataframe[column] = dataframe[column].replace([np.inf, -np.inf], np.nan)
+
+    return dataframe
+
+
+def _lttb_indices(x, y, threshold):
+    """
+    Selects the points to keep when downsampling a series with the Largest-Triangle-Three-Buckets algorithm.  The first
+    and last points are always kept and from each bucket in between, the point forming the largest triangle with the
+    previously selected point and the average of the next bucket is chosen, which preserves the visual shape of the
+    series.
+
+    :param x: A float array of x values.
+    :param y: A float array of y values, without NaNs.
+    :param threshold: The maximum number of points to keep.
+    :return: A sorted int array of the positions of the points to keep.
+    """
+    n_points = len(x)
+    if threshold >= n_points or threshold < 3:
+        return np.arange(n_points)
+
+    # The points between the first and last are split into threshold - 2 buckets
+    edges = np.linspace(1, n_points - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n_points - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        areas = np.abs((x[selected] - avg_x) * (y[start:end] - y[selected])
+                       - (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+
+    return indices
+
+
 def _color(i):
     colors = COLORS.get(settings.highcharts_colors, 'grid')
     n_colors = len(colors)
@@ -63,6 +152,22 @@ class HighchartsLineTransformer(Transformer):
 
     chart_type = 'line'
 
+    def __init__(self, compact=None, max_points=None):
+        """
+        :param compact:
+            When True, the x values are sent once for the whole chart, either as ``pointStart``/``pointInterval`` for
+            regularly spaced x values or as a shared categories array, and each series only contains its y values.
+            Charts with irregular x values fall back to ``[x, y]`` pairs.  Defaults to ``settings.highcharts_compact``.
+
+        :param max_points:
+            The maximum number of points per series.  Longer series are downsampled with the
+            Largest-Triangle-Three-Buckets algorithm before formatting, which keeps the shape of line and area charts.
+            Downsampled charts are never compact since each series keeps different x values.  Defaults to
+            ``settings.highcharts_max_points``.
+        """
+        self.compact = settings.highcharts_compact if compact is None else compact
+        self.max_points = settings.highcharts_max_points if max_points is None else max_points
+
     def prevalidate_request(self, slicer, metrics, dimensions,
                             metric_filters, dimension_filters,
                             references, operations):
@@ -82,17 +187,22 @@ class HighchartsLineTransformer(Transformer):
                        for ordinal, name in enumerate(dataframe.index.names)}
         dataframe = self._prepare_dataframe(dataframe, dim_ordinal, display_schema['dimensions'])
 
+        # The x values are the same for every series, so whether they can be shared is only determined once
+        x_options = self._compact_x_options(dataframe.index)
+        compact = x_options is not None
+
         if has_references:
             series = sum(
-                [self._make_series(dataframe[level], dim_ordinal, display_schema, reference=level or None)
+                [self._make_series(dataframe[level], dim_ordinal, display_schema, reference=level or None,
+                                   compact=compact)
                  for level in dataframe.columns.levels[0]],
                 []
             )
 
         else:
-            series = self._make_series(dataframe, dim_ordinal, display_schema)
+            series = self._make_series(dataframe, dim_ordinal, display_schema, compact=compact)
 
-        return {
+        result = {
             'chart': {'type': self.chart_type, 'zoomType': 'x'},
             'title': {'text': None},
             'plotOptions': {},
@@ -103,6 +213,70 @@ class HighchartsLineTransformer(Transformer):
             'series': series
         }
 
+        if compact:
+            self._apply_compact_x_options(result, x_options)
+
+        return result
+
+    def _compact_x_options(self, index):
+        """
+        Determines how the x values of a chart can be shared across all of its series in compact mode.
+
+        :param index: The index of the prepared data frame containing the x values.
+        :return:
+            A dict with either the ``pointStart``/``pointInterval`` plot options or the shared ``categories``.  None is
+            returned if compact mode is disabled or the x values cannot be shared, in which case ``[x, y]`` pairs are
+            used.
+        """
+        if not self.compact or isinstance(index, pd.MultiIndex) or index.hasnans or index.empty:
+            return None
+
+        if self.max_points and len(index) > self.max_points:
+            return None
+
+        if isinstance(index, pd.DatetimeIndex):
+            if index.tz is not None:
+                return None
+
+            point_start = _format_data_points(index[:1])[0]
+            if 1 == len(index):
+                return {'pointStart': point_start}
+
+            steps = np.diff(index.asi8)
+            if steps[0] > 0 and (steps == steps[0]).all():
+                return {'pointStart': point_start, 'pointInterval': int(steps[0]) // int(1e6)}
+
+            # Months, quarters and years do not have a fixed length, so they are given with an interval unit
+            if (index == index.normalize()).all() and (index.day == 1).all():
+                months = index.year * 12 + index.month
+                month_steps = np.diff(months)
+                if month_steps[0] > 0 and (month_steps == month_steps[0]).all():
+                    return {'pointStart': point_start, 'pointInterval': int(month_steps[0]),
+                            'pointIntervalUnit': 'month'}
+
+            return None
+
+        if index.dtype.kind in 'iuf':
+            point_start = _format_data_points(index[:1])[0]
+            if 1 == len(index):
+                return {'pointStart': point_start}
+
+            steps = np.diff(index.values)
+            if steps[0] > 0 and (steps == steps[0]).all():
+                return {'pointStart': point_start, 'pointInterval': _format_data_point(steps[0])}
+
+            return None
+
+        return {'categories': _format_data_points(index)}
+
+    @staticmethod
+    def _apply_compact_x_options(result, x_options):
+        if 'categories' in x_options:
+            result['xAxis'].setdefault('categories', x_options['categories'])
+            return
+
+        result['plotOptions'].setdefault('series', {}).update(x_options)
+
     def xaxis_options(self, dataframe, dim_ordinal, display_schema):
         return {
             'type': 'datetime' if isinstance(dataframe.index, pd.DatetimeIndex) else 'linear'
@@ -144,20 +318,22 @@ class HighchartsLineTransformer(Transformer):
 
         return axis
 
-    def _make_series(self, dataframe, dim_ordinal, display_schema, reference=None):
+    def _make_series(self, dataframe, dim_ordinal, display_schema, reference=None, compact=False):
         metrics = list(dataframe.columns.levels[0]
                        if isinstance(dataframe.columns, pd.MultiIndex)
                        else dataframe.columns)
 
-        return [self._make_series_item(idx, item, dim_ordinal, display_schema, metrics, reference, _color(i))
+        return [self._make_series_item(idx, item, dim_ordinal, display_schema, metrics, reference, _color(i),
+                                       compact=compact)
                 for i, (idx, item) in enumerate(dataframe.iteritems())]
 
-    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000'):
+    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000',
+                          compact=False):
         metric_key = utils.slice_first(idx)
 
         return {
             'name': self._format_label(idx, dim_ordinal, display_schema, reference),
-            'data': self._format_data(item),
+            'data': self._format_data(item, compact),
             'tooltip': self._format_tooltip(display_schema['metrics'][metric_key]),
             'yAxis': display_schema['metrics'][metric_key].get('axis', 0)
             if not reference else self._reference_axes_id(reference),
@@ -191,9 +367,7 @@ class HighchartsLineTransformer(Transformer):
 
     def _prepare_dataframe(self, dataframe, dim_ordinal, dimensions):
         # Replaces invalid values and unstacks the data frame for line charts.
-
-        # Force all fields to be float (Safer for highcharts)
-        dataframe = dataframe.astype(np.float).replace([np.inf, -np.inf], np.nan)
+        dataframe = _replace_infinity(dataframe)
 
         # Unstack multi-indices
         if 1 < len(dimensions):
@@ -253,10 +427,31 @@ class HighchartsLineTransformer(Transformer):
 
         return dimension_value
 
-    def _format_data(self, column):
+    def _format_data(self, column, compact=False):
+        """
+        :param column: The series of the y values indexed by the x values.
+        :param compact: True if the x values are shared by all series, as determined by ``_compact_x_options``.
+        """
         if isinstance(column, float):
             return [_format_data_point(column)]
 
+        if compact:
+            # The x values are shared by all series, so only the y values are needed.  NaNs are kept as null gaps to
+            # keep the values aligned with the x values.
+            return _format_data_points(column.values)
+
+        if not isinstance(column.index, pd.MultiIndex) and column.dtype.kind in 'biuf':
+            # Numeric columns are formatted in bulk, dropping NaN values and null index keys with a single mask
+            mask = pd.notnull(column.index) & pd.notnull(column.values)
+            x, y = column.index[mask], column.values[mask]
+
+            if self.max_points and len(y) > self.max_points and x.dtype.kind in 'iufM':
+                x_values = x.asi8 if isinstance(x, pd.DatetimeIndex) else x.values
+                keep = _lttb_indices(x_values.astype(np.float64), y.astype(np.float64), self.max_points)
+                x, y = x[keep], y[keep]
+
+            return list(zip(_format_data_points(x), _format_data_points(y)))
+
         return [self._format_point(key, value)
                 for key, value in column.iteritems()
                 if not (isinstance(value, (float, int)) and np.isnan(value)) and not pd.isnull(key)]
@@ -280,7 +475,8 @@ class HighchartsAreaTransformer(HighchartsLineTransformer):
     """
     chart_type = 'area'
 
-    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000'):
+    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000',
+                          compact=False):
         """
         Overriding the parent class' _make_series_item to remove the yAxis key as area charts
         only really make sense on a single y axis
@@ -288,7 +484,7 @@ class HighchartsAreaTransformer(HighchartsLineTransformer):
         metric_key = utils.slice_first(idx)
         return {
             'name': self._format_label(idx, dim_ordinal, display_schema, reference),
-            'data': self._format_data(item),
+            'data': self._format_data(item, compact),
             'tooltip': self._format_tooltip(display_schema['metrics'][metric_key]),
             'color': color,
             'dashStyle': 'Dot' if reference else 'Solid'
@@ -307,11 +503,11 @@ class HighchartsAreaPercentageTransformer(HighchartsAreaTransformer):
 
     def transform(self, dataframe, display_schema):
         config = super(HighchartsAreaPercentageTransformer, self).transform(dataframe, display_schema)
-        config['plotOptions'] = {
+        config['plotOptions'].update({
             'area': {
                 'stacking': 'percent',
             }
-        }
+        })
         return config
 
     def _format_tooltip(self, metric_schema):
@@ -344,11 +540,12 @@ class HighchartsColumnTransformer(HighchartsLineTransformer):
                                           'Request included %d metrics and %d dimensions.' % (len(metrics),
                                                                                               len(dimensions)))
 
-    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000'):
+    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000',
+                          compact=False):
         metric_key = utils.slice_first(idx)
         return {
             'name': self._format_label(idx, dim_ordinal, display_schema, reference),
-            'data': self._format_data(item),
+            'data': self._format_data(item, compact),
             'tooltip': self._format_tooltip(display_schema['metrics'][metric_key]),
             'yAxis': display_schema['metrics'][metric_key].get('axis', 0)
             if not reference else self._reference_axes_id(reference),
@@ -375,9 +572,7 @@ class HighchartsColumnTransformer(HighchartsLineTransformer):
 
     def _prepare_dataframe(self, dataframe, dim_ordinal, dimensions):
         # Replaces invalid values and unstacks the data frame for line charts.
-
-        # Force all fields to be float (Safer for highcharts)
-        dataframe = dataframe.replace([np.inf, -np.inf], np.nan)
+        dataframe = _replace_infinity(dataframe)
 
         # Unstack multi-indices
         if 1 < len(dimensions):
@@ -398,7 +593,10 @@ class HighchartsColumnTransformer(HighchartsLineTransformer):
             return dataframe.index.get_level_values(display_field).tolist()
 
         display_options = category_dimension.get('category_dimension', {})
-        return [display_options.get(value, value) for value in dataframe.index]
+        if isinstance(dataframe.index, pd.MultiIndex):
+            return [display_options.get(value, value) for value in dataframe.index]
+
+        return utils.map_level_values(dataframe.index, None, lambda value: display_options.get(value, value))
 
 
 class HighchartsStackedColumnTransformer(HighchartsColumnTransformer):
@@ -407,11 +605,12 @@ class HighchartsStackedColumnTransformer(HighchartsColumnTransformer):
     http://www.highcharts.com/demo/column-stacked
     """
 
-    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000'):
+    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000',
+                          compact=False):
         metric_key = utils.slice_first(idx)
         return {
             'name': self._format_label(idx, dim_ordinal, display_schema, reference),
-            'data': self._format_data(item),
+            'data': self._format_data(item, compact),
             'tooltip': self._format_tooltip(display_schema['metrics'][metric_key]),
             'color': color
         }
@@ -445,11 +644,12 @@ class HighchartsStackedBarTransformer(HighchartsBarTransformer):
     http://www.highcharts.com/demo/bar-stacked
     """
 
-    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000'):
+    def _make_series_item(self, idx, item, dim_ordinal, display_schema, metrics, reference, color='#000',
+                          compact=False):
         metric_key = utils.slice_first(idx)
         return {
             'name': self._format_label(idx, dim_ordinal, display_schema, reference),
-            'data': self._format_data(item),
+            'data': self._format_data(item, compact),
             'tooltip': self._format_tooltip(display_schema['metrics'][metric_key]),
             'color': color
         }
@@ -457,10 +657,8 @@ class HighchartsStackedBarTransformer(HighchartsBarTransformer):
     def transform(self, dataframe, display_schema):
         result = super(HighchartsStackedBarTransformer, self).transform(dataframe, display_schema)
         result['plotOptions'] = result.get('plotOptions', {})
-        result['plotOptions'].update({
-            'series': {
-                'stacking': 'normal'
-            }
+        result['plotOptions'].setdefault('series', {}).update({
+            'stacking': 'normal'
         })
 
         return result
@@ -483,6 +681,8 @@ class HighchartsPieTransformer(HighchartsLineTransformer):
         Ensure no references or operations are passed and that there is no more than one enabled metric
         """
 
+        # Top N operations only limit the number of pie pieces so they can be used with pie charts
+        operations = [operation for operation in operations if operation.key != TopN.key]
         if len(references) > 0 or len(operations) > 0:
             raise TransformationException('References and Operations cannot be used with '
                                           '{} charts'.format(self.chart_type))
@@ -510,7 +710,8 @@ class HighchartsPieTransformer(HighchartsLineTransformer):
         if num_data_points > max_data_points:
             raise TransformationException('You have reached the maximum number of data points that can be shown '
                                           'on a pie chart. Maximum number of data points: {}. '
-                                          'Current number of data points: {}.'.format(max_data_points, num_data_points))
+                                          'Current number of data points: {}.  Use a TopN operation to limit the '
+                                          'number of data points.'.format(max_data_points, num_data_points))
 
         metric_key = self._get_metric_key(dataframe)
         tooltip = self._format_tooltip(display_schema['metrics'][metric_key])
@@ -539,14 +740,14 @@ class HighchartsPieTransformer(HighchartsLineTransformer):
 
     def _prepare_dataframe(self, dataframe, dim_ordinal, dimensions):
         """
-        Force all fields to be float (Safer for highcharts)
+        Replaces infinite values with NaN.  The metrics keep the types they were loaded with.
 
         :param dataframe: Dataframe containing queried data
         :param dim_ordinal: Dictionary containing dimensions with their associated order
         :param dimensions: OrderedDict of dimensions along with their display options/display field
-        :return: Dataframe with float values and without np.inf values
+        :return: Dataframe without np.inf values
         """
-        return dataframe.astype(np.float).replace([np.inf, -np.inf], np.nan)
+        return _replace_infinity(dataframe)
 
     @staticmethod
     def _get_metric_key(dataframe):
@@ -571,10 +772,13 @@ class HighchartsPieTransformer(HighchartsLineTransformer):
         :return: Dictonary containing the series name and data list
         """
         metric_key = self._get_metric_key(dataframe)
+        column = dataframe[metric_key]
+        labels = [self._format_label(idx, dim_ordinal, display_schema, reference)
+                  for idx in column.index]
+
         return {
             'name': display_schema['metrics'][metric_key].get('label', metric_key),
-            'data': [(self._format_label(idx, dim_ordinal, display_schema, reference), _format_data_point(item))
-                     for idx, item in dataframe[metric_key].iteritems()]
+            'data': list(zip(labels, _format_data_points(column.values)))
         }
 
     def _format_label(self, idx, dim_ordinal, display_schema, reference):
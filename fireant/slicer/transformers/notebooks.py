@@ -14,52 +14,66 @@ def _format_dimension_labels(dimension):
 
 class PandasRowIndexTransformer(Transformer):
     def transform(self, dataframe, display_schema):
-        dataframe = self._set_display_options(dataframe, display_schema)
+        # The data frame is copied without its data, so that only the labels of the index and columns are replaced.
+        dataframe = dataframe.copy(deep=False)
+
+        self._set_display_options(dataframe, display_schema)
         if display_schema['dimensions']:
-            dataframe = self._set_dimension_labels(dataframe, display_schema['dimensions'])
-        dataframe = self._set_metric_labels(dataframe, display_schema['metrics'], display_schema.get('references'))
+            self._set_dimension_labels(dataframe, display_schema['dimensions'])
+        self._set_metric_labels(dataframe, display_schema['metrics'], display_schema.get('references'))
 
         if isinstance(dataframe.index, pd.MultiIndex):
             drop_levels = ['%s ID' % dimension['label']
                            for key, dimension in display_schema['dimensions'].items()
                            if dimension.get('display_field')]
-            dataframe.reset_index(level=drop_levels, drop=True, inplace=True)
+            if drop_levels:
+                dataframe.index = dataframe.index.droplevel(drop_levels)
 
         return dataframe
 
     def _set_display_options(self, dataframe, display_schema):
         """
         Replaces the dimension options with those that the user has specified manually e.g. change 'm' to 'mobile'
-        """
-        dataframe = dataframe.copy()
 
+        For a multi-index, only the levels containing the unique values are replaced, so the codes of the index are
+        shared with the original data frame.
+        """
         for key, dimension in display_schema['dimensions'].items():
-            if 'display_options' in dimension:
-                display_values = [dimension['display_options'].get(value, value)
-                                  for value in dataframe.index.get_level_values(key).unique()]
+            if 'display_options' not in dimension or key not in dataframe.index.names:
+                continue
+
+            display_options = dimension['display_options']
+
+            if isinstance(dataframe.index, pd.MultiIndex):
+                level = dataframe.index.names.index(key)
+                display_values = [display_options.get(value, value)
+                                  for value in dataframe.index.levels[level]]
 
                 if not display_values:
                     continue
 
-                if isinstance(dataframe.index, pd.MultiIndex):
-                    dataframe.index.set_levels(display_values, key, inplace=True)
+                if len(set(display_values)) == len(display_values):
+                    dataframe.index = dataframe.index.set_levels(display_values, level=level)
 
                 else:
-                    dataframe.index = pd.Index(display_values)
-
-        return dataframe
+                    # Several options have the same label, so the values of the level are replaced instead
+                    dataframe.index = pd.MultiIndex.from_arrays(
+                        [dataframe.index.get_level_values(i).map(lambda value: display_options.get(value, value))
+                         if i == level else dataframe.index.get_level_values(i)
+                         for i in range(dataframe.index.nlevels)],
+                        names=dataframe.index.names
+                    )
+
+            else:
+                # A single index contains each value only once
+                dataframe.index = dataframe.index.map(lambda value: display_options.get(value, value))
 
     def _set_dimension_labels(self, dataframe, dimensions):
-        dataframe = dataframe.copy()
-        dataframe.index.names = [label
-                                 for key, dimension in dimensions.items()
-                                 for label in _format_dimension_labels(dimension)]
-
-        return dataframe
+        dataframe.index = dataframe.index.set_names([label
+                                                     for key, dimension in dimensions.items()
+                                                     for label in _format_dimension_labels(dimension)])
 
     def _set_metric_labels(self, dataframe, metrics, references):
-        dataframe = dataframe.copy()
-
         labels = [metric['label'] for metric in metrics.values()]
         if isinstance(dataframe.columns, pd.MultiIndex):
             dataframe.columns = dataframe.columns.reorder_levels((1, 0)) \
@@ -70,8 +84,6 @@ class PandasRowIndexTransformer(Transformer):
         else:
             dataframe.columns = labels
 
-        return dataframe
-
 
 class PandasColumnIndexTransformer(PandasRowIndexTransformer):
     def transform(self, dataframe, display_schema):
@@ -1,15 +1,30 @@
 # coding: utf-8
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from datetime import date
+from threading import Event
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 from mock import Mock, patch, call
 
 from fireant.dashboards import *
+from fireant.dashboards.managers import _select_columns
 from fireant.slicer import *
 from fireant.slicer.managers import SlicerManager
+from fireant.slicer.operations import (
+    TopN,
+    Totals,
+)
 from fireant.slicer.references import WoW
-from fireant.slicer.transformers import TransformationException
+from fireant.slicer.transformers import (
+    CSVRowIndexTransformer,
+    HighchartsLineTransformer,
+    TransformationException,
+)
 from fireant.tests.database.mock_database import TestDatabase
 from pypika import (
     Table,
@@ -655,6 +670,64 @@ class DashboardAPITests(DashboardTests):
         self.assert_result_transformed(test_render.widgets, dimensions, mock_transformer, result)
 
 
+class QueryOperationTests(DashboardTests):
+    def test_column_index_table_limits_pivoted_dimensions(self):
+        test_wg = WidgetGroup(
+            slicer=self.test_slicer,
+
+            widgets=[
+                ColumnIndexTableWidget(metrics=['clicks']),
+                ColumnIndexTableWidget(metrics=['conversions']),
+            ]
+        )
+
+        operations = test_wg.manager._query_operations(['date', 'locale'], [], [], [], [])
+
+        self.assertListEqual([TopN('locale', 23, other=False)], operations)
+
+    def test_column_index_csv_does_not_limit_pivoted_dimensions(self):
+        test_wg = WidgetGroup(
+            slicer=self.test_slicer,
+
+            widgets=[
+                ColumnIndexTableWidget(metrics=['clicks']),
+                ColumnIndexCSVWidget(metrics=['conversions']),
+            ]
+        )
+
+        operations = test_wg.manager._query_operations(['date', 'locale'], [], [], [], [])
+
+        self.assertListEqual([], operations)
+
+    def test_query_string_is_the_query_of_render(self):
+        test_wg = WidgetGroup(
+            slicer=self.test_slicer,
+
+            widgets=[ColumnIndexTableWidget(metrics=['clicks'])],
+            dimensions=['date', 'locale'],
+        )
+
+        schema = test_wg.manager.request_schema()
+        query_string = test_wg.manager.query_string()
+
+        self.assertEqual(self.test_slicer.manager.query_string(**schema), query_string)
+        self.assertIn('"top_locale"', query_string)
+
+    def test_query_operations_not_shared_by_all_widgets_are_ignored(self):
+        test_wg = WidgetGroup(
+            slicer=self.test_slicer,
+
+            widgets=[
+                ColumnIndexTableWidget(metrics=['clicks']),
+                LineChartWidget(metrics=['conversions']),
+            ]
+        )
+
+        operations = test_wg.manager._query_operations(['date', 'locale'], [], [], [], [])
+
+        self.assertListEqual([], operations)
+
+
 class PrevalidationTests(DashboardTests):
     @classmethod
     def setUpClass(cls):
@@ -684,3 +757,374 @@ class PrevalidationTests(DashboardTests):
             self.test_wg.manager.render(dimensions=['locale'])
         with self.assertRaises(TransformationException):
             self.test_wg.manager.render(dimensions=['account'])
+
+
+class ParallelRenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        test_table = Table('test_table')
+        cls.test_slicer = Slicer(
+            table=test_table,
+            database=TestDatabase(),
+
+            metrics=[
+                Metric('clicks', 'Clicks'),
+                Metric('conversions', 'Conversions'),
+            ],
+
+            dimensions=[
+                DatetimeDimension('date', definition=test_table.dt),
+            ]
+        )
+
+        cls.dataframe = pd.DataFrame({
+            'date': pd.date_range(date(2000, 1, 1), periods=5),
+            'clicks': range(5),
+            'conversions': range(5, 10),
+        }).set_index('date')
+
+    def widget_group(self, executor=None):
+        return WidgetGroup(
+            slicer=self.test_slicer,
+
+            widgets=[
+                LineChartWidget(metrics=['clicks']),
+                RowIndexTableWidget(metrics=['conversions']),
+                RowIndexCSVWidget(metrics=['clicks', 'conversions']),
+            ],
+
+            dimensions=['date'],
+            executor=executor,
+        )
+
+    def render(self, executor=None):
+        with patch.object(SlicerManager, 'data', return_value=self.dataframe):
+            return self.widget_group(executor).manager.render()
+
+    def test_thread_pool(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            result = self.render(executor)
+
+        self.assertListEqual(self.render(), result)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = self.render(executor)
+
+        self.assertListEqual(self.render(), result)
+
+    def test_results_are_in_widget_order(self):
+        executor = Mock()
+        executor.map.side_effect = map
+
+        result = self.render(executor)
+
+        self.assertEqual(1, executor.map.call_count)
+        self.assertEqual(3, len(result))
+        self.assertEqual('line', result[0]['chart']['type'])
+        self.assertIn('data', result[1])
+        self.assertIsInstance(result[2], str)
+
+    def test_only_widget_columns_are_sent_to_the_executor(self):
+        executor = Mock()
+        executor.map.side_effect = map
+
+        self.render(executor)
+
+        _, transformers, dataframes, display_schemas = executor.map.call_args[0]
+        self.assertListEqual([['clicks'], ['conversions'], ['clicks', 'conversions']],
+                             [list(dataframe.columns) for dataframe in dataframes])
+
+    def test_widget_columns_share_the_values_of_the_data(self):
+        executor = Mock()
+        executor.map.side_effect = map
+
+        self.render(executor)
+
+        _, transformers, dataframes, display_schemas = executor.map.call_args[0]
+        for dataframe in dataframes:
+            for column in dataframe.columns:
+                self.assertTrue(np.shares_memory(self.dataframe[column].values, dataframe[column].values))
+
+    def test_widget_columns_with_references_share_the_values_of_the_data(self):
+        columns = pd.MultiIndex.from_product([['', 'wow'], ['clicks', 'conversions']])
+        dataframe = pd.DataFrame([[1, 2, 3, 4]], columns=columns,
+                                 index=pd.Index([date(2000, 1, 1)], name='date')).astype(float)
+
+        subset = _select_columns(dataframe, [('', 'clicks'), ('wow', 'clicks')])
+
+        self.assertListEqual([('', 'clicks'), ('wow', 'clicks')], list(subset.columns))
+        self.assertListEqual([['', 'wow'], ['clicks']], [list(level) for level in subset.columns.levels])
+        self.assertListEqual(['date'], list(subset.index.names))
+        self.assertTrue(np.shares_memory(dataframe[('wow', 'clicks')].values, subset[('wow', 'clicks')].values))
+
+    def render_as_completed(self, executor=None):
+        with patch.object(SlicerManager, 'data', return_value=self.dataframe):
+            return self.widget_group(executor).manager.render_as_completed()
+
+    def test_render_as_completed_yields_widgets_in_order_without_executor(self):
+        result = list(self.render_as_completed())
+
+        self.assertListEqual(list(enumerate(self.render())), result)
+
+    def test_render_as_completed_queries_immediately(self):
+        with patch.object(SlicerManager, 'data', return_value=self.dataframe) as mock_data:
+            self.widget_group().manager.render_as_completed()
+
+        mock_data.assert_called_once()
+
+    def test_render_as_completed_with_thread_pool(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            result = dict(self.render_as_completed(executor))
+
+        self.assertDictEqual(dict(enumerate(self.render())), result)
+
+    def test_render_as_completed_yields_widgets_as_they_are_done(self):
+        table_yielded = Event()
+
+        def transform_line_chart_after_table(*args):
+            table_yielded.wait(5)
+            return 'line chart'
+
+        result = []
+        with patch.object(HighchartsLineTransformer, 'transform', side_effect=transform_line_chart_after_table):
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                for index, _ in self.render_as_completed(executor):
+                    result.append(index)
+                    if index == 1:
+                        table_yielded.set()
+
+        # The line chart is the first widget but is only done after the table was yielded
+        self.assertLess(result.index(1), result.index(0))
+        self.assertListEqual([0, 1, 2], sorted(result))
+
+
+class DashboardRenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        test_table = Table('test_table')
+        cls.test_slicer = Slicer(
+            table=test_table,
+            database=TestDatabase(),
+
+            metrics=[
+                Metric('clicks', 'Clicks'),
+                Metric('conversions', 'Conversions'),
+                Metric('cost', 'Cost'),
+            ],
+
+            dimensions=[
+                DatetimeDimension('date', definition=test_table.dt),
+                CategoricalDimension('locale', 'Locale', definition=test_table.locale),
+            ]
+        )
+
+        cls.dataframe = pd.DataFrame({
+            'date': pd.date_range(date(2000, 1, 1), periods=5),
+            'clicks': range(5),
+            'conversions': range(5, 10),
+            'cost': range(10, 15),
+        }).set_index('date')
+
+    def widget_group(self, metrics, dimensions=('date',)):
+        return WidgetGroup(
+            slicer=self.test_slicer,
+            widgets=[RowIndexCSVWidget(metrics=metrics)],
+            dimensions=list(dimensions),
+        )
+
+    @patch.object(SlicerManager, 'data')
+    def test_compatible_widget_groups_are_queried_together(self, mock_data):
+        mock_data.return_value = self.dataframe
+        dashboard = Dashboard([
+            self.widget_group(['clicks']),
+            self.widget_group(['conversions', 'clicks']),
+            self.widget_group(['cost']),
+        ])
+
+        dashboard.manager.render()
+
+        mock_data.assert_called_once_with(metrics=['clicks', 'conversions', 'cost'], dimensions=['date'],
+                                          metric_filters=[], dimension_filters=[], references=[], operations=[],
+                                          pagination=None)
+
+    @patch.object(SlicerManager, 'data')
+    def test_incompatible_widget_groups_are_queried_separately(self, mock_data):
+        mock_data.return_value = self.dataframe
+        dashboard = Dashboard([
+            self.widget_group(['clicks']),
+            self.widget_group(['conversions'], dimensions=['date', 'locale']),
+            self.widget_group(['cost']),
+        ])
+
+        dashboard.manager.render()
+
+        self.assertEqual(2, mock_data.call_count)
+        self.assertListEqual(['clicks', 'cost'], mock_data.call_args_list[0][1]['metrics'])
+        self.assertListEqual(['conversions'], mock_data.call_args_list[1][1]['metrics'])
+
+    @patch.object(SlicerManager, 'data')
+    def test_results_are_fanned_out_to_each_widget_group(self, mock_data):
+        mock_data.return_value = self.dataframe
+        widget_groups = [
+            self.widget_group(['clicks']),
+            self.widget_group(['conversions', 'cost']),
+        ]
+
+        result = Dashboard(widget_groups).manager.render()
+
+        self.assertListEqual([widget_group.manager.render() for widget_group in widget_groups], result)
+
+    @patch.object(SlicerManager, 'data')
+    def test_render_parameters_are_added_to_each_widget_group(self, mock_data):
+        mock_data.return_value = self.dataframe
+        dashboard = Dashboard([
+            self.widget_group(['clicks']),
+            self.widget_group(['conversions']),
+        ])
+        paginator = Paginator(limit=10)
+
+        dashboard.manager.render(dimensions=['locale'], pagination=paginator)
+
+        mock_data.assert_called_once_with(metrics=['clicks', 'conversions'], dimensions=['date', 'locale'],
+                                          metric_filters=[], dimension_filters=[], references=[], operations=[],
+                                          pagination=paginator)
+
+    @patch.object(SlicerManager, 'data')
+    def test_queries_are_run_with_executor(self, mock_data):
+        mock_data.return_value = self.dataframe
+        widget_groups = [
+            self.widget_group(['clicks']),
+            self.widget_group(['conversions'], dimensions=['date', 'locale']),
+        ]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = Dashboard(widget_groups, executor=executor).manager.render()
+
+        self.assertEqual(2, mock_data.call_count)
+        self.assertListEqual([widget_group.manager.render() for widget_group in widget_groups], result)
+
+
+class RenderSessionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        test_table = Table('test_table')
+        cls.test_slicer = Slicer(
+            table=test_table,
+            database=TestDatabase(),
+
+            metrics=[
+                Metric('clicks', 'Clicks'),
+                Metric('conversions', 'Conversions'),
+                Metric('cost', 'Cost'),
+            ],
+
+            dimensions=[
+                DatetimeDimension('date', definition=test_table.dt),
+            ]
+        )
+
+        cls.dataframe = pd.DataFrame({
+            'date': pd.date_range(date(2000, 1, 1), periods=5),
+            'clicks': range(5),
+            'conversions': range(5, 10),
+            'cost': range(10, 15),
+        }).set_index('date')
+
+    def setUp(self):
+        self.widget_group = WidgetGroup(
+            slicer=self.test_slicer,
+
+            widgets=[
+                RowIndexCSVWidget(metrics=['clicks']),
+                RowIndexCSVWidget(metrics=['conversions']),
+            ],
+
+            dimensions=['date'],
+        )
+
+        patcher = patch.object(SlicerManager, 'data', side_effect=self.data)
+        self.mock_data = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def data(self, metrics, **kwargs):
+        return self.dataframe[metrics]
+
+    def queried_metrics(self):
+        return [kwargs['metrics'] for _, kwargs in self.mock_data.call_args_list]
+
+    def test_first_render_is_equal_to_render(self):
+        result = self.widget_group.manager.session().render()
+
+        self.assertListEqual(self.widget_group.manager.render(), result)
+
+    def test_same_request_is_not_queried_or_transformed_again(self):
+        session = self.widget_group.manager.session()
+        session.render()
+
+        with patch.object(CSVRowIndexTransformer, 'transform') as mock_transform:
+            result = session.render()
+
+        self.assertEqual(1, self.mock_data.call_count)
+        mock_transform.assert_not_called()
+        self.assertListEqual(self.widget_group.manager.render(), result)
+
+    def test_only_missing_metrics_are_queried_when_a_widget_changes(self):
+        session = self.widget_group.manager.session()
+        session.render()
+
+        self.widget_group.widgets[1].metrics = ['conversions', 'cost']
+        with patch.object(CSVRowIndexTransformer, 'transform', return_value='csv') as mock_transform:
+            result = session.render()
+
+        self.assertListEqual([['clicks', 'conversions'], ['cost']], self.queried_metrics())
+        self.assertEqual(1, mock_transform.call_count)
+        self.assertListEqual(['conversions', 'cost'], list(mock_transform.call_args[0][0].columns))
+        self.assertEqual('csv', result[1])
+
+    def test_changed_request_is_queried_and_transformed_again(self):
+        session = self.widget_group.manager.session()
+        session.render()
+
+        with patch.object(CSVRowIndexTransformer, 'transform', return_value='csv') as mock_transform:
+            result = session.render(operations=[Totals('date')])
+
+        self.assertListEqual([['clicks', 'conversions'], ['clicks', 'conversions']], self.queried_metrics())
+        self.assertEqual(2, mock_transform.call_count)
+        self.assertListEqual(['csv', 'csv'], result)
+
+    def test_equal_requests_are_not_queried_again(self):
+        session = self.widget_group.manager.session()
+        session.render(operations=[Totals('date')], pagination=Paginator(limit=10))
+        session.render(operations=[Totals('date')], pagination=Paginator(limit=10))
+
+        self.assertEqual(1, self.mock_data.call_count)
+
+    def test_missing_metrics_of_a_page_are_queried_with_the_page(self):
+        session = self.widget_group.manager.session()
+        session.render(pagination=Paginator(limit=10))
+
+        self.widget_group.widgets[1].metrics = ['cost']
+        session.render(pagination=Paginator(limit=10))
+
+        self.assertListEqual([['clicks', 'conversions'], ['clicks', 'cost']], self.queried_metrics())
+
+    def test_all_metrics_are_queried_when_the_rows_changed(self):
+        session = self.widget_group.manager.session()
+        session.render()
+
+        self.mock_data.side_effect = lambda metrics, **kwargs: self.dataframe[metrics][:3]
+        self.widget_group.widgets[1].metrics = ['cost']
+        with patch.object(CSVRowIndexTransformer, 'transform', return_value='csv') as mock_transform:
+            session.render()
+
+        self.assertListEqual([['clicks', 'conversions'], ['cost'], ['clicks', 'cost']], self.queried_metrics())
+        self.assertEqual(2, mock_transform.call_count)
+
+    def test_reset(self):
+        session = self.widget_group.manager.session()
+        session.render()
+        session.reset()
+        session.render()
+
+        self.assertEqual(2, self.mock_data.call_count)
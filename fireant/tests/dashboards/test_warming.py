@@ -0,0 +1,128 @@
+# coding: utf-8
+import threading
+from datetime import date
+from threading import Event
+from unittest import TestCase
+
+import pandas as pd
+from fireant.dashboards import *
+from fireant.slicer import *
+from fireant.tests.database.mock_database import TestDatabase
+from mock import patch
+from pypika import Table
+
+
+class CacheWarmerTests(TestCase):
+    def setUp(self):
+        test_table = Table('test_table')
+        self.slicer = Slicer(
+            table=test_table,
+            database=TestDatabase(),
+
+            metrics=[
+                Metric('clicks', 'Clicks'),
+                Metric('conversions', 'Conversions'),
+            ],
+
+            dimensions=[
+                DatetimeDimension('date', definition=test_table.dt),
+                CategoricalDimension('locale', 'Locale', definition=test_table.locale),
+            ],
+
+            cache=ResultCache(),
+        )
+
+        self.widget_groups = [
+            WidgetGroup(self.slicer, widgets=[RowIndexCSVWidget(metrics=['clicks'])], dimensions=['date']),
+            WidgetGroup(self.slicer, widgets=[RowIndexCSVWidget(metrics=['conversions'])], dimensions=['date']),
+        ]
+
+        self.dataframe = pd.DataFrame({
+            'date': pd.date_range(date(2000, 1, 1), periods=3),
+            'clicks': [1., 2., 3.],
+            'conversions': [4., 5., 6.],
+        })
+
+        patcher = patch.object(TestDatabase, 'fetch_dataframe', side_effect=self.fetch_dataframe)
+        self.mock_fetch_dataframe = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch_dataframe(self, query):
+        if 'locale' in query:
+            return self.dataframe.assign(locale='us')
+
+        return self.dataframe.copy()
+
+    def test_warmed_widget_groups_are_rendered_from_the_cache(self):
+        CacheWarmer(self.widget_groups).warm()
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+        for widget_group in self.widget_groups:
+            widget_group.manager.render()
+
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+    def test_widget_groups_are_warmed_for_each_parameters(self):
+        warmer = CacheWarmer(self.widget_groups[:1], parameters=[{}, {'dimensions': ['locale']}])
+        warmer.warm()
+
+        self.widget_groups[0].manager.render()
+        self.widget_groups[0].manager.render(dimensions=['locale'])
+
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+    def test_warming_replaces_cached_data(self):
+        warmer = CacheWarmer(self.widget_groups[:1])
+        warmer.warm()
+        warmer.warm()
+
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+        self.assertEqual(1, len(self.slicer.cache))
+
+    def test_warming_queries_the_warming_database(self):
+        database = TestDatabase()
+
+        with patch.object(database, 'fetch_dataframe', side_effect=self.fetch_dataframe) as mock_fetch_dataframe:
+            CacheWarmer(self.widget_groups, database=database).warm()
+
+        self.assertEqual(2, mock_fetch_dataframe.call_count)
+        self.mock_fetch_dataframe.assert_not_called()
+
+    def test_failed_request_does_not_stop_warming(self):
+        self.mock_fetch_dataframe.side_effect = [Exception('Query failed'), self.dataframe.copy()]
+
+        with self.assertLogs('fireant.cache_warming$', level='ERROR'):
+            CacheWarmer(self.widget_groups, max_workers=1).warm()
+
+        self.assertEqual(1, len(self.slicer.cache))
+
+    def test_warm_returns_duration(self):
+        with self.assertLogs('fireant.cache_warming$', level='INFO') as logs:
+            duration = CacheWarmer(self.widget_groups).warm()
+
+        self.assertGreaterEqual(duration, 0)
+        self.assertIn('warmed 2 requests', logs.output[0])
+
+    def test_warm_stops_its_worker_threads(self):
+        n_threads = threading.active_count()
+
+        CacheWarmer(self.widget_groups).warm()
+
+        self.assertEqual(n_threads, threading.active_count())
+
+    def test_warming_in_the_background(self):
+        warmer = CacheWarmer(self.widget_groups)
+        warmed = Event()
+
+        with patch.object(CacheWarmer, 'warm', side_effect=warmed.set) as mock_warm:
+            warmer.start(interval=60)
+            self.assertTrue(warmed.wait(5))
+            warmer.stop()
+
+        mock_warm.assert_called_once_with()
+
+    def test_slicer_without_cache_raises_exception(self):
+        self.slicer.cache = None
+
+        with self.assertRaises(ValueError):
+            CacheWarmer(self.widget_groups)
@@ -1,4 +1,8 @@
 # coding: utf-8
+import sqlite3
+from contextlib import closing
+
+from fireant.database import Database
 from fireant.database.vertica import VerticaDatabase
 
 
@@ -7,3 +11,13 @@ class TestDatabase(VerticaDatabase):
 
     def connect(self):
         pass
+
+
+class SQLiteTestDatabase(Database):
+    # SQLite database stored in a file, which executes the queries of slicers without date functions.
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        return closing(sqlite3.connect(self.path))
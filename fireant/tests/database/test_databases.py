@@ -33,6 +33,41 @@ class DatabaseTests(TestCase):
 
         mock_read_sql.assert_called_once_with(query, mock_connect().__enter__())
 
+    @patch('pandas.read_sql', name='mock_read_sql')
+    @patch('fireant.database.Database.connect', name='mock_connect')
+    def test_fetch_dataframe_chunks(self, mock_connect, mock_read_sql):
+        query = 'SELECT 1'
+        mock_read_sql.return_value = iter(['OK1', 'OK2'])
+
+        result = Database().fetch_dataframe_chunks(query, 100)
+
+        self.assertListEqual(['OK1', 'OK2'], list(result))
+
+        mock_read_sql.assert_called_once_with(query, mock_connect().__enter__(), chunksize=100)
+
+    def test_cursor_dataframe_chunks(self):
+        mock_cursor = MagicMock(name='mock_cursor')
+        mock_cursor.description = [('a',), ('b',)]
+        mock_cursor.fetchmany.side_effect = [[(1, 2), (3, 4)], [(5, 6)], []]
+
+        result = list(Database._fetch_cursor_dataframe_chunks(mock_cursor, 'SELECT 1', 2))
+
+        mock_cursor.execute.assert_called_once_with('SELECT 1')
+        mock_cursor.fetchmany.assert_called_with(2)
+        self.assertListEqual([[[1, 2], [3, 4]], [[5, 6]]], [dataframe.values.tolist() for dataframe in result])
+        self.assertListEqual(['a', 'b'], list(result[0].columns))
+
+    def test_cursor_dataframe_chunks_of_an_empty_result(self):
+        mock_cursor = MagicMock(name='mock_cursor')
+        mock_cursor.description = [('a',), ('b',)]
+        mock_cursor.fetchmany.return_value = []
+
+        result = list(Database._fetch_cursor_dataframe_chunks(mock_cursor, 'SELECT 1', 2))
+
+        self.assertEqual(1, len(result))
+        self.assertEqual(0, len(result[0]))
+        self.assertListEqual(['a', 'b'], list(result[0].columns))
+
     def test_database_api(self):
         db = Database()
 
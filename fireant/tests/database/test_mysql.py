@@ -33,6 +33,20 @@ class TestMySQLDatabase(TestCase):
             user='test_user', password='password', cursorclass=ANY
         )
 
+    def test_fetch_dataframe_chunks_uses_an_unbuffered_cursor(self):
+        mock_pymysql = Mock()
+        mysql = MySQLDatabase(database='testdb')
+        with patch.dict('sys.modules', pymysql=mock_pymysql), patch.object(mysql, 'connect') as mock_connect:
+            mock_cursor = mock_connect.return_value.cursor.return_value.__enter__.return_value
+            mock_cursor.description = [('a',)]
+            mock_cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+
+            result = list(mysql.fetch_dataframe_chunks('SELECT 1', 2))
+
+        self.assertListEqual([[1, 2]], [list(dataframe['a']) for dataframe in result])
+        mock_connect.return_value.cursor.assert_called_once_with(mock_pymysql.cursors.SSCursor)
+        mock_connect.return_value.close.assert_called_once_with()
+
     def test_trunc_hour(self):
         result = MySQLDatabase(database='testdb').trunc_date(Field('date'), 'hour')
 
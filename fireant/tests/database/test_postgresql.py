@@ -37,6 +37,19 @@ class TestPostgreSQL(TestCase):
             user='test_user', password='password',
         )
 
+    def test_fetch_dataframe_chunks_uses_a_named_cursor(self):
+        with patch.object(self.database, 'connect') as mock_connect:
+            mock_cursor = mock_connect.return_value.cursor.return_value.__enter__.return_value
+            mock_cursor.description = [('a',)]
+            mock_cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+
+            result = list(self.database.fetch_dataframe_chunks('SELECT 1', 2))
+
+        self.assertListEqual([[1, 2]], [list(dataframe['a']) for dataframe in result])
+        mock_connect.return_value.cursor.assert_called_once_with(name='fireant_chunks')
+        mock_cursor.fetchmany.assert_called_with(2)
+        mock_connect.return_value.close.assert_called_once_with()
+
     def test_trunc_hour(self):
         result = self.database.trunc_date(Field('date'), 'hour')
 
@@ -216,6 +216,20 @@ cont_cat_dims_single_metric_schema = {
     'dimensions': OrderedDict([('cont', cont_dim), ('cat1', cat1_dim)])
 }
 
+cont_cat_dims_single_metric_ref_df = pd.DataFrame(
+    np.array([
+        np.arange(16),
+        2 * np.arange(16),
+    ]).T,
+    columns=[['', 'wow'], ['one', 'one']],
+    index=cont_cat_idx
+)
+cont_cat_dims_single_metric_ref_schema = {
+    'metrics': OrderedDict([('one', {'axis': 0, 'label': 'One'})]),
+    'dimensions': OrderedDict([('cont', cont_dim), ('cat1', cat1_dim)]),
+    'references': {'wow': 'WoW'}
+}
+
 # Mock DF with continuous and categorical dimensions and two metric columns
 cont_cat_dims_multi_metric_df = pd.DataFrame(
     np.array([
@@ -0,0 +1,381 @@
+# coding: utf-8
+import time
+from datetime import date
+from threading import (
+    Event,
+    Thread,
+)
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from fireant.slicer import *
+from fireant.slicer.cache import ResultCache
+from fireant.slicer.managers import SlicerManager
+from fireant.slicer.references import YoY
+from fireant.tests.database.mock_database import TestDatabase
+from mock import (
+    Mock,
+    patch,
+)
+from pypika import (
+    Field,
+    Query,
+    Table,
+    functions as fn,
+)
+
+
+class ResultCacheTests(TestCase):
+    def test_get_returns_none_for_missing_key(self):
+        self.assertIsNone(ResultCache().get('key'))
+
+    def test_set_and_get(self):
+        cache = ResultCache()
+        dataframe = pd.DataFrame()
+
+        cache.set('key', dataframe)
+
+        self.assertIs(dataframe, cache.get('key'))
+
+    def test_fetch_loads_missing_key(self):
+        cache = ResultCache()
+        dataframe = pd.DataFrame()
+        load = Mock(return_value=dataframe)
+
+        self.assertIs(dataframe, cache.fetch('key', load))
+        self.assertIs(dataframe, cache.fetch('key', load))
+        load.assert_called_once_with()
+
+    def test_fetch_with_refresh_replaces_cached_result(self):
+        cache = ResultCache()
+        cache.set('key', pd.DataFrame())
+        dataframe = pd.DataFrame()
+
+        result = cache.fetch('key', Mock(return_value=dataframe), refresh=True)
+
+        self.assertIs(dataframe, result)
+        self.assertIs(dataframe, cache.get('key'))
+
+    @patch('fireant.slicer.cache.time')
+    def test_result_expires_after_ttl(self, mock_time):
+        cache = ResultCache(ttl=10)
+        mock_time.time.return_value = 100
+        cache.set('key', pd.DataFrame())
+
+        mock_time.time.return_value = 109
+        self.assertIsNotNone(cache.get('key'))
+
+        mock_time.time.return_value = 110
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(0, len(cache))
+
+    def test_least_recently_used_result_is_removed(self):
+        cache = ResultCache(max_entries=2)
+        cache.set('a', pd.DataFrame())
+        cache.set('b', pd.DataFrame())
+        cache.get('a')
+
+        cache.set('c', pd.DataFrame())
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_clear(self):
+        cache = ResultCache()
+        cache.set('key', pd.DataFrame())
+
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+
+
+
+    def test_result_of_another_version_is_not_returned(self):
+        cache = ResultCache()
+        cache.set('key', pd.DataFrame(), version=1)
+
+        self.assertIsNotNone(cache.get('key', version=1))
+        self.assertIsNone(cache.get('key', version=2))
+        self.assertEqual(0, len(cache))
+
+    def test_fetch_loads_result_of_another_version(self):
+        cache = ResultCache()
+        cache.set('key', pd.DataFrame(), version=1)
+        dataframe = pd.DataFrame()
+
+        self.assertIs(dataframe, cache.fetch('key', Mock(return_value=dataframe), version=2))
+        self.assertIs(dataframe, cache.get('key', version=2))
+
+    @patch('fireant.slicer.cache.time')
+    def test_version_is_probed_after_interval(self, mock_time):
+        cache = ResultCache()
+        probe = Mock(side_effect=[1, 2])
+
+        mock_time.time.return_value = 100
+        self.assertEqual(1, cache.version('probe', probe, 60))
+        mock_time.time.return_value = 159
+        self.assertEqual(1, cache.version('probe', probe, 60))
+        mock_time.time.return_value = 160
+        self.assertEqual(2, cache.version('probe', probe, 60))
+
+        self.assertEqual(2, probe.call_count)
+
+    def test_concurrent_requests_for_an_expired_version_probe_once(self):
+        cache = ResultCache()
+        probing, release = Event(), Event()
+
+        def probe():
+            probing.set()
+            release.wait(5)
+            return 1
+
+        probe = Mock(side_effect=probe)
+        versions = []
+        threads = [Thread(target=lambda: versions.append(cache.version('probe', probe, 60)))
+                   for _ in range(4)]
+
+        threads[0].start()
+        probing.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # Gives the other threads time to request the version while it is probed
+        time.sleep(.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, probe.call_count)
+        self.assertListEqual([1, 1, 1, 1], versions)
+
+    def test_version_is_probed_again_after_a_failed_probe(self):
+        cache = ResultCache()
+        probe = Mock(side_effect=[ValueError, 1])
+
+        with self.assertRaises(ValueError):
+            cache.version('probe', probe, 60)
+
+        self.assertEqual(1, cache.version('probe', probe, 60))
+
+
+@patch('fireant.slicer.cache.time')
+class StaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        self.cache = ResultCache(ttl=10, max_stale=20)
+        self.stale = pd.DataFrame()
+        self.fresh = pd.DataFrame()
+
+    def store_stale_result(self, mock_time, age):
+        mock_time.time.return_value = 100
+        self.cache.set('key', self.stale)
+        mock_time.time.return_value = 100 + age
+
+    def wait_for_revalidations(self):
+        for thread in list(self.cache._revalidations.values()):
+            thread.join()
+
+    def test_expired_result_is_returned_and_loaded_in_the_background(self, mock_time):
+        self.store_stale_result(mock_time, 15)
+        load = Mock(return_value=self.fresh)
+
+        self.assertIs(self.stale, self.cache.fetch('key', load))
+        self.wait_for_revalidations()
+
+        load.assert_called_once_with()
+        self.assertIs(self.fresh, self.cache.get('key'))
+
+    def test_background_loads_are_coalesced(self, mock_time):
+        self.store_stale_result(mock_time, 15)
+        loading, loaded = Event(), Event()
+
+        def load():
+            loading.set()
+            loaded.wait(5)
+            return self.fresh
+
+        load = Mock(side_effect=load)
+        self.assertIs(self.stale, self.cache.fetch('key', load))
+        self.assertTrue(loading.wait(5))
+        self.assertIs(self.stale, self.cache.fetch('key', load))
+        loaded.set()
+        self.wait_for_revalidations()
+
+        load.assert_called_once_with()
+
+    def test_result_beyond_max_stale_is_loaded_before_it_is_returned(self, mock_time):
+        self.store_stale_result(mock_time, 30)
+        load = Mock(return_value=self.fresh)
+
+        self.assertIs(self.fresh, self.cache.fetch('key', load))
+        self.assertEqual({}, self.cache._revalidations)
+
+    def test_failed_background_load_keeps_the_stale_result(self, mock_time):
+        self.store_stale_result(mock_time, 15)
+
+        with self.assertLogs('fireant.cache$', level='ERROR'):
+            self.cache.fetch('key', Mock(side_effect=Exception('Query failed')))
+            self.wait_for_revalidations()
+
+        self.assertIs(self.stale, self.cache.fetch('key', Mock(return_value=self.fresh)))
+
+    def test_get_does_not_return_expired_result(self, mock_time):
+        self.store_stale_result(mock_time, 15)
+
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_cache_without_max_stale_does_not_return_expired_result(self, mock_time):
+        self.cache.max_stale = None
+        self.store_stale_result(mock_time, 15)
+
+        self.assertIs(self.fresh, self.cache.fetch('key', Mock(return_value=self.fresh)))
+        self.assertEqual({}, self.cache._revalidations)
+
+class SlicerCacheTests(TestCase):
+    def setUp(self):
+        self.test_table = Table('test')
+        self.slicer = Slicer(
+            self.test_table,
+            TestDatabase(),
+
+            metrics=[Metric('foo'), Metric('bar')],
+            dimensions=[DatetimeDimension('date', definition=self.test_table.dt)],
+
+            cache=ResultCache(),
+        )
+
+        self.dataframe = pd.DataFrame({
+            'date': pd.date_range(date(2000, 1, 1), periods=3),
+            'foo': [1., 2., 3.],
+            'bar': [4., 5., 6.],
+        })
+
+        patcher = patch.object(TestDatabase, 'fetch_dataframe', side_effect=lambda query: self.dataframe.copy())
+        self.mock_fetch_dataframe = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_shares_values(self, dataframe, other):
+        # Results returned from the cache are copies of the cached data frame which share its values
+        self.assertIsNot(dataframe, other)
+        pd.testing.assert_frame_equal(dataframe, other)
+        for column in dataframe.columns:
+            self.assertTrue(np.shares_memory(dataframe[column].values, other[column].values))
+
+    def test_same_request_is_queried_once(self):
+        result = self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        self.assert_shares_values(result, self.slicer.manager.data(metrics=['foo'], dimensions=['date']))
+        self.assertEqual(1, self.mock_fetch_dataframe.call_count)
+
+    def test_changing_the_columns_or_index_of_a_result_does_not_change_the_cached_data(self):
+        result = self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+        expected = result.copy()
+
+        result['foo'] = 0.
+        result['baz'] = 1.
+        result.sort_index(ascending=False, inplace=True)
+
+        pd.testing.assert_frame_equal(expected, self.slicer.manager.data(metrics=['foo'], dimensions=['date']))
+        self.assertEqual(1, self.mock_fetch_dataframe.call_count)
+
+    def test_different_requests_are_cached_separately(self):
+        foo = self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+        bar = self.slicer.manager.data(metrics=['bar'], dimensions=['date'])
+
+        self.assertListEqual(['foo'], list(foo.columns))
+        self.assertListEqual(['bar'], list(bar.columns))
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+    def test_request_without_cache_is_always_queried(self):
+        self.slicer.cache = None
+
+        self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+        self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+    def test_refresh_cache_manager_replaces_cached_data(self):
+        self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        result = SlicerManager(self.slicer, refresh_cache=True).data(metrics=['foo'], dimensions=['date'])
+
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+        self.assert_shares_values(result, self.slicer.manager.data(metrics=['foo'], dimensions=['date']))
+
+    def test_manager_with_database_queries_the_database(self):
+        database = TestDatabase()
+
+        with patch.object(database, 'fetch_dataframe', return_value=self.dataframe.copy()) as mock_fetch_dataframe:
+            SlicerManager(self.slicer, database=database).data(metrics=['foo'], dimensions=['date'])
+
+        mock_fetch_dataframe.assert_called_once()
+        self.mock_fetch_dataframe.assert_not_called()
+
+    def test_key_is_the_query_of_the_request(self):
+        self.slicer.manager.data(metrics=['foo'], dimensions=[('date', DatetimeDimension.week)],
+                                 references=[YoY('date')])
+
+        (query,), _ = self.mock_fetch_dataframe.call_args
+        self.assertEqual(query, self.slicer.cache._entries.popitem()[0][0])
+
+    def test_slicers_of_different_databases_are_cached_separately(self):
+        other_slicer = Slicer(
+            self.test_table,
+            TestDatabase(host='other'),
+
+            metrics=[Metric('foo'), Metric('bar')],
+            dimensions=[DatetimeDimension('date', definition=self.test_table.dt)],
+
+            cache=self.slicer.cache,
+        )
+
+        result = self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+        other_result = other_slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        self.assertFalse(np.shares_memory(result['foo'].values, other_result['foo'].values))
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+    def test_slicers_of_the_same_database_share_results(self):
+        other_slicer = Slicer(
+            self.test_table,
+            TestDatabase(),
+
+            metrics=[Metric('foo'), Metric('bar')],
+            dimensions=[DatetimeDimension('date', definition=self.test_table.dt)],
+
+            cache=self.slicer.cache,
+        )
+
+        result = self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        self.assert_shares_values(result, other_slicer.manager.data(metrics=['foo'], dimensions=['date']))
+        self.assertEqual(1, self.mock_fetch_dataframe.call_count)
+
+    def test_database_key_does_not_contain_the_password(self):
+        database = TestDatabase(host='example.com', password='secret')
+
+        self.assertIn('example.com', database.cache_key())
+        self.assertNotIn('secret', database.cache_key())
+
+    def test_data_is_queried_again_when_the_freshness_probe_changes(self):
+        self.slicer.freshness_probe = Query.from_('load_log').select(fn.Max(Field('loaded_at')))
+        self.slicer.freshness_interval = 0
+
+        with patch.object(TestDatabase, 'fetch', side_effect=[[(1,)], [(1,)], [(2,)]]) as mock_fetch:
+            for _ in range(3):
+                self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        mock_fetch.assert_called_with('SELECT MAX("loaded_at") FROM "load_log"')
+        self.assertEqual(3, mock_fetch.call_count)
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+
+    def test_freshness_probe_is_shared_by_every_result_of_the_slicer(self):
+        self.slicer.freshness_probe = Query.from_('load_log').select(fn.Max(Field('loaded_at')))
+
+        with patch.object(TestDatabase, 'fetch', return_value=[(1,)]) as mock_fetch:
+            self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+            self.slicer.manager.data(metrics=['bar'], dimensions=['date'])
+            self.slicer.manager.data(metrics=['foo'], dimensions=['date'])
+
+        mock_fetch.assert_called_once_with('SELECT MAX("loaded_at") FROM "load_log"')
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
@@ -0,0 +1,168 @@
+# coding: utf-8
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from fireant.slicer import *
+from fireant.slicer.operations import (
+    CumSum,
+    TopN,
+    Totals,
+)
+from fireant.slicer.references import (
+    Delta,
+    WoW,
+    YoY,
+)
+from fireant.tests.database.mock_database import TestDatabase
+from mock import patch
+from pypika import (
+    Order,
+    Table,
+)
+
+
+class ConcurrentRequestTests(TestCase):
+    """
+    A slicer is shared by the threads of a server, so requests which are run concurrently must return the same data
+    as when they are run one after another.
+    """
+    n_threads = 8
+    n_repeats = 10
+
+    requests = [
+        dict(metrics=['clicks'], dimensions=['date']),
+        dict(metrics=['clicks', 'cost'], dimensions=['date', 'locale']),
+        dict(metrics=['clicks'], dimensions=[('date', DatetimeDimension.week)], references=[YoY('date')]),
+        dict(metrics=['clicks', 'cost'], dimensions=['date'], references=[WoW('date'), Delta(WoW('date'))]),
+        dict(metrics=['cost'], dimensions=['date'],
+             dimension_filters=[RangeFilter('date', date(2000, 1, 1), date(2000, 3, 1))]),
+        dict(metrics=['clicks'], dimensions=['locale'],
+             metric_filters=[EqualityFilter('clicks', EqualityOperator.gt, 5)]),
+        dict(metrics=['clicks'], dimensions=['date', 'locale'], operations=[Totals('locale')]),
+        dict(metrics=['clicks'], dimensions=['date'], operations=[CumSum('clicks')]),
+        dict(metrics=['cost'], dimensions=['date', 'locale'], operations=[TopN('locale', 2, by='cost')]),
+        dict(metrics=['clicks', 'cost'], dimensions=['locale'],
+             pagination=Paginator(limit=5, order=[('clicks', Order.desc)])),
+    ]
+
+    def setUp(self):
+        test_table = Table('test_table')
+        self.slicer = Slicer(
+            test_table,
+            TestDatabase(),
+
+            metrics=[
+                Metric('clicks', 'Clicks'),
+                Metric('cost', 'Cost'),
+            ],
+
+            dimensions=[
+                DatetimeDimension('date', definition=test_table.dt),
+                CategoricalDimension('locale', 'Locale', definition=test_table.locale),
+            ],
+        )
+
+        # The mock database returns the data of a request for its query only, so a query which is built differently
+        # when requests are run concurrently fails
+        self.dataframes = {}
+        for index, request in enumerate(self.requests):
+            query_string = self.slicer.manager.query_string(**request)
+            self.dataframes[query_string] = self._dataframe(index, request)
+
+        patcher = patch.object(TestDatabase, 'fetch_dataframe', side_effect=self.fetch_dataframe)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch_dataframe(self, query):
+        return self.dataframes[query].copy()
+
+    def _dataframe(self, seed, request):
+        query_schema = self.slicer.manager.data_query_schema(**request)
+        reference_keys = [reference.key for reference in request.get('references', [])]
+
+        n_rows = 10
+        random_state = np.random.RandomState(seed)
+        columns = {'date': pd.date_range(date(2000, 1, 1), periods=n_rows),
+                   'locale': random_state.choice(['us', 'de', 'fr', None], n_rows)}
+
+        dataframe = pd.DataFrame({key: columns[key] for key in query_schema['dimensions']})
+        for key in query_schema['metrics']:
+            for column in [key] + ['{}_{}'.format(key, reference_key) for reference_key in reference_keys]:
+                dataframe[column] = random_state.rand(n_rows) * 10
+
+        return dataframe
+
+    def _shuffled_requests(self):
+        requests = list(self.requests) * self.n_repeats
+        random.Random(0).shuffle(requests)
+        return requests
+
+    def _run_concurrently(self, function, requests):
+        start = threading.Barrier(self.n_threads)
+        started = threading.local()
+
+        def run(request):
+            # Starts the first requests of the threads at the same time
+            if not getattr(started, 'value', False):
+                started.value = True
+                try:
+                    start.wait(1)
+                except threading.BrokenBarrierError:
+                    pass
+
+            return function(request)
+
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            return list(executor.map(run, requests))
+
+    def assert_concurrent_results_equal_serial_results(self, function, assert_equal):
+        expected = {id(request): function(request) for request in self.requests}
+
+        requests = self._shuffled_requests()
+        results = self._run_concurrently(function, requests)
+
+        for request, result in zip(requests, results):
+            assert_equal(expected[id(request)], result)
+
+    def test_query_strings(self):
+        self.assert_concurrent_results_equal_serial_results(
+            lambda request: self.slicer.manager.query_string(**request),
+            self.assertEqual,
+        )
+
+    def test_data(self):
+        self.assert_concurrent_results_equal_serial_results(
+            lambda request: self.slicer.manager.data(**request),
+            pd.testing.assert_frame_equal,
+        )
+
+    def test_data_with_result_cache(self):
+        self.slicer.cache = ResultCache(max_entries=len(self.requests) // 2)
+
+        self.assert_concurrent_results_equal_serial_results(
+            lambda request: self.slicer.manager.data(**request),
+            pd.testing.assert_frame_equal,
+        )
+
+    def test_display_schemas(self):
+        self.assert_concurrent_results_equal_serial_results(
+            lambda request: self.slicer.manager.display_schema(
+                metrics=request['metrics'],
+                dimensions=request['dimensions'],
+                references=request.get('references', ()),
+                operations=request.get('operations', ()),
+            ),
+            self.assertEqual,
+        )
+
+    def test_transformed_data(self):
+        self.assert_concurrent_results_equal_serial_results(
+            lambda request: self.slicer.highcharts.line_chart(**request)
+            if request['dimensions'][0] != 'locale' else self.slicer.datatables.row_index_table(**request),
+            self.assertEqual,
+        )
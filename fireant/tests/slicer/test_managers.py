@@ -1,22 +1,38 @@
 # coding: utf-8
 import copy
 import itertools
+import os
+import shutil
+import tempfile
+import threading
+from multiprocessing.pool import ThreadPool
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
+from fireant import settings
 from fireant.slicer import *
 from fireant.slicer.managers import SlicerManager
-from fireant.slicer.operations import CumSum
+from fireant.slicer.operations import (
+    CumSum,
+    TopN,
+    Totals,
+)
 from fireant.slicer.references import WoW
 from fireant.slicer.transformers import *
-from fireant.tests.database.mock_database import TestDatabase
+from fireant.tests.database.mock_database import (
+    SQLiteTestDatabase,
+    TestDatabase,
+)
 from mock import (
     MagicMock,
     patch,
 )
 from pypika import (
+    Order,
     Table,
     Query,
+    functions as fn,
 )
 
 
@@ -61,6 +77,18 @@ class ManagerInitializationTests(TestCase):
         self.assertTrue(hasattr(self.slicer.datatables, 'column_index_table'))
         self.assertTrue(hasattr(self.slicer.datatables, 'row_index_csv'))
         self.assertTrue(hasattr(self.slicer.datatables, 'column_index_csv'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'row_index_table_columnar'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'column_index_table_columnar'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'row_index_table_stream'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'column_index_table_stream'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'row_index_csv_stream'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'column_index_csv_stream'))
+        self.assertTrue(hasattr(self.slicer.datatables, 'row_index_table_server_side'))
+
+        self.assertTrue(hasattr(self.slicer, 'arrow'))
+        self.assertTrue(hasattr(self.slicer.arrow, 'arrow_stream'))
+        self.assertTrue(hasattr(self.slicer.arrow, 'feather'))
+        self.assertTrue(hasattr(self.slicer.arrow, 'parquet'))
 
     @patch('fireant.slicer.managers.SlicerManager.post_process')
     @patch('fireant.slicer.managers.SlicerManager.query_data')
@@ -83,6 +111,24 @@ class ManagerInitializationTests(TestCase):
         mock_query_data.assert_called_once_with(a=1, b=2)
         mock_operation_schema.assert_called_once_with(mock_args['operations'])
 
+    @patch('fireant.slicer.managers.SlicerManager.query_data_chunks')
+    @patch('fireant.slicer.managers.SlicerManager.data_query_schema')
+    def test_data_chunks(self, mock_query_schema, mock_query_data_chunks):
+        mock_query_schema.return_value = {'a': 1, 'b': 2}
+        mock_query_data_chunks.return_value = iter([pd.DataFrame(columns=['a', 'c']),
+                                                    pd.DataFrame(columns=['a', 'c'])])
+
+        result = list(self.slicer.manager.data_chunks(100, metrics=['a'], dimensions=['e']))
+
+        self.assertEqual(2, len(result))
+        for dataframe in result:
+            self.assertListEqual(['a'], list(dataframe.columns))
+        mock_query_data_chunks.assert_called_once_with(chunksize=100, a=1, b=2)
+
+    def test_data_chunks_with_post_processing_operations(self):
+        with self.assertRaises(SlicerException):
+            self.slicer.manager.data_chunks(100, metrics=['foo'], operations=[CumSum('foo')])
+
     @patch('fireant.slicer.managers.SlicerManager._build_data_query')
     @patch('fireant.slicer.managers.SlicerManager.data_query_schema')
     def test_query_string(self, mock_query_schema, mock_build_query_string):
@@ -130,6 +176,25 @@ class ManagerInitializationTests(TestCase):
         mock_sm_ds.assert_called_once_with(request['metrics'], request['dimensions'], request.get('references', ()), ())
         mock_transform.assert_called_once_with(mock_df, mock_schema)
 
+    @patch.object(SlicerManager, 'display_schema')
+    @patch.object(SlicerManager, 'data')
+    def _test_transform_with_query_operations(self, test_func, mock_transform, request, query_operations,
+                                              mock_sm_data, mock_sm_ds):
+        mock_sm_data.return_value = mock_df = MagicMock()
+        mock_sm_ds.return_value = mock_schema = {
+            'metrics': []
+        }
+        mock_transform.return_value = mock_return = 'OK'
+
+        result = test_func(**request)
+
+        operations = list(request['operations']) + query_operations
+        self.assertEqual(mock_return, result)
+        mock_sm_data.assert_called_once_with(**dict(request, operations=operations))
+        mock_sm_ds.assert_called_once_with(request['metrics'], request['dimensions'], request['references'],
+                                           operations)
+        mock_transform.assert_called_once_with(mock_df, mock_schema)
+
     @patch.object(HighchartsLineTransformer, 'transform')
     def test_transform_highcharts_line_chart(self, mock_transform):
         request = {
@@ -376,7 +441,20 @@ class ManagerInitializationTests(TestCase):
             'references': (), 'operations': (), 'pagination': self.paginator,
         }
 
-        self._test_transform(self.slicer.datatables.column_index_table, mock_transform, request)
+        self._test_transform_with_query_operations(self.slicer.datatables.column_index_table, mock_transform, request,
+                                                   [TopN('uni', 23, other=False)])
+
+    @patch.object(DataTablesColumnIndexTransformer, 'transform')
+    def test_transform_datatables_col_index_table_not_limited_with_totals(self, mock_transform):
+        request = {
+            'metrics': ['foo', 'bar'],
+            'dimensions': ['cat', 'uni'],
+            'metric_filters': (), 'dimension_filters': (),
+            'references': (), 'operations': [Totals('uni')], 'pagination': None,
+        }
+
+        self._test_transform_with_query_operations(self.slicer.datatables.column_index_table, mock_transform, request,
+                                                   [])
 
     @patch.object(CSVRowIndexTransformer, 'transform')
     def test_transform_datatables_row_index_table(self, mock_transform):
@@ -390,7 +468,7 @@ class ManagerInitializationTests(TestCase):
         self._test_transform(self.slicer.datatables.row_index_csv, mock_transform, request)
 
     @patch.object(CSVColumnIndexTransformer, 'transform')
-    def test_transform_datatables_col_index_table(self, mock_transform):
+    def test_transform_datatables_col_index_csv(self, mock_transform):
         request = {
             'metrics': ['foo', 'bar'],
             'dimensions': ['cat', 'uni'],
@@ -400,6 +478,112 @@ class ManagerInitializationTests(TestCase):
 
         self._test_transform(self.slicer.datatables.column_index_csv, mock_transform, request)
 
+    def test_csv_column_index_transformers_do_not_limit_the_query(self):
+        for transformer in [CSVColumnIndexTransformer(), CSVColumnIndexStreamTransformer()]:
+            operations = transformer.query_operations(self.slicer, ['foo'], ['cat', 'uni'], [], [], [], [])
+            self.assertListEqual([], operations)
+
+    @patch.object(CSVRowIndexStreamTransformer, 'transform')
+    @patch.object(SlicerManager, 'display_schema')
+    @patch.object(SlicerManager, 'data_chunks')
+    def test_transform_datatables_row_index_csv_stream(self, mock_sm_data_chunks, mock_sm_ds, mock_transform):
+        request = {
+            'metrics': ['foo', 'bar'],
+            'dimensions': ['cat', 'uni'],
+            'metric_filters': (), 'dimension_filters': (),
+            'references': (), 'operations': (), 'pagination': None,
+        }
+        mock_sm_data_chunks.return_value = mock_chunks = MagicMock()
+        mock_sm_ds.return_value = mock_schema = {'metrics': []}
+        mock_transform.return_value = mock_return = iter([b'OK'])
+
+        result = self.slicer.datatables.row_index_csv_stream(**request)
+
+        self.assertEqual(mock_return, result)
+        mock_sm_data_chunks.assert_called_once_with(settings.datatables_chunksize, **request)
+        mock_transform.assert_called_once_with(mock_chunks, mock_schema)
+
+    @patch.object(DataTablesServerSideTransformer, 'transform_page')
+    @patch.object(SlicerManager, 'display_schema')
+    @patch.object(SlicerManager, 'data_count')
+    @patch.object(SlicerManager, 'data_page')
+    def test_transform_datatables_row_index_table_server_side(self, mock_sm_data_page, mock_sm_data_count,
+                                                              mock_sm_ds, mock_transform_page):
+        params = {'draw': '2', 'start': '10', 'length': '10',
+                  'order[0][column]': '2', 'order[0][dir]': 'desc', 'search[value]': 'abc',
+                  'columns[0][data]': 'cat', 'columns[1][data]': 'uni', 'columns[2][data]': 'foo'}
+        mock_sm_data_page.return_value = mock_df, _ = MagicMock(), 42
+        mock_sm_data_count.return_value = 100
+        mock_sm_ds.return_value = mock_schema = {'metrics': []}
+        mock_transform_page.return_value = mock_return = 'OK'
+
+        result = self.slicer.datatables.row_index_table_server_side(params, metrics=['foo', 'bar'],
+                                                                    dimensions=['cat', 'uni'])
+
+        self.assertEqual(mock_return, result)
+        (_, page_kwargs), = mock_sm_data_page.call_args_list
+        self.assertListEqual([WildcardFilter('cat', '%abc%')], page_kwargs['dimension_filters'])
+        self.assertEqual(10, page_kwargs['pagination'].offset)
+        self.assertEqual(10, page_kwargs['pagination'].limit)
+        self.assertListEqual([('foo', Order.desc), ('cat', Order.asc), ('uni', Order.asc)],
+                             list(page_kwargs['pagination'].order))
+
+        # The total is counted without the search
+        mock_sm_data_count.assert_called_once_with(metrics=['foo', 'bar'], dimensions=['cat', 'uni'],
+                                                   metric_filters=(), dimension_filters=(), operations=())
+        mock_transform_page.assert_called_once_with(mock_df, mock_schema, draw=2,
+                                                    records_total=100, records_filtered=42)
+
+    @patch.object(DataTablesServerSideTransformer, 'transform_page')
+    @patch.object(SlicerManager, 'display_schema')
+    @patch.object(SlicerManager, 'data_count')
+    @patch.object(SlicerManager, 'data_page')
+    def test_server_side_table_without_search_is_counted_in_one_query(self, mock_sm_data_page, mock_sm_data_count,
+                                                                      mock_sm_ds, mock_transform_page):
+        mock_sm_data_page.return_value = mock_df, _ = MagicMock(), 42
+        mock_sm_ds.return_value = mock_schema = {'metrics': []}
+
+        self.slicer.datatables.row_index_table_server_side({'draw': 1, 'start': 0, 'length': 10},
+                                                           metrics=['foo'], dimensions=['cat'])
+
+        mock_sm_data_count.assert_not_called()
+        mock_transform_page.assert_called_once_with(mock_df, mock_schema, draw=1,
+                                                    records_total=42, records_filtered=42)
+
+    @patch.object(DataTablesServerSideTransformer, 'transform_page')
+    @patch.object(SlicerManager, 'display_schema')
+    @patch.object(SlicerManager, 'data_count')
+    @patch.object(SlicerManager, 'data_page')
+    def test_server_side_table_empty_page_is_counted(self, mock_sm_data_page, mock_sm_data_count,
+                                                     mock_sm_ds, mock_transform_page):
+        mock_sm_data_page.return_value = mock_df, _ = MagicMock(), None
+        mock_sm_data_count.return_value = 5
+        mock_sm_ds.return_value = mock_schema = {'metrics': []}
+
+        self.slicer.datatables.row_index_table_server_side({'draw': 1, 'start': 10, 'length': 10},
+                                                           metrics=['foo'], dimensions=['cat'])
+
+        mock_sm_data_count.assert_called_once_with(metrics=['foo'], dimensions=['cat'],
+                                                   metric_filters=(), dimension_filters=[], operations=())
+        mock_transform_page.assert_called_once_with(mock_df, mock_schema, draw=1,
+                                                    records_total=5, records_filtered=5)
+
+    @patch('fireant.slicer.managers.SlicerManager.query_data_page')
+    @patch('fireant.slicer.managers.SlicerManager.data_query_schema')
+    def test_data_page(self, mock_query_schema, mock_query_data_page):
+        mock_query_schema.return_value = {'a': 1, 'b': 2}
+        mock_query_data_page.return_value = pd.DataFrame(columns=['a', 'c']), 42
+
+        dataframe, count = self.slicer.manager.data_page(metrics=['a'], dimensions=['e'], pagination=self.paginator)
+
+        self.assertEqual(42, count)
+        self.assertListEqual(['a'], list(dataframe.columns))
+        mock_query_data_page.assert_called_once_with(a=1, b=2)
+
+    def test_data_page_with_post_processing_operations(self):
+        with self.assertRaises(SlicerException):
+            self.slicer.manager.data_page(metrics=['foo'], operations=[CumSum('foo')])
+
     @patch.object(SlicerManager, 'query_data')
     @patch.object(SlicerManager, 'data_query_schema')
     def test_remove_duplicate_metric_keys(self, mock_query_schema, mock_query_data):
@@ -508,3 +692,324 @@ class ManagerInitializationTests(TestCase):
         db = TestDatabase()
         self.slicer.manager.query_data(db, self.slicer.table)
         mock_get_dataframe.assert_called_once_with(db, query)
+
+
+class DataMemoryTests(TestCase):
+    """
+    The data frame returned by the database is normalized, indexed and returned without copying the values of the
+    metrics.
+    """
+    n_rows = 200000
+
+    def setUp(self):
+        self.test_table = Table('test')
+        self.slicer = Slicer(
+            self.test_table,
+            TestDatabase(),
+
+            metrics=[Metric('foo'), Metric('bar'), Metric('fiz'), Metric('buz')],
+            dimensions=[CategoricalDimension('cat')],
+        )
+
+        self.dataframe = pd.DataFrame({
+            'cat': np.array(['a', 'b', 'c', None], dtype=object)[np.arange(self.n_rows) % 4],
+            'foo': np.arange(self.n_rows, dtype=float),
+            'bar': np.arange(self.n_rows, dtype=float),
+            'fiz': np.arange(self.n_rows, dtype=float),
+            'buz': np.arange(self.n_rows, dtype=float),
+        })
+        self.metrics_size = self.dataframe[['foo', 'bar', 'fiz', 'buz']].memory_usage(index=False).sum()
+
+    def test_metric_values_are_not_copied(self):
+        with patch.object(TestDatabase, 'fetch_dataframe', return_value=self.dataframe):
+            foo_values = self.dataframe['foo'].values
+            result = self.slicer.manager.data(metrics=['foo', 'bar', 'fiz', 'buz'], dimensions=['cat'])
+
+        self.assertTrue(np.shares_memory(foo_values, result['foo'].values))
+
+    def test_peak_memory_is_less_than_a_copy_of_the_metrics(self):
+        try:
+            import tracemalloc
+        except ImportError:
+            self.skipTest('Missing library: tracemalloc')
+
+        with patch.object(TestDatabase, 'fetch_dataframe', return_value=self.dataframe):
+            tracemalloc.start()
+            try:
+                self.slicer.manager.data(metrics=['foo', 'bar', 'fiz', 'buz'], dimensions=['cat'])
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(peak, self.metrics_size)
+
+    def test_operations_are_added_without_copying_the_metrics(self):
+        dataframe = pd.DataFrame({'cat': self.dataframe['cat'], 'foo': self.dataframe['foo'].copy()})
+
+        with patch.object(TestDatabase, 'fetch_dataframe', return_value=dataframe):
+            foo_values = dataframe['foo'].values
+            result = self.slicer.manager.data(metrics=['foo'], dimensions=['cat'], operations=[CumSum('foo')])
+
+        self.assertListEqual(['foo', 'foo_cumsum'], list(result.columns))
+        self.assertTrue(np.shares_memory(foo_values, result['foo'].values))
+
+
+class SQLiteDataTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.database = SQLiteTestDatabase(os.path.join(cls.directory, 'test.db'))
+
+        rows = [(locale, device, clicks, clicks * 2.5)
+                for clicks, (locale, device) in enumerate(itertools.product(['de', 'fr', 'us', None],
+                                                                            ['desktop', 'mobile', 'tablet']))]
+        with cls.database.connect() as connection:
+            connection.execute('CREATE TABLE "test" ("locale" TEXT,"device" TEXT,"clicks" INTEGER,"cost" REAL)')
+            connection.executemany('INSERT INTO "test" VALUES (?,?,?,?)', rows * 2)
+            connection.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        self.slicer = Slicer(
+            Table('test'),
+            self.database,
+
+            metrics=[Metric('clicks'), Metric('cost'), Metric('ints', definition=fn.Sum(Table('test').clicks),
+                                                             dtype='int32')],
+            dimensions=[CategoricalDimension('locale'), CategoricalDimension('device')],
+        )
+
+
+class TopNDataTests(SQLiteDataTestCase):
+    def setUp(self):
+        test_table = Table('test')
+        self.slicer = Slicer(
+            test_table,
+            self.database,
+
+            metrics=[Metric('clicks')],
+            # The dimensions are defined with their fields so that NULL values are not replaced.  Their keys are not
+            # the names of the fields, since SQLite groups by the field of the table instead of the selected value.
+            dimensions=[CategoricalDimension('country', definition=test_table.locale),
+                        CategoricalDimension('platform', definition=test_table.device)],
+        )
+
+    def test_null_value_in_the_top_n_is_kept(self):
+        result = self.slicer.manager.data(metrics=['clicks'], dimensions=['country'],
+                                          operations=[TopN('country', 2, by='clicks')])
+
+        self.assertDictEqual({'': 60, 'us': 42, '_other': 30}, result['clicks'].to_dict())
+
+    def test_null_value_in_the_top_n_is_kept_without_other(self):
+        result = self.slicer.manager.data(metrics=['clicks'], dimensions=['platform', 'country'],
+                                          operations=[TopN('country', 2, by='clicks', other=False)])
+
+        self.assertListEqual(['', 'us'], sorted(result.index.get_level_values('country').unique()))
+
+    def test_top_n_is_ranked_with_metric_filters(self):
+        result = self.slicer.manager.data(metrics=['clicks'], dimensions=['country'],
+                                          metric_filters=[EqualityFilter('clicks', EqualityOperator.lt, 50)],
+                                          operations=[TopN('country', 2, by='clicks', other=False)])
+
+        self.assertDictEqual({'fr': 24, 'us': 42}, result['clicks'].to_dict())
+
+
+class DataManyTests(SQLiteDataTestCase):
+    def assert_data_many_equals_data(self, requests):
+        with patch.object(SQLiteTestDatabase, 'fetch_dataframe', autospec=True,
+                          side_effect=SQLiteTestDatabase.fetch_dataframe) as mock_fetch_dataframe:
+            results = self.slicer.manager.data_many(requests)
+            n_queries = mock_fetch_dataframe.call_count
+
+        self.assertEqual(len(requests), len(results))
+        for request, result in zip(requests, results):
+            pd.testing.assert_frame_equal(self.slicer.manager.data(**request), result)
+
+        return n_queries
+
+    def test_requests_differing_by_an_equality_filter_are_queried_together(self):
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, locale)])
+            for locale in ['us', 'de', 'fr']
+        ])
+
+        self.assertEqual(1, n_queries)
+
+    def test_request_without_data_returns_an_empty_data_frame(self):
+        us, empty = self.slicer.manager.data_many([
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, locale)])
+            for locale in ['us', 'xx']
+        ])
+
+        self.assertEqual(3, len(us))
+        self.assertEqual(0, len(empty))
+        self.assertListEqual(['clicks'], list(empty.columns))
+        self.assertListEqual(['device'], list(empty.index.names))
+
+    def test_requests_differing_by_a_contains_filter_on_a_queried_dimension_are_queried_together(self):
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks', 'cost'], dimensions=['locale', 'device'],
+                 dimension_filters=[ContainsFilter('locale', ['us', 'de'])]),
+            dict(metrics=['clicks', 'cost'], dimensions=['locale', 'device'],
+                 dimension_filters=[ContainsFilter('locale', ['fr'])]),
+            dict(metrics=['clicks', 'cost'], dimensions=['locale', 'device'],
+                 dimension_filters=[ContainsFilter('locale', ['de', 'fr'])]),
+        ])
+
+        self.assertEqual(1, n_queries)
+
+    def test_requests_without_dimensions_are_queried_together(self):
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks', 'ints'], dimension_filters=[EqualityFilter('device', EqualityOperator.eq, device)])
+            for device in ['mobile', 'desktop']
+        ])
+
+        self.assertEqual(1, n_queries)
+
+    def test_requests_are_only_queried_together_when_the_other_parameters_are_equal(self):
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'us')]),
+            dict(metrics=['cost'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'de')]),
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'fr'),
+                                    EqualityFilter('device', EqualityOperator.eq, 'mobile')]),
+        ])
+
+        self.assertEqual(3, n_queries)
+
+    def test_requests_are_grouped_by_any_of_their_filters(self):
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'us'),
+                                    EqualityFilter('device', EqualityOperator.eq, 'mobile')]),
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'us'),
+                                    EqualityFilter('device', EqualityOperator.eq, 'tablet')]),
+        ])
+
+        self.assertEqual(1, n_queries)
+
+    def test_requests_with_contains_filter_on_a_dimension_which_is_not_queried_are_queried_separately(self):
+        # The values of the filter are aggregated together, so the data of each request is queried
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks'], dimensions=['device'], dimension_filters=[ContainsFilter('locale', ['us', 'de'])]),
+            dict(metrics=['clicks'], dimensions=['device'], dimension_filters=[ContainsFilter('locale', ['fr'])]),
+        ])
+
+        self.assertEqual(2, n_queries)
+
+    def test_requests_with_operations_or_pagination_are_queried_separately(self):
+        n_queries = self.assert_data_many_equals_data([
+            dict(metrics=['clicks'], dimensions=['device'], operations=[CumSum('clicks')],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'us')]),
+            dict(metrics=['clicks'], dimensions=['device'], operations=[CumSum('clicks')],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'de')]),
+            dict(metrics=['clicks'], dimensions=['device'], pagination=Paginator(limit=2),
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'us')]),
+        ])
+
+        self.assertEqual(3, n_queries)
+
+    def test_results_are_in_the_order_of_the_requests(self):
+        requests = [
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'us')]),
+            dict(metrics=['cost'], dimensions=['locale']),
+            dict(metrics=['clicks'], dimensions=['device'],
+                 dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, 'de')]),
+        ]
+
+        n_queries = self.assert_data_many_equals_data(requests)
+
+        self.assertEqual(2, n_queries)
+
+    def test_queries_are_run_in_a_pool_of_max_workers_threads(self):
+        requests = [dict(metrics=['clicks'], dimensions=[dimension]) for dimension in ['locale', 'device']]
+
+        with patch('fireant.slicer.managers.ThreadPool', wraps=ThreadPool) as mock_thread_pool:
+            self.slicer.manager.data_many(requests, max_workers=8)
+
+        mock_thread_pool.assert_called_once_with(2)
+
+    def test_worker_threads_are_stopped_before_returning(self):
+        requests = [dict(metrics=['clicks'], dimensions=[dimension]) for dimension in ['locale', 'device']]
+        n_threads = threading.active_count()
+
+        self.slicer.manager.data_many(requests)
+
+        self.assertEqual(n_threads, threading.active_count())
+
+
+class DataManyCacheTests(SQLiteDataTestCase):
+    requests = [
+        dict(metrics=['clicks'], dimensions=['device'],
+             dimension_filters=[EqualityFilter('locale', EqualityOperator.eq, locale)])
+        for locale in ['us', 'de', 'fr']
+    ]
+
+    def setUp(self):
+        super(DataManyCacheTests, self).setUp()
+        self.slicer.cache = ResultCache()
+
+        patcher = patch.object(SQLiteTestDatabase, 'fetch_dataframe', autospec=True,
+                               side_effect=SQLiteTestDatabase.fetch_dataframe)
+        self.mock_fetch_dataframe = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_shares_values(self, dataframe, other):
+        self.assertIsNot(dataframe, other)
+        pd.testing.assert_frame_equal(dataframe, other)
+        self.assertTrue(np.shares_memory(dataframe['clicks'].values, other['clicks'].values))
+
+    def test_data_of_requests_queried_together_is_cached_for_data(self):
+        results = self.slicer.manager.data_many(self.requests)
+
+        for request, result in zip(self.requests, results):
+            self.assert_shares_values(result, self.slicer.manager.data(**request))
+        self.assertEqual(1, self.mock_fetch_dataframe.call_count)
+
+    def test_cached_data_is_returned_without_a_query(self):
+        expected = self.slicer.manager.data_many(self.requests)
+
+        results = self.slicer.manager.data_many(self.requests)
+
+        for expected_result, result in zip(expected, results):
+            self.assert_shares_values(expected_result, result)
+        self.assertEqual(1, self.mock_fetch_dataframe.call_count)
+
+    def test_only_the_requests_without_cached_data_are_queried(self):
+        cached = [self.slicer.manager.data(**request) for request in self.requests[:2]]
+
+        results = self.slicer.manager.data_many(self.requests)
+
+        self.assert_shares_values(cached[0], results[0])
+        self.assert_shares_values(cached[1], results[1])
+        self.assertEqual(3, self.mock_fetch_dataframe.call_count)
+        self.assertIn("IN ('fr')", self.mock_fetch_dataframe.call_args[0][1])
+        pd.testing.assert_frame_equal(self.slicer.manager.data(**self.requests[2]), results[2])
+
+    def test_cached_data_is_queried_again_with_refresh_cache(self):
+        cached = self.slicer.manager.data_many(self.requests)
+
+        manager = SlicerManager(self.slicer, refresh_cache=True)
+        results = manager.data_many(self.requests)
+
+        self.assertEqual(2, self.mock_fetch_dataframe.call_count)
+        for request, cached_result, result in zip(self.requests, cached, results):
+            self.assertFalse(np.shares_memory(cached_result['clicks'].values, result['clicks'].values))
+            self.assert_shares_values(result, self.slicer.manager.data(**request))
+
+    def test_changing_the_columns_of_a_result_does_not_change_the_cached_data(self):
+        result = self.slicer.manager.data_many(self.requests)[0]
+        expected = result.copy()
+
+        result['clicks'] = 0
+
+        pd.testing.assert_frame_equal(expected, self.slicer.manager.data(**self.requests[0]))
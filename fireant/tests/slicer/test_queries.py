@@ -2,7 +2,10 @@
 import unittest
 from collections import OrderedDict
 from datetime import date
+from decimal import Decimal
 
+import numpy as np
+import pandas as pd
 from mock import patch
 from pypika import (
     JoinType,
@@ -1190,6 +1193,37 @@ class DimensionOptionTests(QueryTests):
                          'ORDER BY "sq0"."date"', str(query))
 
 
+    def test_yoy_week_interval_does_not_modify_dimensions(self):
+        ref = references.YoY('date')
+        dt = self.mock_table.dt
+        date_definition = settings.database.trunc_date(dt, 'week')
+        dimensions = OrderedDict([('date', date_definition)])
+        kwargs = dict(
+            database=settings.database,
+            table=self.mock_table,
+            joins=[],
+            metrics=OrderedDict([
+                ('clicks', fn.Sum(self.mock_table.clicks)),
+            ]),
+            dimensions=dimensions,
+            mfilters=[],
+            dfilters=[],
+            references=OrderedDict([
+                (ref.key, {
+                    'dimension': ref.element_key, 'definition': dt,
+                    'modifier': ref.modifier,
+                    'time_unit': ref.time_unit, 'interval': ref.interval
+                })
+            ]),
+            rollup=[],
+            pagination=None,
+        )
+
+        query = self.manager._build_data_query(**kwargs)
+
+        self.assertIs(date_definition, dimensions['date'])
+        self.assertEqual(str(query), str(self.manager._build_data_query(**kwargs)))
+
 class PaginationNonReferenceQueryTests(QueryTests):
     def get_non_reference_query(self, paginator):
         return self.manager._build_data_query(
@@ -1767,3 +1801,193 @@ class PaginationReferenceQueryTests(QueryTests):
                          'AND "sq0"."locale_display"="sq1"."locale_display" '
                          'ORDER BY "clicks_yoy" DESC,"impressions_yoy" DESC '
                          'LIMIT 50 OFFSET 10', str(query))
+
+
+class PageQueryTests(QueryTests):
+    def query_kwargs(self, paginator):
+        return dict(
+            database=TestDatabase(),
+            table=self.mock_table,
+            joins=[],
+            metrics=OrderedDict([
+                ('clicks', fn.Sum(self.mock_table.clicks)),
+            ]),
+            dimensions=OrderedDict([
+                ('locale', self.mock_table.locale),
+            ]),
+            mfilters=[],
+            dfilters=[],
+            references={},
+            rollup=[],
+            pagination=paginator,
+        )
+
+    @patch.object(TestDatabase, 'fetch_dataframe')
+    def test_page_is_counted_in_the_same_query(self, mock_fetch_dataframe):
+        mock_fetch_dataframe.return_value = pd.DataFrame([['de', 10, 42], ['us', 20, 42]],
+                                                         columns=['locale', 'clicks', '_count'])
+
+        dataframe, count = self.manager.query_data_page(
+            **self.query_kwargs(Paginator(offset=10, limit=2, order=[('clicks', Order.desc)])))
+
+        mock_fetch_dataframe.assert_called_once_with('SELECT '
+                                                     '"locale" "locale",'
+                                                     'SUM("clicks") "clicks",'
+                                                     'COUNT(*) OVER () "_count" '
+                                                     'FROM "test_table" '
+                                                     'GROUP BY "locale" '
+                                                     'ORDER BY "clicks" DESC '
+                                                     'LIMIT 2 OFFSET 10')
+        self.assertEqual(42, count)
+        self.assertListEqual(['clicks'], list(dataframe.columns))
+        self.assertListEqual(['de', 'us'], list(dataframe.index))
+
+    @patch.object(TestDatabase, 'fetch_dataframe')
+    def test_empty_page_has_no_count(self, mock_fetch_dataframe):
+        mock_fetch_dataframe.return_value = pd.DataFrame([], columns=['locale', 'clicks', '_count'])
+
+        dataframe, count = self.manager.query_data_page(**self.query_kwargs(Paginator(offset=100, limit=10)))
+
+        self.assertIsNone(count)
+        self.assertEqual(0, len(dataframe))
+        self.assertListEqual(['clicks'], list(dataframe.columns))
+
+    @patch.object(TestDatabase, 'fetch')
+    def test_count_query(self, mock_fetch):
+        mock_fetch.return_value = [(42,)]
+
+        count = self.manager.query_count(**self.query_kwargs(Paginator(offset=10, limit=2)))
+
+        self.assertEqual(42, count)
+        mock_fetch.assert_called_once_with('SELECT COUNT(*) FROM '
+                                           '(SELECT "locale" "locale" '
+                                           'FROM "test_table" '
+                                           'GROUP BY "locale") "sq0"')
+
+
+class FormatDataFrameTests(QueryTests):
+    @property
+    def metrics(self):
+        return OrderedDict([('clicks', fn.Sum(self.mock_table.clicks))])
+
+    def dimensions(self, *keys):
+        return OrderedDict([(key, self.mock_table.field(key)) for key in keys])
+
+    def test_dimension_values_are_categorical(self):
+        dataframe = pd.DataFrame([['de', 'a', 10], ['us', None, 20], ['de', 'b', 30]],
+                                 columns=['locale', 'comment', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {})
+
+        self.assertEqual('category', result.index.dtype.name)
+        self.assertListEqual(['de', 'us', 'de'], list(result.index))
+        self.assertEqual(object, result['comment'].dtype)
+        self.assertListEqual(['a', '', 'b'], list(result['comment']))
+
+    def test_missing_dimension_values_are_replaced_in_categories(self):
+        dataframe = pd.DataFrame([['de', 'a', 10], [None, 'b', 20], ['us', None, 30]],
+                                 columns=['locale', 'device', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale', 'device'), {})
+
+        self.assertIn('', result.index.levels[0])
+        self.assertIn('', result.index.levels[1])
+        self.assertListEqual([('de', 'a'), ('', 'b'), ('us', '')], list(result.index))
+
+    def test_decimal_metric_values_are_kept_without_dtype(self):
+        dataframe = pd.DataFrame([['de', Decimal('1.05')], ['us', Decimal('2.5')]], columns=['locale', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {})
+
+        self.assertEqual(object, result['clicks'].dtype)
+        self.assertListEqual([Decimal('1.05'), Decimal('2.5')], list(result['clicks']))
+
+    def test_decimal_metric_values_are_floats_with_decimal_as_float_dtype(self):
+        dataframe = pd.DataFrame([['de', Decimal('1.5')], ['us', None]], columns=['locale', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {},
+                                                {'clicks': 'decimal-as-float'})
+
+        self.assertEqual(np.float64, result['clicks'].dtype)
+        self.assertListEqual([1.5, 0.], list(result['clicks']))
+
+    def test_reference_values_are_floats_with_decimal_as_float_dtype(self):
+        dataframe = pd.DataFrame([['de', Decimal('1.5'), Decimal('0.5')]], columns=['locale', 'clicks', 'clicks_wow'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'),
+                                                OrderedDict([('wow', {'modifier': None})]),
+                                                {'clicks': 'decimal-as-float'})
+
+        self.assertEqual(np.float64, result[('', 'clicks')].dtype)
+        self.assertEqual(np.float64, result[('wow', 'clicks')].dtype)
+
+    def test_metric_values_are_stored_with_dtype(self):
+        dataframe = pd.DataFrame([['de', 1.], ['us', None]], columns=['locale', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {},
+                                                {'clicks': 'int32'})
+
+        self.assertEqual(np.int32, result['clicks'].dtype)
+        self.assertListEqual([1, 0], list(result['clicks']))
+
+    def test_infinite_metric_values_are_zero_with_integer_dtype(self):
+        dataframe = pd.DataFrame([['de', np.inf], ['fr', -np.inf], ['us', 2.]], columns=['locale', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {},
+                                                {'clicks': 'int32'})
+
+        self.assertEqual(np.int32, result['clicks'].dtype)
+        self.assertListEqual([0, 0, 2], list(result['clicks']))
+
+    def test_infinite_metric_values_are_kept_with_float_dtype(self):
+        dataframe = pd.DataFrame([['de', np.inf], ['us', 2.]], columns=['locale', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {},
+                                                {'clicks': 'float32'})
+
+        self.assertEqual(np.float32, result['clicks'].dtype)
+        self.assertListEqual([np.inf, 2.], list(result['clicks']))
+
+    def test_decimal_metric_values_are_stored_with_dtype(self):
+        dataframe = pd.DataFrame([['de', Decimal('1.5')], ['us', Decimal('2.5')]], columns=['locale', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'), {},
+                                                {'clicks': 'float32'})
+
+        self.assertEqual(np.float32, result['clicks'].dtype)
+        self.assertListEqual([1.5, 2.5], list(result['clicks']))
+
+    def test_reference_values_are_stored_with_dtype(self):
+        dataframe = pd.DataFrame([['de', 1, 2, 3, 50.]],
+                                 columns=['locale', 'clicks', 'clicks_wow', 'clicks_wow_delta',
+                                          'clicks_wow_delta_percent'])
+        reference_schema = OrderedDict([
+            ('wow', {'modifier': None}),
+            ('wow_delta', {'modifier': references.Delta.modifier}),
+            ('wow_delta_percent', {'modifier': references.DeltaPercentage.modifier}),
+        ])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('locale'),
+                                                reference_schema, {'clicks': 'int32'})
+
+        self.assertEqual(np.int32, result[('', 'clicks')].dtype)
+        self.assertEqual(np.int32, result[('wow', 'clicks')].dtype)
+        self.assertEqual(np.int32, result[('wow_delta', 'clicks')].dtype)
+        # Percentages are not truncated
+        self.assertEqual(np.float64, result[('wow_delta_percent', 'clicks')].dtype)
+
+    def test_boolean_dimension_values_are_categorical(self):
+        dataframe = pd.DataFrame([[True, 10], [False, 20], [True, 30]], columns=['is_active', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('is_active'), {})
+
+        self.assertEqual('category', result.index.dtype.name)
+        self.assertListEqual([True, False, True], list(result.index))
+
+    def test_numeric_dimension_values_are_not_categorical(self):
+        dataframe = pd.DataFrame([[1, 10], [2, 20]], columns=['account', 'clicks'])
+
+        result = self.manager._format_dataframe(dataframe, self.metrics, self.dimensions('account'), {})
+
+        self.assertNotEqual('category', result.index.dtype.name)
+        self.assertListEqual([1, 2], list(result.index))
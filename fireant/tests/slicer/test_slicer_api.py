@@ -13,7 +13,7 @@ from pypika import JoinType
 from pypika import functions as fn, Tables, Case
 
 QUERY_BUILDER_PARAMS = {'table', 'database', 'joins', 'metrics', 'dimensions', 'mfilters', 'dfilters', 'references',
-                        'rollup', 'pagination'}
+                        'rollup', 'pagination', 'dtypes'}
 
 
 class SlicerSchemaTests(TestCase):
@@ -63,6 +63,9 @@ class SlicerSchemaTests(TestCase):
                 # Metric with suffix
                 Metric('euro', suffix='€'),
 
+                # Metric with storage type
+                Metric('small', dtype='int32'),
+
                 # Metric with suffix
                 Metric('join_metric', definition=fn.Sum(cls.test_join_table.join_metric), joins=['join1']),
             ],
@@ -159,6 +162,22 @@ class SlicerSchemaMetricTests(SlicerSchemaTests):
         self.assertSetEqual({'foo', 'bar'}, set(query_schema['metrics'].keys()))
 
 
+    def test_metric_dtypes(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo', 'small'],
+        )
+
+        self.assertDictEqual({'small': 'int32'}, query_schema['dtypes'])
+
+    def test_metric_dtypes_added_for_operations(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo'],
+            operations=[CumSum('small')],
+        )
+
+        self.assertDictEqual({'small': 'int32'}, query_schema['dtypes'])
+
+
 class SlicerSchemaDimensionTests(SlicerSchemaTests):
     def test_date_dimension_default_interval(self):
         query_schema = self.test_slicer.manager.data_query_schema(
@@ -889,6 +908,128 @@ class SlicerOperationSchemaTests(SlicerSchemaTests):
 
         self.assertListEqual([['locale'], ['account', 'account_display']], query_schema['rollup'])
 
+    def test_top_n_query_schema(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo'],
+            dimensions=['date', 'locale'],
+            operations=[TopN('locale', 5, by='bar')],
+        )
+
+        self.assertSetEqual({'foo'}, set(query_schema['metrics'].keys()))
+        self.assertEqual('CASE WHEN "top_locale"."is_top" IS NULL THEN \'_other\' ELSE "test"."locale" END',
+                         str(query_schema['dimensions']['locale']))
+
+        top_query, criterion, join_type = query_schema['joins'][-1]
+        self.assertEqual(JoinType.left, join_type)
+        self.assertEqual('top_locale', top_query.alias)
+        self.assertEqual('"test"."locale"="top_locale"."value" '
+                         'OR ("test"."locale" IS NULL AND "top_locale"."value" IS NULL)', str(criterion))
+        self.assertEqual('SELECT "test"."locale" "value",SUM("test"."fiz"+"test"."buz") "bar",COUNT(*) "is_top" '
+                         'FROM "test_table" "test" '
+                         'GROUP BY "value" '
+                         'ORDER BY SUM("test"."fiz"+"test"."buz") DESC LIMIT 5', str(top_query))
+
+    def test_top_n_unique_dimension_query_schema(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo'],
+            dimensions=['date', 'account'],
+            operations=[TopN('account', 10, by='foo')],
+        )
+
+        self.assertEqual('CASE WHEN "top_account"."is_top" IS NULL THEN \'_other\' ELSE "test"."account_id" END',
+                         str(query_schema['dimensions']['account']))
+        self.assertEqual('CASE WHEN "top_account"."is_top" IS NULL THEN \'Other\' ELSE "test"."account_name" END',
+                         str(query_schema['dimensions']['account_display']))
+
+    def test_top_n_with_joined_metric(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo'],
+            dimensions=['date', 'locale'],
+            operations=[TopN('locale', 5, by='piddle')],
+        )
+
+        self.assertEqual(1, len(query_schema['joins']))
+        self.assertIn('JOIN "test_join_table" "join"', str(query_schema['joins'][0][0]))
+
+    def test_top_n_requires_dimension_in_request(self):
+        with self.assertRaises(SlicerException):
+            self.test_slicer.manager.data_query_schema(
+                metrics=['foo'],
+                dimensions=['date'],
+                operations=[TopN('locale', 5, by='foo')],
+            )
+
+    def test_top_n_requires_categorical_or_unique_dimension(self):
+        with self.assertRaises(SlicerException):
+            self.test_slicer.manager.data_query_schema(
+                metrics=['foo'],
+                dimensions=['date'],
+                operations=[TopN('date', 5, by='foo')],
+            )
+
+    def test_top_n_requires_valid_metric(self):
+        with self.assertRaises(SlicerException):
+            self.test_slicer.manager.data_query_schema(
+                metrics=['foo'],
+                dimensions=['locale'],
+                operations=[TopN('locale', 5, by='fizbuz')],
+            )
+
+    def test_top_n_without_other_query_schema(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo'],
+            dimensions=['locale', 'date'],
+            operations=[TopN('date', 5, other=False)],
+        )
+
+        self.assertEqual('TRUNC("test"."dt",\'DD\')', str(query_schema['dimensions']['date']))
+
+        top_query, criterion, join_type = query_schema['joins'][-1]
+        self.assertEqual(JoinType.inner, join_type)
+        self.assertEqual('TRUNC("test"."dt",\'DD\')="top_date"."value" '
+                         'OR (TRUNC("test"."dt",\'DD\') IS NULL AND "top_date"."value" IS NULL)', str(criterion))
+        self.assertEqual('SELECT TRUNC("test"."dt",\'DD\') "value" '
+                         'FROM "test_table" "test" '
+                         'GROUP BY "value" '
+                         'ORDER BY TRUNC("test"."dt",\'DD\') LIMIT 5', str(top_query))
+
+    def test_top_n_is_ranked_with_metric_filters(self):
+        query_schema = self.test_slicer.manager.data_query_schema(
+            metrics=['foo'],
+            dimensions=['date', 'locale'],
+            metric_filters=[EqualityFilter('foo', EqualityOperator.gt, 5)],
+            operations=[TopN('locale', 5, by='foo')],
+        )
+
+        top_query, _, _ = query_schema['joins'][-1]
+        self.assertIn('HAVING SUM("test"."foo")>5', str(top_query))
+
+    def test_top_n_subquery_keeps_its_alias_in_the_query(self):
+        query = self.test_slicer.manager.query_string(
+            metrics=['foo'],
+            dimensions=['date', 'locale'],
+            operations=[TopN('locale', 5, by='foo'), TopN('date', 3, other=False)],
+        )
+
+        self.assertIn(') "top_locale" ON', query)
+        self.assertIn(') "top_date" ON', query)
+        self.assertNotIn('"sq', query)
+
+    def test_top_n_operations_for_the_same_dimension_raise_exception(self):
+        with self.assertRaises(SlicerException):
+            self.test_slicer.manager.data_query_schema(
+                metrics=['foo'],
+                dimensions=['locale'],
+                operations=[TopN('locale', 5, by='foo'), TopN('locale', 3)],
+            )
+
+    def test_top_n_operation_schema(self):
+        operation_schema = self.test_slicer.manager.operation_schema(
+            operations=[TopN('locale', 5, by='foo')],
+        )
+
+        self.assertListEqual([], operation_schema)
+
     def test_totals_operation_schema(self):
         operation_schema = self.test_slicer.manager.operation_schema(
             operations=[Totals('locale', 'account')],
@@ -1054,6 +1195,34 @@ class SlicerDisplaySchemaTests(SlicerSchemaTests):
             display_schema
         )
 
+    def test_categorical_dimension_with_top_n(self):
+        display_schema = self.test_slicer.manager.display_schema(
+            metrics=['foo'],
+            dimensions=['locale'],
+            operations=[TopN('locale', 5, by='foo')],
+        )
+        self.assertDictEqual(
+            {
+                'metrics': {'foo': {'label': 'foo', 'axis': 0}},
+                'dimensions': {
+                    'locale': {'label': 'Locale', 'display_options': {
+                        'us': 'United States', 'de': 'Germany', '_other': 'Other', np.nan: '', pd.NaT: ''
+                    }},
+                },
+                'references': {},
+            },
+            display_schema
+        )
+
+    def test_categorical_dimension_with_top_n_without_other(self):
+        display_schema = self.test_slicer.manager.display_schema(
+            metrics=['foo'],
+            dimensions=['locale'],
+            operations=[TopN('locale', 5, other=False)],
+        )
+
+        self.assertNotIn('_other', display_schema['dimensions']['locale']['display_options'])
+
     def test_unique_dimension(self):
         display_schema = self.test_slicer.manager.display_schema(
             metrics=['foo'],
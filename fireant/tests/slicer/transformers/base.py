@@ -1,9 +1,30 @@
 # coding: utf-8
+import types
 import unittest
 
 import pandas as pd
 
-from fireant.slicer.transformers import Transformer
+from fireant.slicer.transformers import (
+    BUNDLES,
+    TransformationException,
+    Transformer,
+)
+from fireant.tests import mock_dataframes as mock_df
+
+
+def _is_unsupported(key, name):
+    """
+    Returns True for the transformers and mock data frames which are known to fail without a TransformationException.
+    """
+    if name.endswith('_ref_df'):
+        # Pie charts are validated to not have references and CSV exports do not support them
+        return 'pie_chart' == key or 'csv' in key
+
+    if key.startswith('column_index_csv'):
+        # Column index CSV exports do not support unique dimensions with display fields or boolean dimensions
+        return '_uni_' in name or '_bool_' in name
+
+    return False
 
 
 class TransformerTests(unittest.TestCase):
@@ -12,3 +33,34 @@ class TransformerTests(unittest.TestCase):
 
         with self.assertRaises(NotImplementedError):
             tx.transform(pd.DataFrame(), {})
+
+    def test_transformers_do_not_modify_the_data_frame(self):
+        # Widgets of a group share the values of the data frame, so transformers must not modify it
+        modified = []
+        for name in dir(mock_df):
+            if not name.endswith('_df') or not hasattr(mock_df, name[:-3] + '_schema'):
+                continue
+
+            dataframe = getattr(mock_df, name)
+            display_schema = getattr(mock_df, name[:-3] + '_schema')
+
+            for bundle, transformers in BUNDLES.items():
+                for key, transformer in transformers.items():
+                    if _is_unsupported(key, name):
+                        continue
+
+                    expected = dataframe.copy()
+
+                    try:
+                        result = transformer.transform(dataframe, display_schema)
+                        if isinstance(result, types.GeneratorType):
+                            list(result)
+
+                    except (TransformationException, ImportError):
+                        # Not every transformer supports every data frame or has its optional libraries installed
+                        continue
+
+                    if not expected.equals(dataframe) or expected.index.names != dataframe.index.names:
+                        modified.append('%s.%s: %s' % (bundle, key, name))
+
+        self.assertListEqual([], modified)
@@ -0,0 +1,125 @@
+# coding: utf-8
+import json
+from unittest import (TestCase,
+                      skipIf)
+
+import pandas as pd
+from fireant.slicer.transformers import (
+    ArrowTransformer,
+    ArrowStreamTransformer,
+    FeatherTransformer,
+    ParquetTransformer,
+    TransformationException,
+)
+from fireant.tests import mock_dataframes as mock_df
+from mock import patch
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class ArrowTransformerMissingLibraryTests(TestCase):
+    def test_missing_pyarrow(self):
+        with patch.dict('sys.modules', {'pyarrow': None}):
+            with self.assertRaises(TransformationException):
+                ArrowStreamTransformer().transform(mock_df.cont_dim_single_metric_df,
+                                                   mock_df.cont_dim_single_metric_schema)
+
+
+@skipIf(pyarrow is None, 'Missing library: pyarrow')
+class ArrowTransformerTests(TestCase):
+    arrow_tx = ArrowTransformer()
+
+    def test_no_dims_multi_metric(self):
+        df = mock_df.no_dims_multi_metric_df
+
+        table = self.arrow_tx.to_table(df, mock_df.no_dims_multi_metric_schema)
+
+        self.assertListEqual(list(df.columns), table.column_names)
+        pd.testing.assert_frame_equal(df, table.to_pandas())
+
+    def test_time_dim_keeps_datetime_type(self):
+        table = self.arrow_tx.to_table(mock_df.time_dim_single_metric_df, mock_df.time_dim_single_metric_schema)
+
+        self.assertEqual('timestamp', str(table.schema.field('date').type).split('[')[0])
+        self.assertTrue(pyarrow.types.is_integer(table.schema.field('one').type))
+
+    def test_cat_dim_is_dictionary_encoded(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+
+        table = self.arrow_tx.to_table(df, mock_df.cont_cat_dims_multi_metric_schema)
+
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field('cat1').type))
+        self.assertTrue(pyarrow.types.is_integer(table.schema.field('cont').type))
+
+        result = table.to_pandas()
+        self.assertIsInstance(result.index.levels[1], pd.CategoricalIndex)
+        self.assertListEqual(list(df.index), list(result.index))
+        pd.testing.assert_frame_equal(df.reset_index(drop=True), result.reset_index(drop=True))
+
+    def test_single_cat_dim(self):
+        table = self.arrow_tx.to_table(mock_df.cat_dim_single_metric_df, mock_df.cat_dim_single_metric_schema)
+
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field('cat1').type))
+
+    def test_metric_precision_is_kept(self):
+        df = mock_df.cont_dim_pretty_df
+
+        table = self.arrow_tx.to_table(df, mock_df.cont_dim_pretty_schema)
+
+        self.assertListEqual(list(df['pretty']), table.column('pretty').to_pylist())
+
+    def test_reference_columns_are_flattened(self):
+        df = mock_df.time_dim_single_metric_ref_df
+
+        table = self.arrow_tx.to_table(df, mock_df.time_dim_single_metric_ref_schema)
+
+        self.assertListEqual(['date', 'one', 'one_wow'], sorted(table.column_names))
+        self.assertListEqual(list(df[('wow', 'one')]), table.column('one_wow').to_pylist())
+
+    def test_display_schema_metadata(self):
+        table = self.arrow_tx.to_table(mock_df.cont_cat_dims_multi_metric_df,
+                                       mock_df.cont_cat_dims_multi_metric_schema)
+
+        metadata = json.loads(table.schema.metadata[b'fireant'].decode('utf-8'))
+
+        self.assertDictEqual({'axis': 0, 'label': 'Cat1', 'display_options': {'a': 'A', 'b': 'B'}},
+                             metadata['dimensions']['cat1'])
+        self.assertEqual('One', metadata['metrics']['one']['label'])
+
+
+@skipIf(pyarrow is None, 'Missing library: pyarrow')
+class ArrowSerializationTests(TestCase):
+    df = mock_df.cont_cat_dims_multi_metric_df
+    schema = mock_df.cont_cat_dims_multi_metric_schema
+
+    def assert_round_trip(self, table):
+        self.assertEqual(json.loads(table.schema.metadata[b'fireant'].decode('utf-8'))['metrics']['two']['label'],
+                         'Two')
+        result = table.to_pandas()
+        self.assertListEqual(list(self.df.index), list(result.index))
+        pd.testing.assert_frame_equal(self.df.reset_index(drop=True), result.reset_index(drop=True))
+
+    def test_arrow_stream(self):
+        result = ArrowStreamTransformer().transform(self.df, self.schema)
+
+        self.assertIsInstance(result, bytes)
+        self.assert_round_trip(pyarrow.ipc.open_stream(result).read_all())
+
+    def test_feather(self):
+        from pyarrow import feather
+
+        result = FeatherTransformer().transform(self.df, self.schema)
+
+        self.assertIsInstance(result, bytes)
+        self.assert_round_trip(feather.read_table(pyarrow.BufferReader(result)))
+
+    def test_parquet(self):
+        from pyarrow import parquet
+
+        result = ParquetTransformer().transform(self.df, self.schema)
+
+        self.assertIsInstance(result, bytes)
+        self.assert_round_trip(parquet.read_table(pyarrow.BufferReader(result)))
@@ -1,7 +1,14 @@
 # coding: utf-8
+import gzip
+import io
 from unittest import TestCase
 
-from fireant.slicer.transformers import CSVRowIndexTransformer, CSVColumnIndexTransformer
+from fireant.slicer.transformers import (
+    CSVRowIndexTransformer,
+    CSVColumnIndexTransformer,
+    CSVRowIndexStreamTransformer,
+    CSVColumnIndexStreamTransformer,
+)
 from fireant.tests import mock_dataframes as mock_df
 
 
@@ -260,3 +267,80 @@ class CSVColumnIndexTransformerTests(CSVRowIndexTransformerTests):
                          '5,172,41,20,21,45,22,23,344,82,40,42,90,44,46\n'
                          '6,204,49,24,25,53,26,27,408,98,48,50,106,52,54\n'
                          '7,236,57,28,29,61,30,31,472,114,56,58,122,60,62\n', result)
+
+
+class CSVRowIndexStreamTransformerTests(TestCase):
+    csv_tx = CSVRowIndexTransformer()
+    stream_tx = CSVRowIndexStreamTransformer(chunksize=3)
+
+    def test_stream_is_equal_to_csv(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+        schema = mock_df.cont_cat_dims_multi_metric_schema
+
+        result = b''.join(self.stream_tx.transform(df, schema))
+
+        self.assertEqual(self.csv_tx.transform(df, schema), result.decode('utf-8'))
+
+    def test_stream_no_dims(self):
+        df = mock_df.no_dims_multi_metric_df
+        schema = mock_df.no_dims_multi_metric_schema
+
+        result = b''.join(self.stream_tx.transform(df, schema))
+
+        self.assertEqual(self.csv_tx.transform(df, schema), result.decode('utf-8'))
+
+    def test_stream_is_written_in_chunks_of_rows(self):
+        df = mock_df.cont_dim_single_metric_df
+
+        result = list(self.stream_tx.transform(df, mock_df.cont_dim_single_metric_schema))
+
+        self.assertListEqual([b'Cont,One\n0,0\n1,1\n2,2\n',
+                              b'3,3\n4,4\n5,5\n',
+                              b'6,6\n7,7\n'], result)
+
+    def test_stream_data_frame_chunks(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+        schema = mock_df.cont_cat_dims_multi_metric_schema
+        chunks = (df.iloc[start:start + 5] for start in range(0, len(df), 5))
+
+        result = b''.join(self.stream_tx.transform(chunks, schema))
+
+        self.assertEqual(self.csv_tx.transform(df, schema), result.decode('utf-8'))
+
+    def test_stream_with_gzip(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+        schema = mock_df.cont_cat_dims_multi_metric_schema
+        stream_tx = CSVRowIndexStreamTransformer(chunksize=3, compress=True)
+
+        result = b''.join(stream_tx.transform(df, schema))
+
+        self.assertEqual(self.csv_tx.transform(df, schema), gzip.decompress(result).decode('utf-8'))
+
+    def test_write_to_file_like_object(self):
+        df = mock_df.cont_dim_multi_metric_df
+        schema = mock_df.cont_dim_multi_metric_schema
+        sink = io.BytesIO()
+
+        self.stream_tx.write(df, schema, sink)
+
+        self.assertEqual(self.csv_tx.transform(df, schema), sink.getvalue().decode('utf-8'))
+
+    def test_data_is_fetched_in_chunks(self):
+        self.assertEqual(3, self.stream_tx.fetch_chunksize)
+
+
+class CSVColumnIndexStreamTransformerTests(TestCase):
+    csv_tx = CSVColumnIndexTransformer()
+    stream_tx = CSVColumnIndexStreamTransformer(chunksize=3)
+
+    def test_stream_is_equal_to_csv(self):
+        df = mock_df.cont_cat_cat_dims_multi_metric_df
+        schema = mock_df.cont_cat_cat_dims_multi_metric_schema
+
+        result = list(self.stream_tx.transform(df, schema))
+
+        self.assertEqual(3, len(result))
+        self.assertEqual(self.csv_tx.transform(df, schema), b''.join(result).decode('utf-8'))
+
+    def test_data_is_not_fetched_in_chunks(self):
+        self.assertIsNone(self.stream_tx.fetch_chunksize)
@@ -1,4 +1,7 @@
 # coding: utf-8
+import gzip
+import io
+import json
 import locale as lc
 from collections import OrderedDict
 from datetime import date, datetime
@@ -7,10 +10,20 @@ from unittest import TestCase
 import numpy as np
 import pandas as pd
 from fireant import settings
+from fireant.slicer import *
 from fireant.slicer.operations import Totals
+from fireant.slicer.references import WoW
 from fireant.slicer.transformers import DataTablesRowIndexTransformer, DataTablesColumnIndexTransformer
+from fireant.slicer.transformers import (DataTablesRowIndexStreamTransformer,
+                                         DataTablesColumnIndexStreamTransformer,
+                                         DataTablesServerSideTransformer,
+                                         TransformationException)
 from fireant.slicer.transformers import datatables
 from fireant.tests import mock_dataframes as mock_df
+from fireant.tests.database.mock_database import TestDatabase
+from mock import patch
+from pypika import (Order,
+                    Table)
 
 lc.setlocale(lc.LC_ALL, 'C')
 
@@ -603,6 +616,22 @@ class DataTablesColumnIndexTransformerTests(TestCase):
                       'cont': {'value': 7}}]}
             , result)
 
+    def test_cont_cat_dim_single_metric_with_ref(self):
+        # Tests transformation of a single metric with a continuous and a categorical dimension using a WoW reference
+        result = self.dt_tx.transform(mock_df.cont_cat_dims_single_metric_ref_df,
+                                      mock_df.cont_cat_dims_single_metric_ref_schema)
+        self.assertListEqual(['cont', 'a.one', 'b.one', 'wow.a.one', 'wow.b.one'],
+                             [column['data'] for column in result['columns']])
+        self.assertListEqual([{
+                                  'cont': {'value': i},
+                                  'a': {'one': {'value': 2 * i, 'display': str(2 * i)}},
+                                  'b': {'one': {'value': 2 * i + 1, 'display': str(2 * i + 1)}},
+                                  'wow': {
+                                      'a': {'one': {'value': 4 * i, 'display': str(4 * i)}},
+                                      'b': {'one': {'value': 4 * i + 2, 'display': str(4 * i + 2)}},
+                                  },
+                              } for i in range(8)], result['data'])
+
     def test_cont_cat_dim_multi_metric(self):
         # Tests transformation of two metrics with a continuous and a categorical dimension
         result = self.dt_tx.transform(mock_df.cont_cat_dims_multi_metric_df, mock_df.cont_cat_dims_multi_metric_schema)
@@ -1054,6 +1083,300 @@ class DataTablesColumnIndexTransformerTests(TestCase):
                 data = data[level]
 
 
+class DataTablesColumnarTransformerTests(TestCase):
+    maxDiff = None
+    row_tx = DataTablesRowIndexTransformer(columnar=True)
+    column_tx = DataTablesColumnIndexTransformer(columnar=True)
+
+    def test_row_index_cont_cat_dims(self):
+        result = self.row_tx.transform(mock_df.cont_cat_dims_multi_metric_df.iloc[:3],
+                                       mock_df.cont_cat_dims_multi_metric_schema)
+
+        self.assertDictEqual({
+            'cont': {'value': [0, 0, 1]},
+            'cat1': {'value': ['a', 'b', 'a'], 'display': ['A', 'B', 'A']},
+            'one': {'value': [0, 1, 2], 'display': ['0', '1', '2']},
+            'two': {'value': [0, 2, 4], 'display': ['0', '2', '4']},
+        }, result['data'])
+        self.assertListEqual(['cont', 'cat1', 'one', 'two'], [column['data'] for column in result['columns']])
+
+    def test_row_index_uni_dim_display_field(self):
+        result = self.row_tx.transform(mock_df.cont_uni_dims_multi_metric_df.iloc[:3],
+                                       mock_df.cont_uni_dims_multi_metric_schema)
+
+        self.assertDictEqual({'value': [1, 2, 3], 'display': ['Aa', 'Bb', 'Cc']}, result['data']['uni'])
+
+    def test_column_index_with_ref(self):
+        result = self.column_tx.transform(mock_df.cont_cat_dims_single_metric_ref_df.iloc[:6],
+                                          mock_df.cont_cat_dims_single_metric_ref_schema)
+
+        self.assertDictEqual({
+            'cont': {'value': [0, 1, 2]},
+            'a.one': {'value': [0, 2, 4], 'display': ['0', '2', '4']},
+            'b.one': {'value': [1, 3, 5], 'display': ['1', '3', '5']},
+            'wow.a.one': {'value': [0, 4, 8], 'display': ['0', '4', '8']},
+            'wow.b.one': {'value': [2, 6, 10], 'display': ['2', '6', '10']},
+        }, result['data'])
+
+    def test_columnar_data_matches_row_data(self):
+        row_tx = DataTablesColumnIndexTransformer()
+        df = mock_df.rollup_cont_cat_cat_dims_multi_metric_df
+        schema = mock_df.rollup_cont_cat_cat_dims_multi_metric_schema
+
+        rows = row_tx.transform(df, schema)
+        result = self.column_tx.transform(df, schema)
+
+        self.assertListEqual(rows['columns'], result['columns'])
+        for column in result['columns']:
+            for i, row in enumerate(rows['data']):
+                cell = row
+                for key in column['data'].split('.'):
+                    cell = cell[key]
+
+                for field, values in result['data'][column['data']].items():
+                    self.assertEqual(cell[field], values[i])
+
+
+class DataTablesRowIndexStreamTransformerTests(TestCase):
+    dt_tx = DataTablesRowIndexTransformer()
+    stream_tx = DataTablesRowIndexStreamTransformer(chunksize=5)
+
+    def test_stream_is_equal_to_json(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+        schema = mock_df.cont_cat_dims_multi_metric_schema
+
+        result = list(self.stream_tx.transform(df, schema))
+
+        # Header, four blocks of rows and the closing brackets
+        self.assertEqual(6, len(result))
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), b''.join(result).decode('utf-8'))
+
+    def test_stream_data_frame_chunks(self):
+        df = mock_df.cont_uni_dims_multi_metric_df
+        schema = mock_df.cont_uni_dims_multi_metric_schema
+        chunks = (df.iloc[start:start + 7] for start in range(0, len(df), 7))
+
+        result = b''.join(self.stream_tx.transform(chunks, schema))
+
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), result.decode('utf-8'))
+
+    def test_stream_empty_data_frame_is_equal_to_json(self):
+        df = mock_df.cont_uni_dims_multi_metric_df.iloc[:0]
+        schema = mock_df.cont_uni_dims_multi_metric_schema
+
+        result = b''.join(self.stream_tx.transform(df, schema))
+
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), result.decode('utf-8'))
+        self.assertNotEqual([], json.loads(result.decode('utf-8'))['columns'])
+
+    def test_stream_empty_data_frame_chunks(self):
+        df = mock_df.cont_dim_multi_metric_df
+        schema = mock_df.cont_dim_multi_metric_schema
+
+        result = b''.join(self.stream_tx.transform([df.iloc[:0], df, df.iloc[:0]], schema))
+
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), result.decode('utf-8'))
+
+    def test_stream_no_data(self):
+        result = b''.join(self.stream_tx.transform([], mock_df.cont_dim_single_metric_schema))
+
+        self.assertDictEqual({'columns': [], 'data': []}, json.loads(result.decode('utf-8')))
+
+    def test_stream_with_gzip(self):
+        df = mock_df.cont_dim_multi_metric_df
+        schema = mock_df.cont_dim_multi_metric_schema
+        stream_tx = DataTablesRowIndexStreamTransformer(chunksize=3, compress=True)
+
+        result = b''.join(stream_tx.transform(df, schema))
+
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), gzip.decompress(result).decode('utf-8'))
+
+    def test_write_to_file_like_object(self):
+        df = mock_df.time_dim_single_metric_ref_df
+        schema = mock_df.time_dim_single_metric_ref_schema
+        sink = io.BytesIO()
+
+        self.stream_tx.write(df, schema, sink)
+
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), sink.getvalue().decode('utf-8'))
+
+
+class DataTablesColumnIndexStreamTransformerTests(TestCase):
+    dt_tx = DataTablesColumnIndexTransformer()
+    stream_tx = DataTablesColumnIndexStreamTransformer(chunksize=3)
+
+    def test_stream_is_equal_to_json(self):
+        df = mock_df.cont_cat_cat_dims_multi_metric_df
+        schema = mock_df.cont_cat_cat_dims_multi_metric_schema
+
+        result = list(self.stream_tx.transform(df, schema))
+
+        self.assertEqual(5, len(result))
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), b''.join(result).decode('utf-8'))
+
+    def test_stream_empty_data_frame_is_equal_to_json(self):
+        df = mock_df.cont_cat_cat_dims_multi_metric_df.iloc[:0]
+        schema = mock_df.cont_cat_cat_dims_multi_metric_schema
+
+        result = b''.join(self.stream_tx.transform(df, schema))
+
+        self.assertEqual(json.dumps(self.dt_tx.transform(df, schema)), result.decode('utf-8'))
+
+    def test_data_is_not_fetched_in_chunks(self):
+        self.assertIsNone(self.stream_tx.fetch_chunksize)
+
+
+class DataTablesServerSideTransformerTests(TestCase):
+    maxDiff = None
+    dt_tx = DataTablesRowIndexTransformer()
+    server_side_tx = DataTablesServerSideTransformer()
+
+    @classmethod
+    def setUpClass(cls):
+        test_table = Table('test')
+        cls.slicer = Slicer(
+            test_table,
+            TestDatabase(),
+
+            metrics=[
+                Metric('foo'),
+                Metric('bar'),
+            ],
+
+            dimensions=[
+                DatetimeDimension('date'),
+                CategoricalDimension('cat'),
+                UniqueDimension('uni', display_field=test_table.uni_label),
+            ]
+        )
+
+    def parse_request(self, params, metrics=('foo', 'bar'), dimensions=('date', 'cat', 'uni'), references=()):
+        return self.server_side_tx.parse_request(self.slicer, params, metrics=list(metrics),
+                                                 dimensions=list(dimensions), references=list(references))
+
+    def test_query_string_parameters(self):
+        draw, pagination, filters = self.parse_request({
+            'draw': '4', 'start': '20', 'length': '10',
+            'order[0][column]': '3', 'order[0][dir]': 'desc',
+            'search[value]': 'abc', 'search[regex]': 'false',
+            'columns[0][data]': 'date', 'columns[0][searchable]': 'true', 'columns[0][search][value]': '',
+            'columns[1][data]': 'cat', 'columns[1][searchable]': 'true', 'columns[1][search][value]': '',
+            'columns[2][data]': 'uni', 'columns[2][searchable]': 'true', 'columns[2][search][value]': 'xyz',
+            'columns[3][data]': 'foo', 'columns[3][searchable]': 'true', 'columns[3][search][value]': '',
+            '_': '1500000000000',
+        })
+
+        self.assertEqual(4, draw)
+        self.assertEqual(20, pagination.offset)
+        self.assertEqual(10, pagination.limit)
+        self.assertListEqual([('foo', Order.desc), ('date', Order.asc), ('cat', Order.asc), ('uni', Order.asc)],
+                             pagination.order)
+        self.assertListEqual([WildcardFilter('cat', '%abc%'), WildcardFilter(('uni', 'display'), '%xyz%')],
+                             filters)
+
+    def test_nested_parameters(self):
+        draw, pagination, filters = self.parse_request({
+            'draw': 1, 'start': 0, 'length': 25,
+            'order': [{'column': 1, 'dir': 'asc'}, {'column': 0, 'dir': 'desc'}],
+            'search': {'value': '', 'regex': False},
+            'columns': [{'data': 'uni', 'searchable': True}, {'data': 'wow.foo', 'searchable': True}],
+        }, metrics=['foo'], dimensions=['uni'], references=[WoW('date')])
+
+        self.assertEqual(1, draw)
+        self.assertListEqual([('foo_wow', Order.asc), ('uni_display', Order.desc), ('uni', Order.asc)],
+                             pagination.order)
+        self.assertListEqual([], filters)
+
+    def test_all_rows_are_not_supported(self):
+        with self.assertRaises(TransformationException):
+            self.parse_request({'draw': 1, 'start': 0, 'length': -1})
+
+    @patch('fireant.settings.datatables_max_page_length', 100)
+    def test_length_is_capped(self):
+        _, pagination, _ = self.parse_request({'draw': 1, 'start': 0, 'length': 5000})
+
+        self.assertEqual(100, pagination.limit)
+
+    @patch('fireant.settings.datatables_max_page_length', 100)
+    def test_default_length(self):
+        _, pagination, _ = self.parse_request({})
+
+        self.assertEqual(100, pagination.limit)
+
+    def test_malformed_parameters(self):
+        for params in [{'draw': 'abc'}, {'start': 'abc'}, {'start': -10}, {'length': None}, {'length': '1.5'},
+                       {'order': [{'column': 'abc'}]}, {'order': [{'column': 3}], 'columns': [{'data': 'cat'}]},
+                       {'order': [{'column': -1}]}, {'order': [{}]}, {'order': 'abc'}, {'columns': ['abc']},
+                       {'order[0][column]': '99'}, {'search[value][0]': 'abc'}]:
+            with self.assertRaises(TransformationException, msg=str(params)):
+                self.parse_request(params)
+
+    def test_search_value_wildcards_are_escaped(self):
+        _, _, filters = self.parse_request({'columns': [{'data': 'cat', 'search': {'value': '50%_\\'}}]})
+
+        self.assertListEqual([WildcardFilter('cat', '%50\\%\\_\\\\%')], filters)
+
+    @patch('fireant.slicer.transformers.datatables._PYPIKA_ESCAPES_QUOTES', False)
+    def test_search_value_quotes_are_doubled_when_pypika_does_not_escape_them(self):
+        _, _, filters = self.parse_request({'search': {'value': "x' OR '1'='1"}})
+
+        self.assertListEqual([WildcardFilter('cat', "%x'' OR ''1''=''1%")], filters)
+
+    @patch('fireant.slicer.transformers.datatables._PYPIKA_ESCAPES_QUOTES', True)
+    def test_search_value_quotes_are_kept_when_pypika_escapes_them(self):
+        _, _, filters = self.parse_request({'search': {'value': "x' OR '1'='1"}})
+
+        self.assertListEqual([WildcardFilter('cat', "%x' OR '1'='1%")], filters)
+
+    def test_search_value_with_special_characters_in_query(self):
+        _, pagination, filters = self.parse_request({'draw': 1, 'start': 0, 'length': 10,
+                                                     'search[value]': "it's 50%_\\"},
+                                                    dimensions=['cat'])
+
+        query = self.slicer.manager.query_string(metrics=['foo'], dimensions=['cat'], dimension_filters=filters,
+                                                 pagination=pagination)
+
+        self.assertIn("LIKE '%it''s 50\\%\\_\\\\%'", query)
+
+    def test_search_value_with_quote_in_query(self):
+        _, pagination, filters = self.parse_request({'draw': 1, 'start': 0, 'length': 10,
+                                                     'search[value]': "x' OR '1'='1"},
+                                                    dimensions=['cat'])
+
+        query = self.slicer.manager.query_string(metrics=['foo'], dimensions=['cat'], dimension_filters=filters,
+                                                 pagination=pagination)
+
+        self.assertIn('LIKE \'%x\'\' OR \'\'1\'\'=\'\'1%\'', query)
+
+    def test_search_skips_columns_that_are_not_searchable(self):
+        _, _, filters = self.parse_request({
+            'search': {'value': 'abc'},
+            'columns': [{'data': 'date', 'searchable': True}, {'data': 'cat', 'searchable': False},
+                        {'data': 'uni', 'searchable': True}],
+        })
+
+        self.assertListEqual([WildcardFilter(('uni', 'display'), '%abc%')], filters)
+
+    def test_search_without_text_dimensions(self):
+        _, _, filters = self.parse_request({'search': {'value': 'abc'}}, dimensions=['date'])
+
+        self.assertListEqual([], filters)
+
+    def test_order_by_invalid_column(self):
+        with self.assertRaises(TransformationException):
+            self.parse_request({'order': [{'column': 0, 'dir': 'asc'}], 'columns': [{'data': 'fizz'}]})
+
+    def test_transform_page(self):
+        df = mock_df.cont_dim_single_metric_df
+        schema = mock_df.cont_dim_single_metric_schema
+
+        result = self.server_side_tx.transform_page(df, schema, draw=3, records_total=100, records_filtered=50)
+
+        expected = {'draw': 3, 'recordsTotal': 100, 'recordsFiltered': 50}
+        expected.update(self.dt_tx.transform(df, schema))
+        self.assertDictEqual(expected, result)
+
+
 class DatatablesUtilityTests(TestCase):
     def test_nan_data_point(self):
         # np.nan is converted to None
@@ -4,6 +4,7 @@ from unittest import TestCase
 
 import numpy as np
 import pandas as pd
+from mock import patch
 from pypika import Table
 
 from fireant.slicer import (
@@ -27,6 +28,10 @@ from fireant.slicer.transformers import (
     TransformationException,
     highcharts,
 )
+from fireant.slicer.operations import (
+    TopN,
+    Totals,
+)
 from fireant.tests import mock_dataframes as mock_df
 from fireant.tests.database.mock_database import TestDatabase
 
@@ -585,6 +590,122 @@ class HighchartsStackedBarTransformerTests(HighchartsStackedColumnTransformerTes
         cls.hc_tx = HighchartsStackedBarTransformer()
 
 
+class HighchartsCompactTransformerTests(TestCase):
+    """
+    Compact mode sends the x values once per chart and only the y values per series.
+    """
+
+    def test_regular_time_series_uses_point_interval(self):
+        df = mock_df.time_dim_single_metric_df
+
+        result = HighchartsLineTransformer(compact=True).transform(df, mock_df.time_dim_single_metric_schema)
+
+        self.assertDictEqual({'pointStart': 946684800000, 'pointInterval': 86400000},
+                             result['plotOptions']['series'])
+        self.assertListEqual(list(range(8)), result['series'][0]['data'])
+
+    def test_monthly_time_series_uses_point_interval_unit(self):
+        df = pd.DataFrame({'one': [1., np.nan, 3.]},
+                          index=pd.DatetimeIndex(pd.date_range(start=date(2000, 1, 1), periods=3, freq='MS'),
+                                                 name='date'))
+
+        result = HighchartsLineTransformer(compact=True).transform(df, mock_df.time_dim_single_metric_schema)
+
+        self.assertDictEqual({'pointStart': 946684800000, 'pointInterval': 1, 'pointIntervalUnit': 'month'},
+                             result['plotOptions']['series'])
+        self.assertListEqual([1., None, 3.], result['series'][0]['data'])
+
+    def test_multiple_series_share_x_values(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+
+        result = HighchartsLineTransformer(compact=True).transform(df, mock_df.cont_cat_dims_multi_metric_schema)
+
+        self.assertDictEqual({'pointStart': 0, 'pointInterval': 1}, result['plotOptions']['series'])
+        for series, (_, column) in zip(result['series'], df.unstack(level=1).iteritems()):
+            self.assertListEqual(column.tolist(), series['data'])
+
+    def test_irregular_x_values_fall_back_to_pairs(self):
+        df = pd.DataFrame({'one': [1., 2., 3.]}, index=pd.Index([0, 1, 5], name='cont'))
+
+        result = HighchartsLineTransformer(compact=True).transform(df, mock_df.cont_dim_single_metric_schema)
+
+        self.assertNotIn('series', result['plotOptions'])
+        self.assertListEqual([(0, 1.), (1, 2.), (5, 3.)], result['series'][0]['data'])
+
+    def test_categories_are_shared(self):
+        df = mock_df.cat_dim_single_metric_df
+
+        result = HighchartsColumnTransformer(compact=True).transform(df, mock_df.cat_dim_single_metric_schema)
+
+        self.assertListEqual(['a', 'b'], result['xAxis']['categories'])
+        self.assertListEqual([0, 1], result['series'][0]['data'])
+
+    def test_stacking_options_are_kept(self):
+        df = mock_df.time_dim_single_metric_df
+
+        result = HighchartsStackedBarTransformer(compact=True).transform(df, mock_df.time_dim_single_metric_schema)
+
+        self.assertDictEqual({'stacking': 'normal', 'pointStart': 946684800000, 'pointInterval': 86400000},
+                             result['plotOptions']['series'])
+
+    def test_x_values_are_checked_once_per_chart(self):
+        df = mock_df.cont_cat_dims_multi_metric_df
+        transformer = HighchartsLineTransformer(compact=True)
+
+        with patch.object(HighchartsLineTransformer, '_compact_x_options',
+                          wraps=transformer._compact_x_options) as mock_compact_x_options:
+            result = transformer.transform(df, mock_df.cont_cat_dims_multi_metric_schema)
+
+        self.assertLess(1, len(result['series']))
+        mock_compact_x_options.assert_called_once()
+
+
+class HighchartsDownsamplingTests(TestCase):
+    def test_lttb_keeps_first_last_and_threshold_points(self):
+        x = np.arange(100, dtype=np.float64)
+        y = np.sin(x / 10)
+
+        indices = highcharts._lttb_indices(x, y, 10)
+
+        self.assertEqual(10, len(indices))
+        self.assertEqual(0, indices[0])
+        self.assertEqual(99, indices[-1])
+        self.assertListEqual(sorted(indices.tolist()), indices.tolist())
+
+    def test_lttb_keeps_peaks(self):
+        y = np.zeros(50)
+        y[23] = 100.
+
+        indices = highcharts._lttb_indices(np.arange(50, dtype=np.float64), y, 5)
+
+        self.assertIn(23, indices)
+
+    def test_lttb_noop_below_threshold(self):
+        indices = highcharts._lttb_indices(np.arange(5, dtype=np.float64), np.arange(5, dtype=np.float64), 10)
+        self.assertListEqual([0, 1, 2, 3, 4], indices.tolist())
+
+    def test_line_series_downsampled_to_max_points(self):
+        df = pd.DataFrame({'one': np.arange(1000, dtype=np.float64)},
+                          index=pd.DatetimeIndex(pd.date_range(start=date(2000, 1, 1), periods=1000, freq='H'),
+                                                 name='date'))
+
+        result = HighchartsLineTransformer(max_points=100).transform(df, mock_df.time_dim_single_metric_schema)
+
+        data = result['series'][0]['data']
+        self.assertEqual(100, len(data))
+        self.assertEqual((946684800000, 0.0), data[0])
+        self.assertEqual((946684800000 + 999 * 3600000, 999.0), data[-1])
+
+    def test_downsampled_series_are_not_compact(self):
+        df = pd.DataFrame({'one': np.arange(1000, dtype=np.float64)}, index=pd.Index(np.arange(1000), name='cont'))
+
+        result = HighchartsAreaTransformer(compact=True, max_points=100).transform(
+            df, mock_df.cont_dim_single_metric_schema)
+
+        self.assertNotIn('series', result['plotOptions'])
+        self.assertEqual(100, len(result['series'][0]['data']))
+
+
 class HighchartsUtilityTests(TestCase):
     def test_str_data_point(self):
         result = highcharts._format_data_point('abc')
@@ -605,6 +726,53 @@ class HighchartsUtilityTests(TestCase):
         result = highcharts._format_data_point(np.nan)
         self.assertIsNone(result)
 
+    def test_datetime_data_points(self):
+        # Converted to milliseconds in bulk
+        result = highcharts._format_data_points(pd.DatetimeIndex([date(2000, 1, 1), date(2000, 1, 2)]))
+        self.assertListEqual([946684800000, 946771200000], result)
+
+    def test_nan_data_points(self):
+        result = highcharts._format_data_points(np.array([1.5, np.nan]))
+        self.assertListEqual([1.5, None], result)
+
+    def test_int64_data_points(self):
+        result = highcharts._format_data_points(np.array([1, 2], dtype=np.int64))
+        self.assertListEqual([1, 2], result)
+        self.assertIsInstance(result[0], int)
+
+    def test_float32_data_point(self):
+        result = highcharts._format_data_point(np.float32(1.5))
+        self.assertEqual(1.5, result)
+        self.assertIsInstance(result, float)
+
+    def test_float32_nan_data_point(self):
+        result = highcharts._format_data_point(np.float32(np.nan))
+        self.assertIsNone(result)
+
+    def test_replace_infinity(self):
+        dataframe = pd.DataFrame({'a': [1.5, np.inf, -np.inf], 'b': np.array([1, 2, 3], dtype=np.int32)})
+
+        result = highcharts._replace_infinity(dataframe)
+
+        self.assertListEqual([1.5], list(result['a'].dropna()))
+        self.assertEqual(np.int32, result['b'].dtype)
+        self.assertTrue(np.isinf(dataframe['a']).any())
+
+    def test_replace_infinity_does_not_copy_without_infinity(self):
+        dataframe = pd.DataFrame({'a': [1.5, np.nan], 'b': np.array([1, 2], dtype=np.int32)})
+
+        result = highcharts._replace_infinity(dataframe)
+
+        self.assertIs(dataframe, result)
+
+    def test_format_data_drops_nan_values_and_null_keys(self):
+        column = pd.Series([1.0, np.nan, 3.0, 4.0],
+                           index=pd.DatetimeIndex([date(2000, 1, 1), date(2000, 1, 2), date(2000, 1, 3), pd.NaT]))
+
+        result = highcharts.HighchartsLineTransformer()._format_data(column)
+
+        self.assertListEqual([(946684800000, 1.0), (946857600000, 3.0)], result)
+
 
 class HighChartsPieChartTests(BaseHighchartsTransformerTests):
     """
@@ -630,6 +798,12 @@ class HighChartsPieChartTests(BaseHighchartsTransformerTests):
         for series in result['series']:
             self.assertSetEqual({'name', 'data'}, set(series.keys()))
 
+    def test_prevalidate_allows_top_n_operation(self):
+        self.hc_tx.prevalidate_request(None, ['foo'], ['cat'], [], [], [], [TopN('cat', 10, by='foo')])
+
+        with self.assertRaises(TransformationException):
+            self.hc_tx.prevalidate_request(None, ['foo'], ['cat'], [], [], [], [Totals('cat')])
+
     def test_no_dims_single_metric(self):
         # Tests transformation of a single-metric, no-dimension result
         df = mock_df.no_dims_single_metric_df
@@ -1,7 +1,10 @@
 # coding: utf-8
+import copy
 from datetime import datetime
 from unittest import TestCase
 
+import numpy as np
+
 from mock import (
     ANY,
     MagicMock,
@@ -153,6 +156,34 @@ class PandasRowIndexTransformerTests(TestCase):
         self.assertEqual(list(result.index.levels[1]), [])
         self.assertEqual(list(result.columns), ['One'])
 
+    def test_data_is_not_copied(self):
+        df = mock_df.cont_cat_uni_dims_multi_metric_df
+
+        result = self.pd_tx.transform(df, mock_df.cont_cat_uni_dims_multi_metric_schema)
+
+        self.assertTrue(np.shares_memory(df['one'].values, result['One'].values))
+        self.assertTrue(np.shares_memory(df['two'].values, result['Two'].values))
+
+    def test_original_dataframe_is_not_changed(self):
+        df = mock_df.cont_cat_uni_dims_multi_metric_df
+        index, columns = df.index.copy(), df.columns.copy()
+
+        self.pd_tx.transform(df, mock_df.cont_cat_uni_dims_multi_metric_schema)
+
+        self.assertListEqual(list(index.names), list(df.index.names))
+        self.assertTrue(index.equals(df.index))
+        self.assertListEqual(list(columns), list(df.columns))
+
+    def test_display_options_with_the_same_label(self):
+        df = mock_df.cat_cat_dims_single_metric_df
+        schema = copy.deepcopy(mock_df.cat_cat_dims_single_metric_schema)
+        schema['dimensions']['cat1']['display_options'] = {'a': 'A', 'b': 'A'}
+
+        result = self.pd_tx.transform(df, schema)
+
+        self.assertListEqual([('A', 'Y'), ('A', 'Z'), ('A', 'Y'), ('A', 'Z')], list(result.index))
+        self.assertListEqual([a for a in range(4)], list(result['One']))
+
 
 class PandasColumnIndexTransformerTests(TestCase):
     pd_tx = PandasRowIndexTransformer()
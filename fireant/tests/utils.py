@@ -1,6 +1,9 @@
 from unittest import TestCase
 
+import numpy as np
+import pandas as pd
 from fireant import utils
+from mock import Mock
 
 
 class MergeDictTests(TestCase):
@@ -30,3 +33,92 @@ class MergeDictTests(TestCase):
         mary_dict = {'first_name': 'Mary', 'gender': 'Female'}
         result = utils.merge_dicts(self.dict1, mary_dict)
         self.assertEqual(result, mary_dict)
+
+
+class MapLevelValuesTests(TestCase):
+    def test_map_index(self):
+        index = pd.Index(['a', 'b', 'a'], name='letter')
+
+        result = utils.map_level_values(index, 'letter', str.upper)
+
+        self.assertListEqual(['A', 'B', 'A'], result)
+
+    def test_map_categorical_index(self):
+        index = pd.CategoricalIndex(['a', 'b', 'a'], name='letter')
+
+        result = utils.map_level_values(index, 'letter', str.upper)
+
+        self.assertListEqual(['A', 'B', 'A'], result)
+
+    def test_map_multiindex_level(self):
+        index = pd.MultiIndex.from_arrays([[1, 1, 2], ['a', 'b', 'a']], names=['number', 'letter'])
+
+        result = utils.map_level_values(index, 'letter', str.upper)
+
+        self.assertListEqual(['A', 'B', 'A'], result)
+
+    def test_map_multiindex_level_with_labels(self):
+        # Versions of pandas before 0.24 name the codes of a multi-index labels
+        index = Mock(spec=pd.MultiIndex, names=['number', 'letter'], levels=[pd.Index([1, 2]), pd.Index(['a', 'b'])])
+        index.labels = [np.array([0, 0, 1]), np.array([0, 1, 0])]
+        del index.codes
+
+        result = utils.map_level_values(index, 'letter', str.upper)
+
+        self.assertListEqual(['A', 'B', 'A'], result)
+
+    def test_function_is_called_once_per_value(self):
+        index = pd.MultiIndex.from_arrays([[1, 1, 2, 2], ['a', 'b', 'a', 'b']], names=['number', 'letter'])
+        func = Mock(side_effect=str)
+
+        utils.map_level_values(index, 'letter', func)
+
+        self.assertEqual(2, func.call_count)
+
+    def test_missing_values_are_mapped(self):
+        index = pd.MultiIndex.from_arrays([[1, 2], ['a', np.nan]], names=['number', 'letter'])
+
+        result = utils.map_level_values(index, 'letter', lambda value: 'missing' if pd.isnull(value) else value)
+
+        self.assertListEqual(['a', 'missing'], result)
+
+
+class RenameLevelCategoriesTests(TestCase):
+    def test_categories_of_a_level_are_renamed(self):
+        index = pd.MultiIndex.from_arrays([[1, 1, 2], pd.Categorical(['a', 'b', 'a'])], names=['number', 'letter'])
+
+        result = utils.rename_level_categories(index, 'letter', str.upper)
+
+        self.assertIsInstance(result, pd.Categorical)
+        self.assertListEqual(['A', 'B', 'A'], list(result))
+
+    def test_function_is_called_once_per_value(self):
+        index = pd.CategoricalIndex(['a', 'b', 'a', 'b'], name='letter')
+        func = Mock(side_effect=str.upper)
+
+        utils.rename_level_categories(index, 'letter', func)
+
+        self.assertEqual(2, func.call_count)
+
+    def test_mapped_values_keep_their_types(self):
+        index = pd.Index(['a', 'b'], name='letter')
+
+        result = utils.rename_level_categories(index, 'letter', {'a': 1, 'b': 2.5}.get)
+
+        self.assertListEqual([1, 2.5], list(result))
+        self.assertIsInstance(list(result)[0], int)
+
+    def test_values_mapped_to_the_same_value_are_returned_as_a_list(self):
+        index = pd.Index(['a', 'b', 'c'], name='letter')
+
+        result = utils.rename_level_categories(index, 'letter', lambda value: 'x' if value != 'c' else 'c')
+
+        self.assertListEqual(['x', 'x', 'c'], result)
+
+    def test_missing_values_are_returned_as_a_list(self):
+        index = pd.MultiIndex.from_arrays([[1, 2], ['a', np.nan]], names=['number', 'letter'])
+
+        result = utils.rename_level_categories(index, 'letter', lambda value: 'missing' if pd.isnull(value) else value)
+
+        self.assertListEqual(['a', 'missing'], result)
+
@@ -1,4 +1,6 @@
 # coding: utf-8
+import numpy as np
+import pandas as pd
 
 
 def wrap_list(value):
@@ -40,3 +42,74 @@ def merge_dicts(*dict_args):
     for dictionary in dict_args:
         result.update(dictionary)
     return result
+
+
+def map_level_values(index, level, func):
+    """
+    Maps the values of a level of an index with a function.  The function is called once for each unique value of the
+    level instead of once for each row, since the level values are taken from the codes of the index.
+
+    :param index:
+        A pandas index or multi-index.
+    :param level:
+        The name of the level to map.  This is ignored for an index with a single level.
+    :param func:
+        The function to map the values with.
+    :return:
+        A list of the mapped values of the level, in the order of the index.
+    """
+    codes, uniques = _level_codes(index, level)
+
+    # Missing values have the code -1, which takes the last mapped value
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    for i, value in enumerate(uniques):
+        mapped[i] = func(value)
+    if (np.asarray(codes) == -1).any():
+        mapped[-1] = func(np.nan)
+
+    return mapped.take(codes).tolist()
+
+
+def rename_level_categories(index, level, func):
+    """
+    Maps the values of a level of an index with a function like ``map_level_values``, but returns them as a categorical
+    whose categories are renamed once with ``rename_categories`` instead of as a list of the values of each row.  If
+    the level has missing values or the mapped values are not unique or contain missing values, which categories cannot
+    have, the list returned by ``map_level_values`` is returned instead.
+
+    :param index:
+        A pandas index or multi-index.
+    :param level:
+        The name of the level to map.  This is ignored for an index with a single level.
+    :param func:
+        The function to map the values with.
+    :return:
+        A categorical or a list of the mapped values of the level, in the order of the index.
+    """
+    codes, uniques = _level_codes(index, level)
+    if (np.asarray(codes) == -1).any():
+        return map_level_values(index, level, func)
+
+    mapped = [func(value) for value in uniques]
+    if pd.isnull(mapped).any() or len(set(mapped)) < len(mapped):
+        return map_level_values(index, level, func)
+
+    # The categories are kept as objects so that the mapped values are not converted to a common type
+    categorical = pd.Categorical.from_codes(codes, pd.Index(uniques, dtype=object))
+    return categorical.rename_categories(pd.Index(mapped, dtype=object))
+
+
+def _level_codes(index, level):
+    """
+    Returns a tuple of the codes of the values of a level of an index and the unique values the codes refer to.
+    """
+    if isinstance(index, pd.MultiIndex):
+        i = list(index.names).index(level)
+        # The codes of a multi-index are named labels before pandas 0.24
+        codes = index.codes[i] if hasattr(index, 'codes') else index.labels[i]
+        return codes, index.levels[i]
+
+    if isinstance(index, pd.CategoricalIndex):
+        return index.codes, index.categories
+
+    return pd.factorize(index)
@@ -62,7 +62,8 @@ setup(
         'pymysql>=0.7.11'
     ],
     tests_require=[
-        'mock'
+        'mock',
+        'futures; python_version < "3"',
     ],
     extras_require={
         'vertica': ['vertica-python>=0.6'],
@@ -70,6 +71,7 @@ setup(
         'redshift': ['psycopg2>=2.7.3.1'],
         'postgresql': ['psycopg2>=2.7.3.1'],
         'matplotlib': ['matplotlib'],
+        'arrow': ['pyarrow'],
     },
 
     test_suite='fireant.tests',